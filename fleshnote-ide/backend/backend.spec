@@ -54,12 +54,14 @@ hidden_imports = [
     # NLTK synonyms
     'routes.synonyms',
     'nltk_manager',
+    'synonym_store',
     'nltk',
     'nltk.corpus',
     'nltk.corpus.reader',
     'nltk.corpus.reader.wordnet',
     # Spell check
     'routes.spellcheck',
+    'spell_manager',
     'phunspell',
     'spylls',
     'spylls.spellcheck',
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: export chapter preprocessing (typography, TODO removal, marker stripping).
+
+Builds a synthetic heavily linked manuscript and times export.pipeline's in-process
+preprocessing against the worker-process fan-out (_preprocess_chapters with the size
+threshold lifted), checking both give the same chapters in the same order.
+The fan-out uses min(MAX_EXPORT_WORKERS, cores) workers, so it only helps with 2+ cores.
+
+Run from the backend root:
+    python benchmarks/bench_export_preprocess.py
+    python benchmarks/bench_export_preprocess.py --chapters 200 --mode notes --runs 3
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export.pipeline as pipeline
+
+WORDS = ("the wind rose over the grey hills -- while she waited for \"news\" from the "
+         "southern road ... and the old keep burned quietly behind them").split()
+MARKERS = ("char", "loc", "item", "lore", "group", "quicknote", "annotation")
+
+
+def build_chapter(rng: random.Random, paragraphs: int) -> str:
+    parts = []
+    for _ in range(paragraphs):
+        words = []
+        for _ in range(rng.randint(60, 160)):
+            roll = rng.random()
+            if roll < 0.03:
+                words.append(f"{{{{{rng.choice(MARKERS)}:{rng.randint(1, 400)}|Sophia}}}}")
+            elif roll < 0.035:
+                words.append(f"{{{{twist:{rng.randint(1, 20)}|the letter}}}}")
+            else:
+                words.append(rng.choice(WORDS))
+        if rng.random() < 0.05:
+            words.append("#TODO tighten this")
+        parts.append(f"<p>{' '.join(words)}</p>")
+    return "".join(parts)
+
+
+def timed(fn, runs: int):
+    best, result = float("inf"), None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=120)
+    parser.add_argument("--paragraphs", type=int, default=60, help="paragraphs per chapter")
+    parser.add_argument("--mode", choices=("prose", "notes", "full"), default="full")
+    parser.add_argument("--html", action="store_true", help="keep HTML (html/epub/pdf exports)")
+    parser.add_argument("--runs", type=int, default=3, help="best-of runs")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [build_chapter(rng, args.paragraphs) for _ in range(args.chapters)]
+    annotation_content = {("annotation", str(i)): f"Note {i}" for i in range(1, 400)}
+    annotation_content.update({("lore", str(i)): f"Lore {i}" for i in range(1, 400, 2)})
+    remove_html = not args.html
+
+    serial_s, expected = timed(lambda: [
+        pipeline._preprocess_chapter(text, args.mode, remove_html, annotation_content) for text in texts
+    ], args.runs)
+    pipeline.EXPORT_PARALLEL_MIN_CHARS = 0
+    pipeline.EXPORT_PARALLEL_MIN_CHARS_FORK = 0
+    workers = min(len(texts), pipeline.MAX_EXPORT_WORKERS, os.cpu_count() or 1)
+    pool_s, actual = timed(lambda: pipeline._preprocess_chapters(
+        texts, args.mode, remove_html, annotation_content
+    ), args.runs)
+
+    size_mb = sum(len(text) for text in texts) / 1e6
+    print(f"  {args.chapters} chapters, {size_mb:.1f} MB, mode {args.mode}, {os.cpu_count()} cores")
+    print(f"  in-process     {serial_s * 1000:8.0f}ms  ({size_mb / serial_s:.1f} MB/s)")
+    print(f"  {workers} worker(s)    {pool_s * 1000:8.0f}ms  ({size_mb / pool_s:.1f} MB/s)")
+    print(f"  speedup {serial_s / max(pool_s, 1e-9):.2f}x, identical output: {actual == expected}")
+    if actual != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
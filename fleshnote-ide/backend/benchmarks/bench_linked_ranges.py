@@ -0,0 +1,121 @@
+"""
+Micro-benchmark: janitor linked-range extraction and containment lookup.
+
+Compares the tag-jumping `_get_linked_ranges` + bisect `_is_in_linked_range`
+against the original char-by-char walker and linear scan on a synthetic,
+heavily-linked chapter, and checks both produce identical results.
+
+Run from the backend root:
+    python benchmarks/bench_linked_ranges.py
+    python benchmarks/bench_linked_ranges.py --paragraphs 2000 --queries 50000
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes.janitor import _get_linked_ranges, _is_in_linked_range
+
+
+def _reference_linked_ranges(html: str) -> list[tuple[int, int]]:
+    """The original char-by-char walker, kept here as the correctness baseline."""
+    ranges = []
+    pos = 0
+    plain_offset = 0
+    while pos < len(html):
+        if html[pos] == '<':
+            tag_end = html.find('>', pos)
+            if tag_end == -1:
+                break
+            tag = html[pos:tag_end + 1]
+            if re.match(r'<span[^>]+data-entity-id=', tag, re.IGNORECASE):
+                close_start = html.find('</span>', tag_end)
+                if close_start != -1:
+                    inner_text = re.sub(r'<[^>]+>', '', html[tag_end + 1:close_start])
+                    ranges.append((plain_offset, plain_offset + len(inner_text)))
+                    plain_offset += len(inner_text)
+                    pos = close_start + len('</span>')
+                    continue
+            pos = tag_end + 1
+        else:
+            plain_offset += 1
+            pos += 1
+    return ranges
+
+
+def _reference_is_in_linked_range(offset: int, linked_ranges: list[tuple[int, int]]) -> bool:
+    for start, end in linked_ranges:
+        if start <= offset < end:
+            return True
+    return False
+
+
+def build_chapter(paragraphs: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    words = ["the", "storm", "walked", "across", "a", "silent", "harbor", "and", "she", "felt"]
+    names = ["Aelwyn", "Dorath Vale", "the Iron Keep", "Miriel", "Kestrel"]
+    out = []
+    for _ in range(paragraphs):
+        parts = []
+        for _ in range(rng.randint(40, 90)):
+            if rng.random() < 0.12:
+                eid = rng.randint(1, 500)
+                parts.append(
+                    f'<span class="entity-link" data-entity-type="character" data-entity-id="{eid}">'
+                    f'{rng.choice(names)}</span>'
+                )
+            elif rng.random() < 0.05:
+                parts.append(f"<em>{rng.choice(words)}</em>")
+            else:
+                parts.append(rng.choice(words))
+        out.append("<p>" + " ".join(parts) + ".</p>")
+    return "".join(out)
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=600)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    html = build_chapter(args.paragraphs)
+    print(f"Chapter HTML: {len(html):,} chars, {html.count('data-entity-id'):,} entity links")
+
+    t_ref, ref_ranges = timed(_reference_linked_ranges, html)
+    t_new, new_ranges = timed(_get_linked_ranges, html)
+    assert ref_ranges == new_ranges, "linked range extraction diverged from reference"
+    print(f"  ranges   reference {t_ref * 1000:9.2f} ms   new {t_new * 1000:9.2f} ms   x{t_ref / t_new:6.1f}")
+
+    plain_len = new_ranges[-1][1] + 100 if new_ranges else 1000
+    rng = random.Random(11)
+    offsets = [rng.randrange(plain_len) for _ in range(args.queries)]
+
+    def run_ref():
+        return [_reference_is_in_linked_range(o, ref_ranges) for o in offsets]
+
+    def run_new():
+        return [_is_in_linked_range(o, new_ranges) for o in offsets]
+
+    t_ref, ref_hits = timed(run_ref, repeat=1)
+    t_new, new_hits = timed(run_new)
+    assert ref_hits == new_hits, "containment lookup diverged from reference"
+    print(f"  contains reference {t_ref * 1000:9.2f} ms   new {t_new * 1000:9.2f} ms   x{t_ref / t_new:6.1f}"
+          f"   ({args.queries:,} lookups, {sum(new_hits):,} hits)")
+
+
+if __name__ == "__main__":
+    main()
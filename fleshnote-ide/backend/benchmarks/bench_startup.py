@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: backend cold start.
+
+Spawns fresh interpreters and measures how long `import main` takes, lists the
+slowest modules from `python -X importtime`, checks that the heavy NLP / export
+libraries are no longer pulled in at startup, and times the first response from
+the health endpoint (GET /) — the URL Electron polls before opening the window.
+
+Run from the backend root:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --top 30
+"""
+import os
+import sys
+import argparse
+import subprocess
+import statistics
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported lazily on first use; none of these should be loaded by `import main`
+HEAVY_MODULES = ["spacy", "nltk", "xhtml2pdf", "docx", "ebooklib", "phunspell"]
+
+_IMPORT_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+import main
+print("elapsed", time.perf_counter() - t0)
+print("loaded", *(m for m in {heavy!r} if m in sys.modules))
+"""
+
+_HEALTH_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import main
+from fastapi.testclient import TestClient
+resp = TestClient(main.app).get("/")
+assert resp.status_code == 200, resp.status_code
+print(time.perf_counter() - t0)
+"""
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+
+
+def time_import(runs: int) -> tuple[list[float], list[str]]:
+    times, loaded = [], []
+    for _ in range(runs):
+        fields = dict(line.split(" ", 1) if " " in line else (line, "")
+                      for line in _run(_IMPORT_SNIPPET.format(heavy=HEAVY_MODULES)).stdout.splitlines())
+        times.append(float(fields["elapsed"]))
+        loaded = fields["loaded"].split()
+    return times, loaded
+
+
+def slowest_imports(top: int) -> list[tuple[int, str]]:
+    """(cumulative µs, module) for the top-level-ish imports, slowest first."""
+    stderr = _run("import main", "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    times, loaded = time_import(args.runs)
+    print(f"  import main    median {statistics.median(times) * 1000:7.0f} ms   "
+          f"min {min(times) * 1000:7.0f} ms   ({args.runs} runs)")
+    print(f"  heavy modules loaded at startup: {', '.join(loaded) or 'none'}")
+
+    health = [float(_run(_HEALTH_SNIPPET).stdout.strip().splitlines()[-1]) for _ in range(args.runs)]
+    print(f"  first GET /    median {statistics.median(health) * 1000:7.0f} ms   "
+          f"min {min(health) * 1000:7.0f} ms   (process start to response)")
+
+    print("\n  slowest imports (cumulative):")
+    for us, name in slowest_imports(args.top):
+        print(f"    {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: precomputed synonym store vs live WordNet lookups.
+
+Measures the first lookup (WordNet corpus load vs opening the SQLite store),
+steady-state per-word latency for live WordNet, the store and the store's LRU,
+and checks the store returns exactly what live WordNet returns for a sample of
+lemmas plus a few inflected forms.
+
+Needs WordNet on disk (Settings → download, or nltk.download("wordnet")).
+The store is built on first run if it doesn't exist yet.
+
+Run from the backend root:
+    python benchmarks/bench_synonyms.py
+    python benchmarks/bench_synonyms.py --sample 10000 --rebuild
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nltk_manager
+import synonym_store
+
+INFLECTED = ["dogs", "walked", "running", "better", "geese", "was", "happier", "axes", "women", "churches"]
+
+
+def per_word_us(fn, words) -> float:
+    t0 = time.perf_counter()
+    for w in words:
+        fn(w)
+    return (time.perf_counter() - t0) / len(words) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, default=3000, help="number of random lemmas to compare")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the store before measuring")
+    args = parser.parse_args()
+
+    if not nltk_manager.check_wordnet_exists():
+        sys.exit("WordNet data not found — download it first.")
+
+    store_path = os.path.join(nltk_manager.get_nltk_data_dir(), synonym_store.STORE_FILENAME)
+    if args.rebuild or not os.path.exists(store_path):
+        print(f"Building store at {store_path} ...")
+        info = synonym_store.build_store(store_path)
+        print(f"  {info['synsets']:,} synsets, langs {info['langs']}, {info['seconds']} s, "
+              f"{os.path.getsize(store_path) / 1e6:.1f} MB")
+
+    # Cold start: first lookup in this process for each path
+    t0 = time.perf_counter()
+    assert synonym_store.lookup_synonyms("good") is not None, "store not usable"
+    t_store_cold = time.perf_counter() - t0
+
+    from nltk.corpus import wordnet
+    t0 = time.perf_counter()
+    nltk_manager._lookup_synsets(wordnet, "good", "eng")
+    t_live_cold = time.perf_counter() - t0
+    print(f"  first lookup   live {t_live_cold * 1000:9.1f} ms   store {t_store_cold * 1000:9.1f} ms")
+
+    rng = random.Random(5)
+    lemmas = list(wordnet.all_lemma_names())
+    words = rng.sample(lemmas, min(args.sample, len(lemmas))) + INFLECTED
+
+    live = [nltk_manager._lookup_synsets(wordnet, w, "eng") for w in words]
+    synonym_store.LRU_SIZE = max(synonym_store.LRU_SIZE, len(words))
+    synonym_store._lru.clear()
+    t_store = per_word_us(synonym_store.lookup_synonyms, words)
+    stored = [synonym_store.lookup_synonyms(w) for w in words]
+    mismatches = [w for w, a, b in zip(words, live, stored) if a != b]
+    assert not mismatches, f"store diverged from live WordNet for {mismatches[:10]}"
+
+    t_live = per_word_us(lambda w: nltk_manager._lookup_synsets(wordnet, w, "eng"), words)
+    t_lru = per_word_us(synonym_store.lookup_synonyms, words)
+    print(f"  per word       live {t_live:9.1f} us   store {t_store:9.1f} us   lru {t_lru:7.1f} us"
+          f"   ({len(words):,} words, identical results)")
+
+
+if __name__ == "__main__":
+    main()
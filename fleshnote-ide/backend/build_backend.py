@@ -25,11 +25,27 @@ def ensure_nltk_data():
     nltk.download("omw-1.4", download_dir=nltk_dir, quiet=False)
     print("NLTK WordNet data ready.")
 
+def ensure_synonym_store():
+    """Precompute the SQLite synonym store from the bundled WordNet so installs skip the first-run build."""
+    nltk_dir = os.path.join(os.path.dirname(__file__), "nltk_data")
+    import synonym_store
+    store_path = os.path.join(nltk_dir, synonym_store.STORE_FILENAME)
+    if os.path.exists(store_path) and synonym_store._read_meta(store_path):
+        print("Synonym store already present — skipping build.")
+        return
+
+    print("Building synonym store for bundling...")
+    import nltk
+    nltk.data.path.insert(0, nltk_dir)
+    info = synonym_store.build_store(store_path)
+    print(f"Synonym store ready: {info}")
+
 def build():
     print("--- FleshNote Backend Build Started ---")
 
-    # 0. Ensure NLTK WordNet data is available for bundling
+    # 0. Ensure NLTK WordNet data (and the synonym store built from it) is available for bundling
     ensure_nltk_data()
+    ensure_synonym_store()
 
     # 1. Clean previous builds
     folders_to_clean = ['build', 'dist']
@@ -215,6 +215,262 @@ def run_onboarding() -> dict:
     return answers
 
 
+# ─── STAT LOG ROLLUPS ────────────────────────────────────────────────────────
+# Hourly / daily / monthly sums of stat_logs, kept current by triggers so the
+# Analytics charts read a few hundred pre-aggregated rows instead of grouping
+# the whole activity log on every request. Shared by generate_project_db and
+# apply_migrations.
+
+STAT_LOG_COLUMNS = ("new_words", "deleted_words", "new_entities", "deleted_entities", "new_twists")
+
+# rollup table -> bucket expression over a stat_logs timestamp
+STAT_ROLLUPS = {
+    "stat_rollup_hourly": "strftime('%Y-%m-%d %H:00:00', {ts})",
+    "stat_rollup_daily": "DATE({ts})",
+    "stat_rollup_monthly": "strftime('%Y-%m', {ts})",
+    # Local calendar days, for the writing-streak achievement
+    "stat_rollup_local_daily": "date({ts}, 'localtime')",
+}
+
+
+def _rollup_bucket(table: str, ts: str) -> str:
+    return STAT_ROLLUPS[table].format(ts=f"COALESCE({ts}, CURRENT_TIMESTAMP)")
+
+
+def _rollup_upsert(table: str, row: str, sign: str) -> str:
+    """Add (sign '+') or remove (sign '-') one stat_logs row (NEW/OLD) from its bucket."""
+    cols = ", ".join(STAT_LOG_COLUMNS)
+    values = ", ".join(f"{sign}COALESCE({row}.{c}, 0)" for c in STAT_LOG_COLUMNS)
+    updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in (*STAT_LOG_COLUMNS, "log_count"))
+    return f"""
+        INSERT INTO {table} (bucket, {cols}, log_count)
+        VALUES ({_rollup_bucket(table, row + '.timestamp')}, {values}, {sign}1)
+        ON CONFLICT(bucket) DO UPDATE SET {updates};"""
+
+
+def _rollup_prune(table: str) -> str:
+    """Buckets whose last log moved out (60-second merges bump the timestamp) disappear, like in a GROUP BY."""
+    return f"""
+        DELETE FROM {table} WHERE bucket = {_rollup_bucket(table, 'OLD.timestamp')} AND log_count <= 0;"""
+
+
+def create_stat_rollups(cursor):
+    col_defs = ",\n".join(f"            {c:<17} INTEGER NOT NULL DEFAULT 0" for c in STAT_LOG_COLUMNS)
+    for table in STAT_ROLLUPS:
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            bucket            TEXT PRIMARY KEY NOT NULL,
+{col_defs},
+            log_count         INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'stat_logs_rollup_insert'")
+    row = cursor.fetchone()
+    if row and all(table in row[0] for table in STAT_ROLLUPS):
+        return
+
+    # First time for this database (or a rollup was added since): rebuild the rollups
+    # from the existing log, then keep them current
+    for event in ("insert", "update", "delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS stat_logs_rollup_{event}")
+    sums = ", ".join(f"SUM(COALESCE({c}, 0))" for c in STAT_LOG_COLUMNS)
+    for table in STAT_ROLLUPS:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table} (bucket, {", ".join(STAT_LOG_COLUMNS)}, log_count)
+            SELECT {_rollup_bucket(table, 'timestamp')} AS b, {sums}, COUNT(*)
+            FROM stat_logs
+            GROUP BY b
+        """)
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS stat_logs_rollup_insert
+        AFTER INSERT ON stat_logs
+        BEGIN{"".join(_rollup_upsert(t, "NEW", "+") for t in STAT_ROLLUPS)}
+        END;
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS stat_logs_rollup_update
+        AFTER UPDATE ON stat_logs
+        BEGIN{"".join(_rollup_upsert(t, "OLD", "-") + _rollup_upsert(t, "NEW", "+") + _rollup_prune(t) for t in STAT_ROLLUPS)}
+        END;
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS stat_logs_rollup_delete
+        AFTER DELETE ON stat_logs
+        BEGIN{"".join(_rollup_upsert(t, "OLD", "-") + _rollup_prune(t) for t in STAT_ROLLUPS)}
+        END;
+    """)
+
+
+# ─── ACHIEVEMENT COUNTERS ─────────────────────────────────────────────────────
+# The metrics achievements are judged on, kept current by triggers on the tables
+# they come from, so /api/project/achievements reads a handful of rows instead of
+# re-aggregating the project on every call.
+
+# metric -> (table, per-row contribution; {r} is NEW or OLD)
+ACHIEVEMENT_COUNTERS = {
+    "words": ("chapters", "CASE WHEN {r}.status != 'planned' THEN COALESCE({r}.word_count, 0) ELSE 0 END"),
+    "chapters_written": ("chapters", "CASE WHEN {r}.status != 'planned' THEN 1 ELSE 0 END"),
+    "chapters_unreviewed": ("chapters", "CASE WHEN {r}.status NOT IN ('revised', 'final') AND {r}.status != 'planned' THEN 1 ELSE 0 END"),
+    "characters": ("characters", "1"),
+    "twists": ("twists", "1"),
+    "planner_blocks": ("planner_blocks", "1"),
+}
+
+# metric -> (table, group key); the achievement looks at the largest group
+ACHIEVEMENT_GROUP_COUNTS = {
+    "foreshadowings_per_twist": ("foreshadowings", "{r}.twist_id"),
+    "characters_per_name": ("characters", "lower({r}.name)"),
+}
+
+# Columns whose updates can change a metric (tables without an entry only count rows)
+_ACHIEVEMENT_UPDATE_COLUMNS = {
+    "chapters": ("word_count", "status"),
+    "characters": ("name",),
+    "foreshadowings": ("twist_id",),
+}
+
+# Rows the asspull check (knowledge learned before the character's birth) has to look at.
+# Years are parsed in Python (extract_year), so triggers only queue the character ids.
+_ACHIEVEMENT_PENDING_TRIGGERS = {
+    "knowledge_states": ("character_id", ("character_id", "world_time")),
+    "characters": ("id", ("birth_date",)),
+}
+
+
+def _counter_add(metric: str, expr: str, row: str, sign: str) -> str:
+    return f"""
+        INSERT INTO achievement_counters (metric, value) VALUES ('{metric}', {sign}({expr.format(r=row)}))
+        ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value;"""
+
+
+def _group_add(metric: str, key: str, row: str, sign: str) -> str:
+    key_sql = f"COALESCE({key.format(r=row)}, '')"
+    statement = f"""
+        INSERT INTO achievement_group_counts (metric, group_key, n) VALUES ('{metric}', {key_sql}, {sign}1)
+        ON CONFLICT(metric, group_key) DO UPDATE SET n = n + excluded.n;"""
+    if sign == "-":
+        statement += f"""
+        DELETE FROM achievement_group_counts WHERE metric = '{metric}' AND group_key = {key_sql} AND n <= 0;"""
+    return statement
+
+
+def create_achievement_counters(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS achievement_counters (
+            metric        TEXT PRIMARY KEY,
+            value         INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS achievement_group_counts (
+            metric        TEXT NOT NULL,
+            group_key     TEXT NOT NULL,
+            n             INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, group_key)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_achievement_group_max ON achievement_group_counts(metric, n);")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS achievement_pending_checks (
+            metric        TEXT NOT NULL,
+            row_key       INTEGER NOT NULL,
+            PRIMARY KEY (metric, row_key)
+        )
+    """)
+
+    tables = {t for t, _ in ACHIEVEMENT_COUNTERS.values()} | {t for t, _ in ACHIEVEMENT_GROUP_COUNTS.values()}
+    expected = {f"achievement_{t}_{event}" for t in tables for event in ("insert", "delete")}
+    expected |= {f"achievement_{t}_update" for t in _ACHIEVEMENT_UPDATE_COLUMNS}
+    cursor.execute("PRAGMA table_info(characters)")
+    has_birth_date = "birth_date" in {r[1] for r in cursor.fetchall()}
+    if has_birth_date:
+        expected |= {f"achievement_pending_{t}_{event}" for t in _ACHIEVEMENT_PENDING_TRIGGERS for event in ("insert", "update")}
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'achievement_%'")
+    existing = dict(cursor.fetchall())
+    metrics = {**ACHIEVEMENT_COUNTERS, **ACHIEVEMENT_GROUP_COUNTS}
+    if expected <= set(existing) and all(
+        f"'{metric}'" in existing[f"achievement_{table}_insert"] for metric, (table, _) in metrics.items()
+    ):
+        return
+
+    # First time for this database (or the metric set changed): recount, then keep current
+    for name in existing:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cursor.execute("DELETE FROM achievement_counters")
+    cursor.execute("DELETE FROM achievement_group_counts")
+    for metric, (table, expr) in ACHIEVEMENT_COUNTERS.items():
+        cursor.execute(
+            f"INSERT INTO achievement_counters (metric, value) SELECT ?, CAST(TOTAL({expr.format(r=table)}) AS INTEGER) FROM {table}",
+            (metric,),
+        )
+    for metric, (table, key) in ACHIEVEMENT_GROUP_COUNTS.items():
+        cursor.execute(f"""
+            INSERT INTO achievement_group_counts (metric, group_key, n)
+            SELECT ?, COALESCE({key.format(r=table)}, '') AS k, COUNT(*) FROM {table} GROUP BY k
+        """, (metric,))
+
+    for table in sorted(tables):
+        counters = [(m, e) for m, (t, e) in ACHIEVEMENT_COUNTERS.items() if t == table]
+        groups = [(m, k) for m, (t, k) in ACHIEVEMENT_GROUP_COUNTS.items() if t == table]
+        # trigger name suffix -> (event, body)
+        triggers = {
+            "insert": ("INSERT", "".join(_counter_add(m, e, "NEW", "+") for m, e in counters)
+                                 + "".join(_group_add(m, k, "NEW", "+") for m, k in groups)),
+            "delete": ("DELETE", "".join(_counter_add(m, e, "OLD", "-") for m, e in counters)
+                                 + "".join(_group_add(m, k, "OLD", "-") for m, k in groups)),
+        }
+        if table in _ACHIEVEMENT_UPDATE_COLUMNS:
+            # Row-count metrics ("1") can't change on update
+            triggers["update"] = (
+                f"UPDATE OF {', '.join(_ACHIEVEMENT_UPDATE_COLUMNS[table])}",
+                "".join(_counter_add(m, e, "OLD", "-") + _counter_add(m, e, "NEW", "+") for m, e in counters if e != "1")
+                + "".join(_group_add(m, k, "OLD", "-") + _group_add(m, k, "NEW", "+") for m, k in groups),
+            )
+        for suffix, (event, statements) in triggers.items():
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS achievement_{table}_{suffix}
+                AFTER {event} ON {table}
+                BEGIN{statements}
+                END;
+            """)
+
+    if has_birth_date:
+        for table, (key, columns) in _ACHIEVEMENT_PENDING_TRIGGERS.items():
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS achievement_pending_{table}_update
+                AFTER UPDATE OF {", ".join(columns)} ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO achievement_pending_checks (metric, row_key) VALUES ('asspull', NEW.{key});
+                END;
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS achievement_pending_{table}_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO achievement_pending_checks (metric, row_key) VALUES ('asspull', NEW.{key});
+                END;
+            """)
+        # Everything is unchecked until the first achievements read
+        cursor.execute("INSERT OR IGNORE INTO achievement_pending_checks (metric, row_key) SELECT 'asspull', id FROM characters")
+
+
+def create_import_jobs(cursor):
+    """Background manuscript-import jobs (routes/import_jobs.py)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            job_id        TEXT PRIMARY KEY,
+            kind          TEXT NOT NULL,    -- split_preview / confirm_splits / ner_analyze / bulk_create_entities
+            state         TEXT NOT NULL,    -- running / done / error / cancelled
+            error         TEXT,
+            created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at   TIMESTAMP
+        )
+    """)
+
+
 # ─── DATABASE GENERATOR ──────────────────────────────────────────────────────
 
 
@@ -735,6 +991,13 @@ def generate_project_db(project_path: str, answers: dict) -> str:
         );
     """)
 
+    # ══════════════════════════════════════════════════════════
+    # STAT LOG ROLLUPS (hourly / daily / monthly)
+    # Maintained by triggers on stat_logs — see create_stat_rollups
+    # ══════════════════════════════════════════════════════════
+
+    create_stat_rollups(cursor)
+
     # ══════════════════════════════════════════════════════════
     # TRIGGER: UPDATE_BLOCK_CHAPTER_STATUS
     # Sync planner blocks when chapter status changes natively
@@ -848,6 +1111,77 @@ def generate_project_db(project_path: str, answers: dict) -> str:
         )
     """)
 
+    # ══════════════════════════════════════════════════════════
+    # JANITOR RESULTS
+    # Persisted suggestions from project-wide janitor batch runs.
+    # content_hash covers the chapter file plus analysis inputs,
+    # so unchanged chapters are skipped on the next run.
+    # ══════════════════════════════════════════════════════════
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS janitor_results (
+            chapter_id    INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+            content_hash  TEXT NOT NULL,
+            language      TEXT NOT NULL,
+            suggestions   TEXT NOT NULL DEFAULT '[]',
+            analyzed_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ══════════════════════════════════════════════════════════
+    # CHAPTER METRICS
+    # Cached five-sense counts and readability per chapter,
+    # refreshed on chapter save so the senses overview is a
+    # single table read.
+    # ══════════════════════════════════════════════════════════
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chapter_metrics (
+            chapter_id    INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+            content_hash  TEXT NOT NULL,
+            language      TEXT NOT NULL,
+            senses        TEXT,  -- JSON {sense: count}; NULL for chapters without text
+            readability   TEXT,  -- JSON {score, grade, label}
+            updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ══════════════════════════════════════════════════════════
+    # CHAPTER WORD FREQUENCIES
+    # Per-chapter word counts, diffed on chapter save, so the
+    # Statistics top-words list is a SQL aggregation instead of
+    # a re-scan of every chapter file. Unfiltered: stopwords and
+    # entity names are excluded at query time.
+    # ══════════════════════════════════════════════════════════
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chapter_word_freq (
+            chapter_id    INTEGER NOT NULL REFERENCES chapters(id) ON DELETE CASCADE,
+            word          TEXT NOT NULL,
+            count         INTEGER NOT NULL,
+            PRIMARY KEY (chapter_id, word)
+        )
+    """)
+
+    # Which version of each .md file the index reflects (edits that bypass chapter save)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chapter_word_freq_state (
+            chapter_id    INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+            md_mtime      REAL,
+            md_size       INTEGER
+        )
+    """)
+
+    # ══════════════════════════════════════════════════════════
+    # IMPORT JOBS
+    # Background manuscript-import jobs (routes/import_jobs.py);
+    # their state is kept so a reload doesn't lose finished work.
+    # ══════════════════════════════════════════════════════════
+    create_import_jobs(cursor)
+
+    # Achievement metrics (trigger-maintained, see create_achievement_counters)
+    create_achievement_counters(cursor)
+
     # ══════════════════════════════════════════════════════════
     # INDEXES
     # Targeted indexes for the queries the frontend runs most:
@@ -903,6 +1237,7 @@ def generate_project_db(project_path: str, answers: dict) -> str:
         "CREATE INDEX IF NOT EXISTS idx_stat_logs_timestamp ON stat_logs(timestamp);",
         "CREATE INDEX IF NOT EXISTS idx_entity_mentions_chapter ON entity_mentions(chapter_id);",
         "CREATE INDEX IF NOT EXISTS idx_entity_mentions_entity ON entity_mentions(entity_type, entity_id);",
+        "CREATE INDEX IF NOT EXISTS idx_word_freq_word ON chapter_word_freq(word);",
 
         # History timeline indexes
         "CREATE INDEX IF NOT EXISTS idx_history_entity ON history_entries(entity_type, entity_id);",
@@ -1285,6 +1620,56 @@ def apply_migrations(db_path: str):
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_imgref_entity ON image_references(entity_type, entity_id);")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_imgref_icon ON image_references(entity_type, entity_id, is_icon);")
 
+        # Janitor batch results
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS janitor_results (
+                chapter_id    INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+                content_hash  TEXT NOT NULL,
+                language      TEXT NOT NULL,
+                suggestions   TEXT NOT NULL DEFAULT '[]',
+                analyzed_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Cached per-chapter senses/readability metrics
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chapter_metrics (
+                chapter_id    INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+                content_hash  TEXT NOT NULL,
+                language      TEXT NOT NULL,
+                senses        TEXT,
+                readability   TEXT,
+                updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Per-chapter word frequencies (top words)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chapter_word_freq (
+                chapter_id    INTEGER NOT NULL REFERENCES chapters(id) ON DELETE CASCADE,
+                word          TEXT NOT NULL,
+                count         INTEGER NOT NULL,
+                PRIMARY KEY (chapter_id, word)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chapter_word_freq_state (
+                chapter_id    INTEGER PRIMARY KEY REFERENCES chapters(id) ON DELETE CASCADE,
+                md_mtime      REAL,
+                md_size       INTEGER
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_word_freq_word ON chapter_word_freq(word);")
+
+        # Pre-aggregated stat_logs rollups (backfilled once, then trigger-maintained)
+        create_stat_rollups(cursor)
+
+        # Achievement metrics (backfilled once, then trigger-maintained)
+        create_achievement_counters(cursor)
+
+        # Background import jobs
+        create_import_jobs(cursor)
+
         # Ensure assets directory exists for existing projects
         project_dir = os.path.dirname(db_path)
         os.makedirs(os.path.join(project_dir, "assets"), exist_ok=True)
@@ -0,0 +1,161 @@
+"""
+FleshNote — Entity Name Matcher
+Aho-Corasick automaton over every entity name, alias and name part in a project.
+Finds all occurrences in a single pass over the text instead of one regex scan
+per name, with the same case-insensitive word-boundary semantics as r'\\b...\\b'.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict, deque
+
+# Projects whose matcher is kept (least recently used are dropped first)
+MATCHER_CACHE_SIZE = 8
+
+# Per-project LRU: project_path -> (entity-set signature, EntityMatcher)
+_matcher_cache: OrderedDict = OrderedDict()
+_matcher_lock = threading.Lock()
+
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror of the re module's \\w for str patterns."""
+    return ch.isalnum() or ch == "_"
+
+
+def _fold(text: str) -> str:
+    """Lowercase without changing the string length, so offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A handful of characters (e.g. 'İ') expand when lowercased — keep those as-is
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def entity_set_signature(entities: list[dict]) -> str:
+    """Stable hash of the entity set; changes whenever a name or alias changes."""
+    h = hashlib.sha1()
+    for e in entities:
+        h.update(f"{e['type']}:{e['id']}:{e['name']}".encode("utf-8"))
+        for alias in (e.get("aliases") or []):
+            h.update(b"\x1f")
+            h.update(str(alias).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+class EntityMatcher:
+    """
+    Multi-pattern matcher built from a project's entities.
+
+    Patterns are the lowercased names, aliases and standalone name parts (>= 4
+    chars) of multi-word names. `find_all` returns, per pattern, the matches
+    that satisfy word boundaries in the original text.
+    """
+
+    def __init__(self, entities: list[dict]):
+        self.entities = entities
+        patterns: set[str] = set()
+        for e in entities:
+            names = [e["name"]] + (e.get("aliases") or [])
+            for name in names:
+                if name and len(name) >= 2:
+                    patterns.add(_fold(name))
+            parts = (e["name"] or "").split()
+            if len(parts) >= 2:
+                for part in parts:
+                    if len(part) >= 4:
+                        patterns.add(_fold(part))
+        self.patterns = sorted(patterns)
+        self._build(self.patterns)
+
+    def _build(self, patterns: list[str]):
+        # Trie as parallel lists: goto transitions, failure links, pattern outputs
+        goto: list[dict] = [{}]
+        out: list[list[int]] = [[]]
+        for idx, pat in enumerate(patterns):
+            state = 0
+            for ch in pat:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(idx)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._lengths = [len(p) for p in patterns]
+
+    def find_all(self, text: str) -> dict[str, list[tuple[int, int]]]:
+        """
+        Scan `text` once. Returns {pattern: [(start, end), ...]} with matches in
+        ascending order, non-overlapping per pattern, like re.finditer.
+        """
+        results: dict[str, list[tuple[int, int]]] = {}
+        if not self.patterns or not text:
+            return results
+
+        folded = _fold(text)
+        n = len(text)
+        goto, fail, out, lengths, patterns = self._goto, self._fail, self._out, self._lengths, self.patterns
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for idx in out[state]:
+                start = end - lengths[idx]
+                # \b at start: word-ness must differ across the boundary
+                before = _is_word_char(text[start - 1]) if start > 0 else False
+                if before == _is_word_char(text[start]):
+                    continue
+                after = _is_word_char(text[end]) if end < n else False
+                if after == _is_word_char(text[end - 1]):
+                    continue
+                found = results.setdefault(patterns[idx], [])
+                if found and start < found[-1][1]:
+                    continue  # overlaps the previous match of the same pattern
+                found.append((start, end))
+        return results
+
+
+def match_spans(matches: dict, name: str) -> list[tuple[int, int]]:
+    """Spans for a raw (un-normalized) name out of a `find_all` result."""
+    return matches.get(_fold(name), [])
+
+
+def get_entity_matcher(project_path: str, entities: list[dict]) -> EntityMatcher:
+    """Return the cached matcher for this project, rebuilding it when the entity set changes."""
+    signature = entity_set_signature(entities)
+    key = os.path.normcase(os.path.abspath(project_path))
+    with _matcher_lock:
+        cached = _matcher_cache.get(key)
+        if cached and cached[0] == signature:
+            _matcher_cache.move_to_end(key)
+            return cached[1]
+    matcher = EntityMatcher(entities)
+    with _matcher_lock:
+        _matcher_cache[key] = (signature, matcher)
+        _matcher_cache.move_to_end(key)
+        while len(_matcher_cache) > MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matcher
@@ -2,15 +2,77 @@ import os
 import sqlite3
 import datetime
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 from export.typography import apply_typography
-from export.strip import strip_prose, strip_notes, strip_full, strip_todo
+from export.strip import strip_prose, strip_notes, strip_full, strip_todo, prefetch_annotation_content
 import export.render_txt as render_txt
 import export.render_md as render_md
 import export.render_html as render_html
-import export.render_docx as render_docx
-import export.render_pdf as render_pdf
-import export.render_epub as render_epub
+# render_docx / render_pdf / render_epub pull in python-docx, xhtml2pdf and ebooklib,
+# which together add most of a second to backend startup — imported on first export instead
+
+# Chapter preprocessing (typography, TODO removal, marker stripping) is spread over worker
+# processes for big manuscripts. In-process it runs at roughly 12 MB/s; sending a chapter to a
+# worker and back costs ~5 ms/MB. Below these many characters starting the pool costs more than
+# it saves: spawned workers (Windows, macOS) take ~100 ms to start, forked ones (Linux) ~5 ms.
+# See benchmarks/bench_export_preprocess.py.
+EXPORT_PARALLEL_MIN_CHARS = 3_000_000
+EXPORT_PARALLEL_MIN_CHARS_FORK = 500_000
+MAX_EXPORT_WORKERS = 4
+
+# (content_mode, remove_html, annotation_content), set once per worker by the pool initializer
+_worker_args: tuple = ()
+
+
+def _preprocess_chapter(text: str, content_mode: str, remove_html: bool, annotation_content: dict) -> tuple[str, list, int]:
+    """Typography, TODO removal and content-mode stripping for one chapter: (text, footnotes, todo_count)."""
+    text = apply_typography(text)
+    text, todo_count = strip_todo(text)
+
+    if content_mode == 'prose':
+        return strip_prose(text, annotation_content, remove_html=remove_html), [], todo_count
+    if content_mode == 'notes':
+        text, footnotes = strip_notes(text, annotation_content, remove_html=remove_html)
+    else:
+        text, footnotes = strip_full(text, annotation_content, remove_html=remove_html)
+    return text, footnotes, todo_count
+
+
+def _init_preprocess_worker(content_mode: str, remove_html: bool, annotation_content: dict):
+    global _worker_args
+    _worker_args = (content_mode, remove_html, annotation_content)
+
+
+def _preprocess_in_worker(text: str) -> tuple[str, list, int]:
+    return _preprocess_chapter(text, *_worker_args)
+
+
+def _parallel_min_chars() -> int:
+    """Size from which the worker pool pays off, for the start method the pool will use."""
+    if multiprocessing.get_start_method() == "fork":
+        return EXPORT_PARALLEL_MIN_CHARS_FORK
+    return EXPORT_PARALLEL_MIN_CHARS
+
+
+def _preprocess_chapters(texts: list, content_mode: str, remove_html: bool, annotation_content: dict) -> list:
+    """_preprocess_chapter results in chapter order, fanned out over worker processes for big manuscripts."""
+    workers = min(len(texts), MAX_EXPORT_WORKERS, os.cpu_count() or 1)
+    if workers > 1 and sum(len(text) for text in texts) >= _parallel_min_chars():
+        try:
+            # The annotation lookups go to each worker once, not with every chapter
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_preprocess_worker,
+                initargs=(content_mode, remove_html, annotation_content),
+            ) as pool:
+                # map() yields results in submission order, so chapter order is kept
+                return list(pool.map(_preprocess_in_worker, texts, chunksize=max(1, len(texts) // (workers * 4))))
+        except Exception as e:
+            print(f"Export: parallel preprocessing failed ({e}), running in-process", flush=True)
+    return [_preprocess_chapter(text, content_mode, remove_html, annotation_content) for text in texts]
+
 
 class ExportPipeline:
     def __init__(self, project_path: str):
@@ -87,20 +149,15 @@ class ExportPipeline:
         plain_formats = ('txt', 'md')
         remove_html = fmt in plain_formats
 
-        text = apply_typography(preview_chapter['text'])
-        text, _ = strip_todo(text)
+        annotation_content = {}
+        if content_mode != 'prose':
+            annotation_content = prefetch_annotation_content(conn, [preview_chapter['text']])
+        conn.close()
 
-        if content_mode == 'prose':
-            text = strip_prose(text, conn, remove_html=remove_html)
-            footnotes = []
-        elif content_mode == 'notes':
-            text, footnotes = strip_notes(text, conn, remove_html=remove_html)
-        else:
-            text, footnotes = strip_full(text, conn, remove_html=remove_html)
+        text, footnotes, _ = _preprocess_chapter(preview_chapter['text'], content_mode, remove_html, annotation_content)
 
         preview_chapter['text'] = text
         preview_chapter['footnotes'] = footnotes
-        conn.close()
 
         if fmt == 'txt':
             plain = render_txt.render([preview_chapter], content_mode)
@@ -126,30 +183,24 @@ class ExportPipeline:
     def run(self, content_mode: str, fmt: str, book_ready: bool = False, overrides: dict = None, chapter_ids: list = None):
         """Executes the export pipeline returning the output filepath"""
         chapters = self.get_chapters_ordered(chapter_ids)
-        conn = sqlite3.connect(self.db_path)
+
+        # Everything the markers reference is fetched up front, a few IN (...) queries in total
+        annotation_content = {}
+        if content_mode != 'prose':
+            conn = sqlite3.connect(self.db_path)
+            annotation_content = prefetch_annotation_content(conn, [ch['text'] for ch in chapters])
+            conn.close()
         
         # --- STAGE 2: RENDER ---
         rendered_output = ""
         todo_count = 0
         remove_html = fmt in ('txt', 'md', 'docx')
         
-        for ch in chapters:
-            text = apply_typography(ch['text'])
-            text, t_count = strip_todo(text)
+        results = _preprocess_chapters([ch['text'] for ch in chapters], content_mode, remove_html, annotation_content)
+        for ch, (text, footnotes, t_count) in zip(chapters, results):
             todo_count += t_count
-            
-            if content_mode == 'prose':
-                text = strip_prose(text, conn, remove_html=remove_html)
-                footnotes = []
-            elif content_mode == 'notes':
-                text, footnotes = strip_notes(text, conn, remove_html=remove_html)
-            else:
-                text, footnotes = strip_full(text, conn, remove_html=remove_html)
-                
             ch['text'] = text
             ch['footnotes'] = footnotes
-            
-        conn.close()
         
         # --- STAGE 3: RENDER ---
         if fmt == 'txt':
@@ -159,10 +210,13 @@ class ExportPipeline:
         elif fmt == 'html':
             rendered_output = render_html.render(self.project_title, self.author_name, chapters, content_mode, overrides)
         elif fmt == 'docx':
+            import export.render_docx as render_docx
             rendered_output = render_docx.render(self.project_title, self.author_name, chapters, content_mode, overrides)
         elif fmt == 'pdf':
+            import export.render_pdf as render_pdf
             rendered_output = render_pdf.render(self.project_title, self.author_name, chapters, content_mode, overrides)
         elif fmt == 'epub':
+            import export.render_epub as render_epub
             rendered_output = render_epub.render(self.project_title, self.author_name, chapters, content_mode)
         else:
             rendered_output = "Unknown format."
@@ -38,24 +38,46 @@ def _resolve_entity_name(db_conn, entity_id: str, short_type: str) -> str:
     
     return "" # Fallback to empty so we can use the text inside the marker
 
-def _resolve_annotation_content(db_conn, entity_id: str, short_type: str) -> str:
+# Marker type -> (table, column) the footnote / entity-link text comes from
+_CONTENT_SOURCES = {
+    'annotation': ('annotations', 'content'),
+    'secret': ('secrets', 'description'),
+    'item': ('lore_entities', 'description'),
+    'lore': ('lore_entities', 'description'),
+}
+
+# Ids per SELECT ... IN (...) query
+_PREFETCH_CHUNK = 500
+
+def prefetch_annotation_content(db_conn, texts) -> dict:
+    """
+    Looks up the annotation / secret / lore text behind every marker in `texts` with
+    one IN (...) query per table, so stripping never hits the DB per marker.
+    Returns {(marker type, marker id): text}; missing rows are left out.
+    """
+    wanted = {}  # table -> {int id: [(stype, sid), ...]}
+    for text in texts:
+        for stype, sid, _ in _FLESHNOTE_MARKER_PATTERN.findall(text or ""):
+            source = _CONTENT_SOURCES.get(stype)
+            if source:
+                wanted.setdefault(source, {}).setdefault(int(sid), set()).add((stype, sid))
+
+    content = {}
     cursor = db_conn.cursor()
-    try:
-        if short_type == 'annotation':
-            cursor.execute("SELECT content FROM annotations WHERE id = ?", (entity_id,))
-            row = cursor.fetchone()
-            if row: return row[0]
-        elif short_type == 'secret':
-            cursor.execute("SELECT description FROM secrets WHERE id = ?", (entity_id,))
-            row = cursor.fetchone()
-            if row: return row[0]
-        elif short_type in ('item', 'lore'):
-            cursor.execute("SELECT description FROM lore_entities WHERE id = ?", (entity_id,))
-            row = cursor.fetchone()
-            if row: return row[0]
-    except Exception:
-        pass
-    return ""
+    for (table, column), ids in wanted.items():
+        id_list = list(ids)
+        try:
+            for i in range(0, len(id_list), _PREFETCH_CHUNK):
+                chunk = id_list[i:i + _PREFETCH_CHUNK]
+                cursor.execute(
+                    f"SELECT id, {column} FROM {table} WHERE id IN ({', '.join('?' for _ in chunk)})", chunk
+                )
+                for row_id, value in cursor.fetchall():
+                    for key in ids.get(row_id, ()):
+                        content[key] = value
+        except sqlite3.Error:
+            pass  # e.g. table missing in an older project: markers fall back to their own text
+    return content
 
 def strip_html(text: str) -> str:
     """Removes HTML tags and converts common ones to newlines if needed."""
@@ -74,7 +96,7 @@ def _strip_knowledge_rel_markers(text: str) -> str:
     return _KNOWLEDGE_REL_PATTERN.sub(r'\4', text)
 
 
-def strip_prose(text: str, db_conn, remove_html: bool = True) -> str:
+def strip_prose(text: str, annotation_content: dict, remove_html: bool = True) -> str:
     """Prose Only mode: removing all markers, converting links to plain text."""
     text = _TIME_MARKER_PATTERN.sub(r'\1', text)
     text = _strip_knowledge_rel_markers(text)
@@ -92,8 +114,9 @@ def strip_prose(text: str, db_conn, remove_html: bool = True) -> str:
 
     return text
 
-def strip_notes(text: str, db_conn, remove_html: bool = True) -> tuple[str, list[str]]:
-    """With Annotations mode: export annotations -> footnotes. Quick notes removed."""
+def strip_notes(text: str, annotation_content: dict, remove_html: bool = True) -> tuple[str, list[str]]:
+    """With Annotations mode: export annotations -> footnotes. Quick notes removed.
+    annotation_content comes from prefetch_annotation_content."""
     text = _TIME_MARKER_PATTERN.sub(r'\1', text)
     text = _strip_knowledge_rel_markers(text)
     text = _EPISTEMIC_PATTERN.sub('', text)
@@ -108,7 +131,7 @@ def strip_notes(text: str, db_conn, remove_html: bool = True) -> tuple[str, list
         original_text = match.group(3)
 
         if stype == 'annotation':
-            content = _resolve_annotation_content(db_conn, sid, stype)
+            content = annotation_content.get((stype, sid))
             notes_extracted.append(content if content else original_text)
             idx = len(notes_extracted)
             return f"{original_text}[[FOOTNOTE_REF:{idx}]]"
@@ -125,8 +148,9 @@ def strip_notes(text: str, db_conn, remove_html: bool = True) -> tuple[str, list
         
     return text, notes_extracted
 
-def strip_full(text: str, db_conn, remove_html: bool = False) -> tuple[str, list[str]]:
-    """Full Annotated mode: annotations become footnotes, entity/twist links preserved."""
+def strip_full(text: str, annotation_content: dict, remove_html: bool = False) -> tuple[str, list[str]]:
+    """Full Annotated mode: annotations become footnotes, entity/twist links preserved.
+    annotation_content comes from prefetch_annotation_content."""
     text = _TIME_MARKER_PATTERN.sub(r'\1', text)
     text = _strip_knowledge_rel_markers(text)
 
@@ -141,7 +165,7 @@ def strip_full(text: str, db_conn, remove_html: bool = False) -> tuple[str, list
         original_text = match.group(3)
 
         if stype == 'annotation':
-            content = _resolve_annotation_content(db_conn, sid, stype)
+            content = annotation_content.get((stype, sid))
             notes_extracted.append(content if content else original_text)
             idx = len(notes_extracted)
             return f"{original_text}[[FOOTNOTE_REF:{idx}]]"
@@ -149,7 +173,7 @@ def strip_full(text: str, db_conn, remove_html: bool = False) -> tuple[str, list
         if stype == 'quicknote':
             return ""  # Author only
 
-        desc = _resolve_annotation_content(db_conn, sid, stype)
+        desc = annotation_content.get((stype, sid))
 
         if stype in ('secret', 'lore', 'item') and desc:
             return f"[[ENTITY_LINK:{stype}:{sid}:{original_text}:{desc}]]"
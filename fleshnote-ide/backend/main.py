@@ -31,6 +31,8 @@ from routes.spellcheck import router as spellcheck_router
 from routes.world_times import router as world_times_router
 from routes.boards import router as boards_router
 from routes.janitor import router as janitor_router
+from routes.janitor_batch import router as janitor_batch_router
+from routes.import_jobs import router as import_jobs_router
 from routes.image_references import router as image_references_router
 from routes.name_gen import router as name_gen_router
 
@@ -62,6 +64,8 @@ app.include_router(spellcheck_router)
 app.include_router(world_times_router)
 app.include_router(boards_router)
 app.include_router(janitor_router)
+app.include_router(janitor_batch_router)
+app.include_router(import_jobs_router)
 app.include_router(image_references_router)
 app.include_router(name_gen_router)
 
@@ -207,6 +211,10 @@ def load_project(request: ProjectLoadRequest):
     except Exception as e:
       print(f"Warning: Failed to apply migrations: {e}")
 
+    # Load the story language's NLP models in the background before the first Janitor pass
+    from model_warmup import schedule_warmup
+    schedule_warmup(config.get("story_language") or "en")
+
     return {"status": "success", "config": config}
   except Exception as e:
     raise HTTPException(status_code=500, detail=str(e))
@@ -306,7 +314,11 @@ def update_project_config(request: ProjectConfigUpdateRequest):
 
 
 if __name__ == "__main__":
+  import multiprocessing
   import uvicorn
 
+  # Janitor batch runs use a process pool; required for PyInstaller builds
+  multiprocessing.freeze_support()
+
   # Run the server on port 8000
   uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,107 @@
+"""
+FleshNote — Background Model Warm-up
+When a project opens, load its story language's spaCy pipeline, Hunspell
+dictionary and synonym data on a background thread (plus a tiny dummy parse),
+so the first Janitor pass, NER import or name generation doesn't pay for it.
+The UI polls the readiness status before making blocking NLP calls.
+"""
+
+import time
+import threading
+
+# Per-component states
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+UNAVAILABLE = "unavailable"   # nothing to load for this language / data not downloaded
+ERROR = "error"
+
+COMPONENTS = ("spacy", "hunspell", "wordnet")
+
+_DUMMY_TEXT = "The quick brown fox jumps over the lazy dog. She smiled quietly."
+
+# language -> {"components": {name: state}, "errors": {name: str}, "started_at", "finished_at"}
+_warmups: dict = {}
+_warmups_lock = threading.Lock()
+
+
+def _warm_spacy(language: str) -> str:
+    from nlp_manager import check_model_exists, use_nlp
+    from spacy_config import SPACY_MODELS
+    if SPACY_MODELS.get(language) and not check_model_exists(language):
+        # Downloads go through the UI's /api/nlp/load flow, with progress reporting
+        return UNAVAILABLE
+    with use_nlp(language) as nlp:
+        nlp(_DUMMY_TEXT)
+    return READY
+
+
+def _warm_hunspell(language: str) -> str:
+    import spell_manager
+    if spell_manager.get_spell_checker(language) is None:
+        return UNAVAILABLE
+    spell_manager.lookup(language, "the")
+    return READY
+
+
+def _warm_wordnet(language: str) -> str:
+    from nltk_manager import check_wordnet_complete, get_synonyms
+    if not check_wordnet_complete():
+        # get_synonyms would fall back to ensure_wordnet_available(), which downloads
+        # whatever is missing; downloads go through /api/synonyms/ensure-data instead
+        return UNAVAILABLE
+    get_synonyms("good", "eng" if language == "en" else language)
+    return READY
+
+
+_WARMERS = {
+    "spacy": _warm_spacy,
+    "hunspell": _warm_hunspell,
+    "wordnet": _warm_wordnet,
+}
+
+
+def _run(language: str, state: dict):
+    for name in COMPONENTS:
+        state["components"][name] = LOADING
+        try:
+            state["components"][name] = _WARMERS[name](language)
+        except Exception as e:
+            state["components"][name] = ERROR
+            state["errors"][name] = str(e)
+    state["finished_at"] = time.time()
+    print(f"Warm-up for '{language}' finished in {state['finished_at'] - state['started_at']:.1f}s: "
+          f"{state['components']}", flush=True)
+
+
+def schedule_warmup(language: str) -> dict:
+    """Start warming `language` in the background unless it's already warm or warming."""
+    with _warmups_lock:
+        state = _warmups.get(language)
+        if state is not None and ERROR not in state["components"].values():
+            return state
+        state = {
+            "components": {name: PENDING for name in COMPONENTS},
+            "errors": {},
+            "started_at": time.time(),
+            "finished_at": None,
+        }
+        _warmups[language] = state
+    threading.Thread(target=_run, args=(language, state), daemon=True).start()
+    return state
+
+
+def warmup_status(language: str) -> dict:
+    state = _warmups.get(language)
+    if state is None:
+        return {"language": language, "scheduled": False, "ready": False, "components": {}, "errors": {}}
+    components = dict(state["components"])
+    return {
+        "language": language,
+        "scheduled": True,
+        # Ready = nothing left loading; unavailable/error components won't get any faster by waiting
+        "ready": all(s not in (PENDING, LOADING) for s in components.values()),
+        "components": components,
+        "errors": dict(state["errors"]),
+        "elapsed_ms": int(((state["finished_at"] or time.time()) - state["started_at"]) * 1000),
+    }
@@ -0,0 +1,118 @@
+"""
+FleshNote — NER Result Cache
+Import NER (`ner-analyze`, `ner-extract`) tends to be re-run on the same chapters or pasted
+text while the user tunes what to keep. The raw entities spaCy found in each chunk are kept
+on disk, keyed by the pipeline (model name + version + enabled components) and a SHA-256 of
+the text, so a repeat run only redoes the cheap cleaning, grouping and alias logic.
+The cache is shared by all projects: {AppData}/FleshNote/Cache/ner_cache.db
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# Least recently used chunks are dropped beyond this many
+MAX_ENTRIES = 20_000
+
+# Hashes per SELECT ... IN (...) lookup
+_LOOKUP_CHUNK = 500
+
+_init_lock = threading.Lock()
+_initialized: set = set()
+
+
+def get_cache_path() -> str:
+    from nlp_manager import get_models_dir
+    return os.path.join(os.path.dirname(get_models_dir()), "Cache", "ner_cache.db")
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pipeline_key(nlp, disable=()) -> str:
+    """Identifies what produced a result: e.g. 'en_core_web_sm-3.8.0:tok2vec+ner'."""
+    meta = nlp.meta
+    enabled = "+".join(name for name in nlp.pipe_names if name not in disable)
+    return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}:{enabled}"
+
+
+def _connect():
+    path = get_cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    if path not in _initialized:
+        with _init_lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ner_cache (
+                    pipeline    TEXT NOT NULL,
+                    text_hash   TEXT NOT NULL,
+                    entities    TEXT NOT NULL,  -- JSON: [[text, label, start, end, sent_start, sent_end], ...]
+                    last_used   REAL NOT NULL,
+                    PRIMARY KEY (pipeline, text_hash)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ner_cache_last_used ON ner_cache(last_used)")
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+
+def get_many(pipeline: str, hashes: list[str]) -> dict:
+    """text_hash -> cached entity list, for the hashes that are cached."""
+    found = {}
+    unique = list(dict.fromkeys(hashes))
+    if not unique:
+        return found
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                for i in range(0, len(unique), _LOOKUP_CHUNK):
+                    chunk = unique[i:i + _LOOKUP_CHUNK]
+                    rows = conn.execute(f"""
+                        SELECT text_hash, entities FROM ner_cache
+                        WHERE pipeline = ? AND text_hash IN ({', '.join('?' for _ in chunk)})
+                    """, [pipeline, *chunk]).fetchall()
+                    found.update((h, json.loads(entities)) for h, entities in rows)
+                if found:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE ner_cache SET last_used = ? WHERE pipeline = ? AND text_hash = ?",
+                        [(now, pipeline, h) for h in found],
+                    )
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        # The cache is an optimization only: treat it as empty
+        print(f"NER cache lookup failed: {e}", flush=True)
+    return found
+
+
+def put_many(pipeline: str, results: dict):
+    """Store text_hash -> entity list results, then trim the cache to MAX_ENTRIES."""
+    if not results:
+        return
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ner_cache (pipeline, text_hash, entities, last_used) VALUES (?, ?, ?, ?)",
+                    [(pipeline, h, json.dumps(entities), now) for h, entities in results.items()],
+                )
+                excess = conn.execute("SELECT COUNT(*) FROM ner_cache").fetchone()[0] - MAX_ENTRIES
+                if excess > 0:
+                    conn.execute("""
+                        DELETE FROM ner_cache WHERE rowid IN (
+                            SELECT rowid FROM ner_cache ORDER BY last_used LIMIT ?
+                        )
+                    """, (excess,))
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"NER cache store failed: {e}", flush=True)
@@ -1,17 +1,31 @@
+import gc
+import json
 import os
 import sys
+import time
+import threading
 import subprocess
 import tempfile
 import tarfile
 import zipfile
 import shutil
 from urllib.request import urlretrieve, urlopen
+from collections import OrderedDict
+from contextlib import contextmanager
 from urllib.error import URLError
-import spacy
 from spacy_config import SPACY_MODELS
 
-# Global cache for loaded NLP models
-_model_cache = {}
+# spacy is imported on first use (get_nlp) — importing it costs ~0.5 s of backend startup
+
+# Loaded pipelines, least recently used first:
+# lang_code -> {"nlp", "model", "size_bytes", "refs", "loaded_at", "last_used", "unload_pending"}
+_model_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.RLock()
+_lang_locks: dict = {}
+
+# Resident pipelines are evicted (LRU, idle ones only) once their estimated size exceeds this
+DEFAULT_MEMORY_BUDGET_MB = 2048
+_memory_budget_bytes = int(os.getenv("FLESHNOTE_NLP_MEMORY_MB", DEFAULT_MEMORY_BUDGET_MB)) * 1024 * 1024
 
 def is_frozen() -> bool:
     """Returns True if running inside a PyInstaller bundle."""
@@ -186,12 +200,171 @@ def _download_with_pip(url: str, models_dir: str):
         raise RuntimeError(f"pip install failed with return code {process.returncode}")
 
 
+def estimate_model_size(nlp) -> int:
+    """Bytes held by a pipeline's weights and vectors (thinc params + vector table)."""
+    total = 0
+    try:
+        total += nlp.vocab.vectors.data.nbytes
+    except Exception:
+        pass
+    seen: set = set()
+    for _, proc in nlp.pipeline:
+        model = getattr(proc, "model", None)
+        if model is None or not hasattr(model, "walk"):
+            continue
+        for node in model.walk():
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            for name in node.param_names:
+                if node.has_param(name):
+                    total += getattr(node.get_param(name), "nbytes", 0)
+    return total
+
+
+def _lang_lock(lang_code: str) -> threading.Lock:
+    with _cache_lock:
+        return _lang_locks.setdefault(lang_code, threading.Lock())
+
+
+def _cached_nlp(lang_code: str):
+    with _cache_lock:
+        entry = _model_cache.get(lang_code)
+        if entry is None:
+            return None
+        _model_cache.move_to_end(lang_code)
+        entry["last_used"] = time.time()
+        return entry["nlp"]
+
+
+def _evict_over_budget(keep: str | None = None) -> list[str]:
+    """
+    Drop least-recently-used idle pipelines until the cache fits the budget.
+    The most recently used pipeline always stays, even if it alone exceeds it.
+    """
+    evicted = []
+    with _cache_lock:
+        if keep is None and _model_cache:
+            keep = next(reversed(_model_cache))
+        total = sum(e["size_bytes"] for e in _model_cache.values())
+        for lang in list(_model_cache):
+            if total <= _memory_budget_bytes:
+                break
+            entry = _model_cache[lang]
+            if lang == keep or entry["refs"] > 0:
+                continue
+            total -= entry["size_bytes"]
+            del _model_cache[lang]
+            evicted.append(lang)
+    if evicted:
+        gc.collect()
+        print(f"NLP cache: evicted {evicted} to stay under {_memory_budget_bytes // (1024 * 1024)} MB", flush=True)
+    return evicted
+
+
+def _cache_model(lang_code: str, model_name: str, nlp):
+    size = estimate_model_size(nlp)
+    now = time.time()
+    with _cache_lock:
+        _model_cache[lang_code] = {
+            "nlp": nlp,
+            "model": model_name,
+            "size_bytes": size,
+            "refs": 0,
+            "loaded_at": now,
+            "last_used": now,
+            "unload_pending": False,
+        }
+        _model_cache.move_to_end(lang_code)
+    _evict_over_budget(keep=lang_code)
+
+
+def acquire_nlp(lang_code: str):
+    """get_nlp + pin the pipeline so it isn't evicted while in use. Pair with release_nlp."""
+    nlp = get_nlp(lang_code)
+    with _cache_lock:
+        entry = _model_cache.get(lang_code)
+        if entry is not None and entry["nlp"] is nlp:
+            entry["refs"] += 1
+    return nlp
+
+
+def release_nlp(lang_code: str, nlp):
+    with _cache_lock:
+        entry = _model_cache.get(lang_code)
+        if entry is None or entry["nlp"] is not nlp or entry["refs"] == 0:
+            return
+        entry["refs"] -= 1
+        if entry["refs"] > 0:
+            return
+        if entry["unload_pending"]:
+            del _model_cache[lang_code]
+            gc.collect()
+            return
+    # A pin may have been what kept the cache over budget
+    _evict_over_budget()
+
+
+@contextmanager
+def use_nlp(lang_code: str):
+    """`with use_nlp("en") as nlp:` — pinned for the duration of the block."""
+    nlp = acquire_nlp(lang_code)
+    try:
+        yield nlp
+    finally:
+        release_nlp(lang_code, nlp)
+
+
+def unload_nlp(lang_code: str) -> str:
+    """Drop a resident pipeline. Returns "unloaded", "pending" (in use; dropped on release) or "not_loaded"."""
+    with _cache_lock:
+        entry = _model_cache.get(lang_code)
+        if entry is None:
+            return "not_loaded"
+        if entry["refs"] > 0:
+            entry["unload_pending"] = True
+            return "pending"
+        del _model_cache[lang_code]
+    gc.collect()
+    return "unloaded"
+
+
+def set_memory_budget(megabytes: int) -> list[str]:
+    """Change the cache budget; evicts right away if the resident set no longer fits."""
+    global _memory_budget_bytes
+    _memory_budget_bytes = max(0, int(megabytes)) * 1024 * 1024
+    return _evict_over_budget()
+
+
+def model_cache_status() -> dict:
+    now = time.time()
+    with _cache_lock:
+        models = [
+            {
+                "language": lang,
+                "model": e["model"],
+                "size_mb": round(e["size_bytes"] / (1024 * 1024), 1),
+                "refs": e["refs"],
+                "idle_seconds": int(now - e["last_used"]),
+                "unload_pending": e["unload_pending"],
+            }
+            for lang, e in reversed(_model_cache.items())
+        ]
+        total = sum(e["size_bytes"] for e in _model_cache.values())
+    return {
+        "models": models,  # most recently used first
+        "resident_mb": round(total / (1024 * 1024), 1),
+        "budget_mb": _memory_budget_bytes // (1024 * 1024),
+    }
+
+
 def get_nlp(lang_code: str):
     """
     Get the NLP pipeline for the requested language.
     Downloads the model to an external directory if missing.
     Falls back to spacy.blank if no model exists or download fails.
     """
+    import spacy
     model_name = SPACY_MODELS.get(lang_code)
 
     # Fallback to blank tokenization if language has no configured model
@@ -217,35 +390,87 @@ def get_nlp(lang_code: str):
             return spacy.load(model_name)
 
     # Check cache first
-    if lang_code in _model_cache:
-        return _model_cache[lang_code]
+    cached = _cached_nlp(lang_code)
+    if cached is not None:
+        return cached
+
+    # One loader per language; concurrent callers wait for it instead of loading twice
+    with _lang_lock(lang_code):
+        cached = _cached_nlp(lang_code)
+        if cached is not None:
+            return cached
+
+        if check_model_exists(lang_code):
+            nlp = load_model()
+        else:
+            # Model not found, trigger download
+            print(f"DOWNLOAD_START: {model_name}", flush=True)
 
-    if check_model_exists(lang_code):
-        _model_cache[lang_code] = load_model()
-        return _model_cache[lang_code]
-    else:
-        # Model not found, trigger download
-        print(f"DOWNLOAD_START: {model_name}", flush=True)
+            try:
+                url, archive_type = _resolve_download_url(lang_code, model_name)
 
-        try:
-            url, archive_type = _resolve_download_url(lang_code, model_name)
-
-            if is_frozen():
-                # Production: download + extract directly (pip not available)
-                _download_frozen(url, archive_type, models_dir)
-            else:
-                # Development: use pip install --target (normal Python interpreter)
-                install_target = url
-                if lang_code == "hu" and model_name == "huspacy":
-                    install_target = f"hu_core_news_lg @ {url}"
-                _download_with_pip(install_target, models_dir)
-
-            print("DOWNLOAD_PROGRESS: 100", flush=True)
-            print("DOWNLOAD_COMPLETE", flush=True)
-
-            # Now try loading after successful installation
-            return load_model()
-
-        except Exception as e:
-            print(f"Error during model {model_name} download: {e}", flush=True)
-            return spacy.blank(lang_code)
+                if is_frozen():
+                    # Production: download + extract directly (pip not available)
+                    _download_frozen(url, archive_type, models_dir)
+                else:
+                    # Development: use pip install --target (normal Python interpreter)
+                    install_target = url
+                    if lang_code == "hu" and model_name == "huspacy":
+                        install_target = f"hu_core_news_lg @ {url}"
+                    _download_with_pip(install_target, models_dir)
+
+                print("DOWNLOAD_PROGRESS: 100", flush=True)
+                print("DOWNLOAD_COMPLETE", flush=True)
+
+                # Now try loading after successful installation
+                nlp = load_model()
+
+            except Exception as e:
+                print(f"Error during model {model_name} download: {e}", flush=True)
+                return spacy.blank(lang_code)
+
+        _cache_model(lang_code, model_name, nlp)
+        return nlp
+
+
+# Last resort if neither spaCy's language data nor stopwords.json is available
+_FALLBACK_STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "of", "it", "is",
+    "as", "was", "that", "this", "my", "your", "his", "her", "their", "are", "we", "you", "i", "he",
+    "she", "they", "be", "have",
+})
+
+_stop_words_cache: dict = {}
+
+
+def _json_stop_words(lang_code: str) -> frozenset:
+    stopwords_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stopwords.json")
+    if not os.path.exists(stopwords_path):
+        return _FALLBACK_STOP_WORDS
+    with open(stopwords_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return frozenset(data.get(lang_code, data.get("en", []))) or _FALLBACK_STOP_WORDS
+
+
+def get_stop_words(lang_code: str) -> frozenset:
+    """
+    Stop words for a language, cached per language.
+    Read from spaCy's language class (spacy.lang.<code>), which ships the word lists
+    without any model weights, so this never loads or downloads a pipeline.
+    Falls back to the bundled stopwords.json.
+    """
+    cached = _stop_words_cache.get(lang_code)
+    if cached is not None:
+        return cached
+
+    words = frozenset()
+    try:
+        from spacy.util import get_lang_class
+        words = frozenset(get_lang_class(lang_code).Defaults.stop_words)
+    except Exception as e:
+        print(f"No spaCy stop words for '{lang_code}' ({e}), using stopwords.json", flush=True)
+    if not words:
+        words = _json_stop_words(lang_code)
+
+    _stop_words_cache[lang_code] = words
+    return words
@@ -6,7 +6,8 @@ English WordNet is also bundled with the installer (next to the frozen exe) for
 """
 import os
 import sys
-import nltk
+
+# nltk itself is imported inside the functions that need it — it costs ~150 ms at startup
 
 # Global cache flags for data availability
 _wordnet_ready = False
@@ -33,6 +34,7 @@ def get_nltk_data_dir() -> str:
 
 def _ensure_nltk_path():
     """Add bundled + user data dirs to NLTK's search path. Returns user data dir."""
+    import nltk
     # Bundled path (read-only, ships with installer)
     bundled = _get_bundled_nltk_path()
     if bundled and bundled not in nltk.data.path:
@@ -75,6 +77,14 @@ def _hun_data_present(data_dir: str) -> bool:
     return os.path.exists(hun_tab)
 
 
+def check_wordnet_complete() -> bool:
+    """
+    Non-downloading check that WordNet and the merged Hungarian OMW data are both on
+    disk, i.e. ensure_wordnet_available() (and so get_synonyms) has nothing to download.
+    """
+    return check_wordnet_exists() and _hun_data_present(get_nltk_data_dir())
+
+
 def ensure_wordnet_available() -> bool:
     """Download WordNet + OMW + Extended OMW (for Hungarian) if not present."""
     global _wordnet_ready
@@ -86,14 +96,7 @@ def ensure_wordnet_available() -> bool:
 
     # If WordNet is already here, check for Hungarian specifically
     # but only if we are in a non-frozen environment or user-writable area
-    wordnet_ready = False
-    bundled = _get_bundled_nltk_path()
-    if bundled and _wordnet_data_present(bundled):
-        wordnet_ready = True
-    elif _wordnet_data_present(data_dir):
-        wordnet_ready = True
-
-    if wordnet_ready and _hun_data_present(data_dir):
+    if check_wordnet_complete():
         _wordnet_ready = True
         return True
 
@@ -101,6 +104,7 @@ def ensure_wordnet_available() -> bool:
     print("DOWNLOAD_PROGRESS: 10", flush=True)
 
     try:
+        import nltk
         # Standard downloads
         nltk.download("wordnet", download_dir=data_dir, quiet=True)
         print("DOWNLOAD_PROGRESS: 30", flush=True)
@@ -139,8 +143,13 @@ def ensure_wordnet_available() -> bool:
             shutil.copy(hun_src, hun_dst)
             print("DOWNLOAD_LOG: Hungarian WordNet data merged.", flush=True)
 
+            # The precomputed synonym store predates the Hungarian data — rebuild it
+            from synonym_store import invalidate
+            invalidate()
+
         print("DOWNLOAD_PROGRESS: 100", flush=True)
         print("DOWNLOAD_COMPLETE", flush=True)
+        _wordnet_ready = True
         return True
     except Exception as e:
         print(f"DOWNLOAD_LOG: Failed to setup WordNet: {e}", flush=True)
@@ -177,6 +186,7 @@ def ensure_cmudict_available() -> bool:
     print("DOWNLOAD_PROGRESS: 10", flush=True)
     
     try:
+        import nltk
         nltk.download("cmudict", download_dir=data_dir, quiet=True)
         print("DOWNLOAD_PROGRESS: 100", flush=True)
         print("DOWNLOAD_COMPLETE", flush=True)
@@ -192,7 +202,13 @@ def get_synonyms(word: str, lang: str = "eng") -> list:
     Get synonyms grouped by synset meaning from WordNet.
     If lang != "eng" and no results found, automatically retries with English.
     Returns list of dicts: [{ definition: str, pos: str, synonyms: [str] }]
+    Served from the precomputed synonym store when it's built; live WordNet otherwise.
     """
+    from synonym_store import lookup_synonyms
+    results = lookup_synonyms(word, lang)
+    if results is not None:
+        return results
+
     ensure_wordnet_available()
     from nltk.corpus import wordnet
 
@@ -5,6 +5,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from .calendar import extract_year
 
+import stats_aggregator
+
 router = APIRouter()
 
 class ProjectAchievementsRequest(BaseModel):
@@ -40,54 +42,94 @@ ACHIEVEMENTS_DEF = [
     { "id": "retcon", "tier": "amber", "maxProgress": 1, "isHidden": True, "type": "retcon" },
 ]
 
+def _check_asspull(cursor, counters: dict, unlocked: bool) -> int:
+    """
+    Asspull: a character knows something from before they were born. Once found it
+    stays found; until then only characters whose knowledge or birth date changed
+    since the last check (queued by triggers) are re-evaluated.
+    """
+    if unlocked or counters.get("asspull"):
+        cursor.execute("DELETE FROM achievement_pending_checks WHERE metric = 'asspull'")
+        return 1
+
+    cursor.execute("SELECT 1 FROM achievement_pending_checks WHERE metric = 'asspull' LIMIT 1")
+    if cursor.fetchone() is None:
+        return 0
+
+    cursor.execute("""
+        SELECT ks.world_time as knowledge_time, c.birth_date 
+        FROM achievement_pending_checks p
+        JOIN characters c ON c.id = p.row_key
+        JOIN knowledge_states ks ON ks.character_id = c.id
+        WHERE p.metric = 'asspull'
+          AND ks.world_time IS NOT NULL AND c.birth_date IS NOT NULL
+          AND ks.world_time != '' AND c.birth_date != ''
+    """)
+    found = 0
+    for r in cursor.fetchall():
+        k_year = extract_year(r["knowledge_time"])
+        b_year = extract_year(r["birth_date"])
+        if k_year is not None and b_year is not None and k_year < b_year:
+            found = 1
+            break
+
+    if found:
+        cursor.execute("""
+            INSERT INTO achievement_counters (metric, value) VALUES ('asspull', 1)
+            ON CONFLICT(metric) DO UPDATE SET value = 1
+        """)
+    cursor.execute("DELETE FROM achievement_pending_checks WHERE metric = 'asspull'")
+    return found
+
+
 @router.post("/api/project/achievements")
 def get_achievements(request: ProjectAchievementsRequest):
     """
-    Computes current achievement progress dynamically, auto-awards newly met 
-    thresholds into the db, and returns the merged state.
+    Reads current achievement progress from the trigger-maintained counters,
+    auto-awards newly met thresholds into the db, and returns the merged state.
     """
     db_path = os.path.join(request.project_path, "fleshnote.db")
     if not os.path.exists(db_path):
         raise HTTPException(status_code=404, detail="Database not found")
 
+    # Counters and stat_logs are written behind; make sure queued increments count
+    stats_aggregator.flush(request.project_path)
+
     try:
         conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
         # 1. Gather Metrics
-        
-        # Words (Sum of all chapter word counts)
-        cursor.execute("SELECT SUM(word_count) as total FROM chapters WHERE status != 'planned'")
-        row = cursor.fetchone()
-        total_words = row["total"] if row and row["total"] else 0
-
-        # Entities (Count of characters)
-        cursor.execute("SELECT COUNT(*) as total FROM characters")
-        row = cursor.fetchone()
-        total_entities = row["total"] if row and row["total"] else 0
-        
-        # Twists
-        cursor.execute("SELECT COUNT(*) as total FROM twists")
-        row = cursor.fetchone()
-        total_twists = row["total"] if row and row["total"] else 0
+        # Totals are maintained by triggers (db_setup.create_achievement_counters),
+        # so this is a few point reads rather than a scan of the project.
+        cursor.execute("SELECT metric, value FROM achievement_counters")
+        counters = {r["metric"]: int(r["value"] or 0) for r in cursor.fetchall()}
+
+        cursor.execute("""
+            SELECT metric, MAX(n) AS max_n
+            FROM achievement_group_counts
+            WHERE metric IN ('foreshadowings_per_twist', 'characters_per_name')
+            GROUP BY metric
+        """)
+        largest_group = {r["metric"]: int(r["max_n"] or 0) for r in cursor.fetchall()}
+
+        total_words = counters.get("words", 0)
 
         # Ruthless (Deleted Words)
-        cursor.execute("SELECT SUM(deleted_words) as total FROM stat_logs")
-        row = cursor.fetchone()
-        total_deleted = row["total"] if row and row["total"] else 0
+        cursor.execute("SELECT TOTAL(deleted_words) AS total FROM stat_rollup_monthly")
+        total_deleted = cursor.fetchone()["total"]
 
         # Streak Calculation
         cursor.execute('''
-            SELECT date(timestamp, 'localtime') as log_date, SUM(new_words) as new_words
-            FROM stat_logs
-            GROUP BY log_date
-            ORDER BY log_date DESC
+            SELECT bucket AS log_date, new_words
+            FROM stat_rollup_local_daily
+            ORDER BY bucket DESC
             LIMIT 365
         ''')
         daily_logs = cursor.fetchall()
         
-        log_map = {row["log_date"]: row["new_words"] for row in daily_logs}
+        log_map = {row["log_date"]: row["new_words"] or 0 for row in daily_logs}
         today = datetime.now()
         
         active_streak = 0
@@ -107,8 +149,8 @@ def get_achievements(request: ProjectAchievementsRequest):
                 
         metrics = {
             "words": int(total_words),
-            "entities": int(total_entities),
-            "twists": int(total_twists),
+            "entities": counters.get("characters", 0),
+            "twists": counters.get("twists", 0),
             "deleted_words": int(total_deleted),
             "streak": int(active_streak)
         }
@@ -116,65 +158,34 @@ def get_achievements(request: ProjectAchievementsRequest):
         # --- Easter Eggs & Quirks Data Aggregation ---
         
         # Outliner & Discovery & All According to Plan
-        cursor.execute("SELECT COUNT(*) as total FROM planner_blocks")
-        row = cursor.fetchone()
-        blocks_count = int(row["total"] if row and row["total"] else 0)
+        blocks_count = counters.get("planner_blocks", 0)
         
         metrics["outliner"] = 1 if (blocks_count >= 5 and total_words < 100) else 0
         metrics["discovery"] = 1 if (total_words >= 2000 and blocks_count == 0) else 0
         metrics["planner_1"] = 1 if blocks_count >= 1 else 0
 
         # Chekhov's Gun / Gunman / Apocalypse
-        cursor.execute("""
-            SELECT MAX(f_count) as max_f 
-            FROM (
-                SELECT COUNT(*) as f_count FROM foreshadowings GROUP BY twist_id
-            )
-        """)
-        row = cursor.fetchone()
-        metrics["chekhov"] = int(row["max_f"] if row and row["max_f"] else 0)
+        metrics["chekhov"] = largest_group.get("foreshadowings_per_twist", 0)
         
         # Beta Reader
-        cursor.execute("SELECT COUNT(*) as total FROM chapters WHERE status NOT IN ('revised', 'final') AND status != 'planned'")
-        row1 = cursor.fetchone()
-        non_beta_chapters = int(row1["total"] if row1 and row1["total"] else 0)
-        
-        cursor.execute("SELECT COUNT(*) as total FROM chapters WHERE status != 'planned'")
-        row2 = cursor.fetchone()
-        actual_chapters = int(row2["total"] if row2 and row2["total"] else 0)
+        non_beta_chapters = counters.get("chapters_unreviewed", 0)
+        actual_chapters = counters.get("chapters_written", 0)
         metrics["beta"] = 1 if (actual_chapters > 0 and non_beta_chapters == 0) else 0
 
         # Planet of Steves
-        cursor.execute("""
-            SELECT MAX(c_count) as max_c 
-            FROM (
-                SELECT COUNT(*) as c_count FROM characters GROUP BY lower(name)
-            )
-        """)
-        row = cursor.fetchone()
-        max_steves = int(row["max_c"] if row and row["max_c"] else 0)
-        metrics["steves"] = 1 if max_steves >= 3 else 0
+        metrics["steves"] = 1 if largest_group.get("characters_per_name", 0) >= 3 else 0
 
-        # Asspull: knowledge year < birth year
-        cursor.execute("""
-            SELECT ks.world_time as knowledge_time, c.birth_date 
-            FROM knowledge_states ks 
-            JOIN characters c ON ks.character_id = c.id
-            WHERE ks.world_time IS NOT NULL AND c.birth_date IS NOT NULL
-              AND ks.world_time != '' AND c.birth_date != ''
-        """)
-        asspull_rows = cursor.fetchall()
-        asspull_achieved = 0
-        for r in asspull_rows:
-            k_year = extract_year(r["knowledge_time"])
-            b_year = extract_year(r["birth_date"])
-            if k_year is not None and b_year is not None and k_year < b_year:
-                asspull_achieved = 1
-                break
-        metrics["asspull"] = asspull_achieved
+        # Fetch already unlocked achievements (asspull below skips work once it's earned)
+        cursor.execute("SELECT id FROM achievements")
+        unlocked_ids = {row["id"] for row in cursor.fetchall()}
+
+        metrics["asspull"] = _check_asspull(cursor, counters, "asspull" in unlocked_ids)
         
         # Stats based quirks (Gardener, Editor's Nightmare, Street Writer, Retcon)
-        cursor.execute("SELECT stat_key, stat_value FROM stats")
+        cursor.execute("""
+            SELECT stat_key, stat_value FROM stats
+            WHERE stat_key IN ('zen_sprints_400', 'hemingway_sprints_1000', 'max_combo', 'retcon_achieved')
+        """)
         gstats = {r["stat_key"]: r["stat_value"] for r in cursor.fetchall()}
         
         metrics["zen"] = 1 if int(gstats.get("zen_sprints_400", 0)) >= 1 else 0
@@ -182,12 +193,7 @@ def get_achievements(request: ProjectAchievementsRequest):
         metrics["combo"] = 1 if int(gstats.get("max_combo", 0)) >= 100 else 0
         metrics["retcon"] = 1 if int(gstats.get("retcon_achieved", 0)) >= 1 else 0
 
-        # 2. Fetch already unlocked achievements
-        cursor.execute("SELECT id FROM achievements")
-        unlocked_rows = cursor.fetchall()
-        unlocked_ids = {row["id"] for row in unlocked_rows}
-
-        # 3. Compute Progress & Award
+        # 2. Compute Progress & Award
         results = []
         newly_unlocked = []
 
@@ -213,10 +219,10 @@ def get_achievements(request: ProjectAchievementsRequest):
                 "type": ach_type
             })
 
-        # 4. Save newly unlocked
+        # 3. Save newly unlocked (and the asspull check bookkeeping)
         if newly_unlocked:
             cursor.executemany("INSERT OR IGNORE INTO achievements (id) VALUES (?)", newly_unlocked)
-            conn.commit()
+        conn.commit()
 
         conn.close()
 
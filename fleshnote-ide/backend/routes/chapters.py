@@ -9,7 +9,9 @@ import re
 import uuid
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
-from routes.imports import _plain_text_to_html
+from routes.imports import _plain_text_to_html, _write_md_files, _insert_chapters, _remove_files
+
+import stats_aggregator
 
 router = APIRouter()
 
@@ -340,6 +342,36 @@ def _time_html_to_md(content: str) -> str:
     return re.sub(pattern, replace, content)
 
 
+def _get_quicknote_types(conn) -> dict:
+    """Quick note id -> note type, for note-type coloring in _md_to_editor_html."""
+    quicknote_types = {}
+    try:
+        for qn in conn.execute("SELECT id, note_type FROM quick_notes").fetchall():
+            quicknote_types[str(qn["id"])] = qn["note_type"] or "Note"
+    except Exception:
+        pass
+    return quicknote_types
+
+
+def _md_to_editor_html(content: str, quicknote_types: dict = None) -> str:
+    """Turn a chapter's on-disk markdown into the HTML the TipTap editor works with."""
+    # Safety net: if content is plain text (no HTML tags), convert to <p> tags
+    # so TipTap renders line breaks correctly
+    content = _plain_text_to_html(content)
+
+    # Convert entity markers {{char:5|Name}} to TipTap HTML spans
+    content = _entity_md_to_html(content, quicknote_types)
+
+    # Convert twist/foreshadow markers to TipTap spans
+    content = _twist_md_to_html(content)
+
+    # Convert knowledge/relationship markers to TipTap spans
+    content = _knowledge_md_to_html(content)
+    content = _relationship_md_to_html(content)
+    content = _time_md_to_html(content)
+    return content
+
+
 def _update_knowledge_offsets(cursor, chapter_id: int, md_content: str):
     """Scan markdown for {{knowledge:id:charId|text}} markers and update word offsets."""
     pattern = r'\{\{knowledge:(\d+):(\d+)\|([^}]+)\}\}'
@@ -553,44 +585,40 @@ def update_chapter(req: ChapterUpdate):
 def bulk_create_chapters(req: BulkChapterCreate):
     """Create multiple chapters at once (used by story scope wizard)."""
     conn = _get_db(req.project_path)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT COALESCE(MAX(chapter_number), 0) FROM chapters")
-    start_num = cursor.fetchone()[0] + 1
-
-    md_dir = os.path.join(req.project_path, "md")
-    os.makedirs(md_dir, exist_ok=True)
-
-    created = []
-    for i in range(req.count):
-        num = start_num + i
-        title = f"Chapter {num}"
-        md_filename = f"ch_{num:03d}_untitled_{uuid.uuid4().hex[:8]}.md"
-        status = "writing" if i == 0 else "planned"
-        pov_id = req.pov_character_id if i == 0 else None
+    try:
+        start_num = conn.execute("SELECT COALESCE(MAX(chapter_number), 0) FROM chapters").fetchone()[0] + 1
 
-        cursor.execute("""
-            INSERT INTO chapters (chapter_number, title, status, pov_character_id,
-                                  target_word_count, md_filename, word_count)
-            VALUES (?, ?, ?, ?, ?, ?, 0)
-        """, (num, title, status, pov_id, req.target_word_count, md_filename))
+        md_dir = os.path.join(req.project_path, "md")
+        os.makedirs(md_dir, exist_ok=True)
 
-        # Create empty md file
-        md_path = os.path.join(md_dir, md_filename)
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write("")
+        rows, files, created = [], [], []
+        for i in range(req.count):
+            num = start_num + i
+            title = f"Chapter {num}"
+            md_filename = f"ch_{num:03d}_untitled_{uuid.uuid4().hex[:8]}.md"
+            status = "writing" if i == 0 else "planned"
+            pov_id = req.pov_character_id if i == 0 else None
+
+            rows.append((num, title, status, pov_id, req.target_word_count, md_filename, 0))
+            files.append((os.path.join(md_dir, md_filename), ""))
+            created.append({
+                "chapter_number": num,
+                "title": title,
+                "status": status,
+                "md_filename": md_filename,
+            })
 
-        created.append({
-            "id": cursor.lastrowid,
-            "chapter_number": num,
-            "title": title,
-            "status": status,
-            "md_filename": md_filename,
-        })
+        # Empty md files first, outside the transaction; removed again if the INSERTs fail
+        new_files = _write_md_files(files)
+        try:
+            ids = _insert_chapters(conn, rows)
+        except BaseException:
+            _remove_files(new_files)
+            raise
+    finally:
+        conn.close()
 
-    conn.commit()
-    conn.close()
-    return {"chapters": created}
+    return {"chapters": [{"id": ids[c["md_filename"]], **c} for c in created]}
 
 
 @router.post("/api/project/chapter/load")
@@ -599,14 +627,7 @@ def load_chapter_content(req: ChapterLoad):
     cursor = conn.cursor()
     cursor.execute("SELECT md_filename FROM chapters WHERE id = ?", (req.chapter_id,))
     row = cursor.fetchone()
-    # Fetch quicknote types for note-type coloring
-    quicknote_types = {}
-    try:
-        cursor.execute("SELECT id, note_type FROM quick_notes")
-        for qn in cursor.fetchall():
-            quicknote_types[str(qn["id"])] = qn["note_type"] or "Note"
-    except Exception:
-        pass
+    quicknote_types = _get_quicknote_types(conn)
     conn.close()
 
     if not row:
@@ -618,20 +639,7 @@ def load_chapter_content(req: ChapterLoad):
         with open(md_path, "r", encoding="utf-8") as f:
             content = f.read()
 
-    # Safety net: if content is plain text (no HTML tags), convert to <p> tags
-    # so TipTap renders line breaks correctly
-    content = _plain_text_to_html(content)
-
-    # Convert entity markers {{char:5|Name}} to TipTap HTML spans
-    content = _entity_md_to_html(content, quicknote_types)
-
-    # Convert twist/foreshadow markers to TipTap spans
-    content = _twist_md_to_html(content)
-
-    # Convert knowledge/relationship markers to TipTap spans
-    content = _knowledge_md_to_html(content)
-    content = _relationship_md_to_html(content)
-    content = _time_md_to_html(content)
+    content = _md_to_editor_html(content, quicknote_types)
 
     return {"content": content, "md_filename": row["md_filename"]}
 
@@ -676,6 +684,10 @@ def save_chapter_content(req: ChapterSave, background_tasks: BackgroundTasks):
     _update_knowledge_offsets(cursor, req.chapter_id, md_content)
     _update_relationship_offsets(cursor, req.chapter_id, md_content)
 
+    # Keep the per-chapter word-frequency index (top words) in step with the file
+    from routes.stats import _index_chapter_words
+    _index_chapter_words(cursor, req.chapter_id, md_content, md_path)
+
     # Update word count and timestamp
     cursor.execute("""
         UPDATE chapters
@@ -703,53 +715,21 @@ def save_chapter_content(req: ChapterSave, background_tasks: BackgroundTasks):
             cursor.execute("INSERT INTO stats (stat_key, stat_value) VALUES ('words_since_last_top_words_update', ?)", (str(current_words),))
 
     if word_diff != 0:
-        new_words = word_diff if word_diff > 0 else 0
-        deleted_words = abs(word_diff) if word_diff < 0 else 0
-        event_ctx = f"chapter_save:{req.chapter_id}"
-
-        # Get the most recent log entry for this context
-        cursor.execute("""
-            SELECT id, timestamp, new_words, deleted_words
-            FROM stat_logs
-            WHERE event_context = ?
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """, (event_ctx,))
-        last_log = cursor.fetchone()
-
-        import datetime
-
-        if last_log:
-            # Check if this log is less than 60 seconds old
-            log_time = datetime.datetime.fromisoformat(last_log["timestamp"])
-            now = datetime.datetime.utcnow()
-            diff_seconds = (now - log_time).total_seconds()
-
-            if diff_seconds < 60:
-                # Update existing row instead of spamming new rows
-                updated_new_words = last_log["new_words"] + new_words
-                updated_deleted_words = last_log["deleted_words"] + deleted_words
-                
-                cursor.execute("""
-                    UPDATE stat_logs
-                    SET new_words = ?, deleted_words = ?, timestamp = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (updated_new_words, updated_deleted_words, last_log["id"]))
-            else:
-                # 60s passed, create a new row
-                cursor.execute("""
-                    INSERT INTO stat_logs (new_words, deleted_words, event_context)
-                    VALUES (?, ?, ?)
-                """, (new_words, deleted_words, event_ctx))
-        else:
-             cursor.execute("""
-                INSERT INTO stat_logs (new_words, deleted_words, event_context)
-                VALUES (?, ?, ?)
-            """, (new_words, deleted_words, event_ctx))
+        # Written behind: merged in memory and flushed into this chapter's stat_logs row
+        stats_aggregator.add_activity(
+            req.project_path,
+            f"chapter_save:{req.chapter_id}",
+            new_words=max(word_diff, 0),
+            deleted_words=max(-word_diff, 0),
+        )
 
     conn.commit()
     conn.close()
 
+    # Refresh cached senses/readability metrics for the janitor overview
+    from routes.janitor import _update_chapter_metrics
+    background_tasks.add_task(_update_chapter_metrics, req.project_path, req.chapter_id, md_content)
+
     return {"status": "ok"}
 
 
@@ -783,6 +763,10 @@ def delete_chapter(req: ChapterDelete):
 
         # 3. Delete from DB
         cursor.execute("DELETE FROM entity_appearances WHERE chapter_id = ?", (req.chapter_id,))
+        cursor.execute("DELETE FROM janitor_results WHERE chapter_id = ?", (req.chapter_id,))
+        cursor.execute("DELETE FROM chapter_metrics WHERE chapter_id = ?", (req.chapter_id,))
+        cursor.execute("DELETE FROM chapter_word_freq WHERE chapter_id = ?", (req.chapter_id,))
+        cursor.execute("DELETE FROM chapter_word_freq_state WHERE chapter_id = ?", (req.chapter_id,))
         cursor.execute("DELETE FROM chapters WHERE id = ?", (req.chapter_id,))
         
         # 4. Shift all subsequent chapters' numbering down by 1 in sequential order
@@ -1,5 +1,5 @@
 import re
-from routes.janitor import _build_context, _make_id
+from routes.janitor import _build_context, _make_id, DOC_CHAR_LIMIT, JanitorAnalyzer, COST_PARSER
 
 # --- Hungarian SDT lexicons ---
 LINKING_VERBS_HU = {"van", "volt", "lesz", "lett", "marad", "tűnik", "látszik"}
@@ -118,15 +118,15 @@ def _analyze_five_senses_hu(plain_text: str, language: str) -> list[dict]:
     }]
 
 
-def _analyze_weak_adverbs_hu(plain_text: str, language: str, cap: int = 5) -> list[dict]:
+def _analyze_weak_adverbs_hu(plain_text: str, language: str, cap: int = 5, doc=None) -> list[dict]:
     """Detect weak adverbs modifying verbs in Hungarian text."""
     if language != "hu":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -174,15 +174,15 @@ def _analyze_weak_adverbs_hu(plain_text: str, language: str, cap: int = 5) -> li
     return suggestions
 
 
-def _analyze_passive_voice_hu(plain_text: str, language: str, cap: int = 3) -> list[dict]:
+def _analyze_passive_voice_hu(plain_text: str, language: str, cap: int = 3, doc=None) -> list[dict]:
     """Detect passive-like participle constructions (-va/-ve suffix) in Hungarian."""
     if language != "hu":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -320,16 +320,17 @@ def _analyze_show_dont_tell_hu(
     plain_text: str,
     language: str,
     confidence_threshold: float = 0.5,
-    cap: int = 5
+    cap: int = 5,
+    doc=None
 ) -> list[dict]:
     """4-detector show-don't-tell pipeline for Hungarian with em-dash dialogue exclusion."""
     if language != "hu":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -378,15 +379,16 @@ def _analyze_show_dont_tell_hu(
 def _analyze_pacing_hu(
     plain_text: str,
     language: str,
-    cap: int = 2
+    cap: int = 2,
+    doc=None
 ) -> list[dict]:
     if language != "hu":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -447,3 +449,33 @@ def _analyze_pacing_hu(
             })
 
     return suggestions
+
+
+# Registered with the janitor orchestrator (see routes/janitor.py: _get_analyzers)
+ANALYZERS = [
+    JanitorAnalyzer(
+        "five_senses",
+        lambda c: _analyze_five_senses_hu(c["plain_text"], c["language"]),
+        languages=("hu",),
+    ),
+    JanitorAnalyzer(
+        "weak_adverbs",
+        lambda c: _analyze_weak_adverbs_hu(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("hu",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "passive_voice",
+        lambda c: _analyze_passive_voice_hu(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("hu",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "show_dont_tell",
+        lambda c: _analyze_show_dont_tell_hu(c["plain_text"], c["language"], c["confidence_threshold"], doc=c["doc"]),
+        languages=("hu",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "pacing",
+        lambda c: _analyze_pacing_hu(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("hu",), needs=("doc",), cost=COST_PARSER,
+    ),
+]
@@ -0,0 +1,397 @@
+"""
+FleshNote API — Background Import Jobs
+Manuscript imports (split preview, chapter creation, NER analysis, bulk entity
+creation) can take minutes on big manuscripts, longer than an HTTP call should
+stay open. Submitted as a job, the work runs on a background thread while the UI
+polls stage / progress / ETA and can cancel it. Each job's state is stored in
+the project's import_jobs table and a finished job's result in the app cache
+({AppData}/FleshNote/Cache/import_jobs/<job_id>.json), so a reload (or a backend
+restart) doesn't lose finished work.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, ValidationError
+
+from routes.imports import (
+    ImportCancelled,
+    SplitPreviewRequest, ConfirmSplitsRequest, NerAnalyzeRequest, BulkCreateEntitiesRequest,
+    _iter_file_lines, _iter_splits, _confirm_splits, _ner_analyze, _bulk_create_entities,
+)
+
+router = APIRouter()
+
+# Jobs kept per project in import_jobs (oldest are dropped, with their results)
+MAX_STORED_JOBS = 20
+
+# Cached results older than this are removed too, e.g. those of deleted projects
+RESULT_MAX_AGE_S = 30 * 24 * 3600
+
+FINISHED_STATES = ("done", "error", "cancelled")
+
+# In-memory registry of this process's jobs: job_id -> progress dict.
+# Finished jobs are looked up in the database and the result cache.
+_import_jobs: dict = {}
+_jobs_lock = threading.Lock()
+
+
+class ImportJobStartRequest(BaseModel):
+    project_path: str
+    kind: str       # split_preview / confirm_splits / ner_analyze / bulk_create_entities
+    payload: dict   # the body the synchronous endpoint takes (project_path may be omitted)
+
+
+class ImportJobRequest(BaseModel):
+    project_path: str
+    job_id: str
+
+
+class ImportJobListRequest(BaseModel):
+    project_path: str
+
+
+def _get_db(project_path: str):
+    db_path = os.path.join(project_path, "fleshnote.db")
+    if not os.path.exists(db_path):
+        raise FileNotFoundError("Database not found")
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _set_stage(job: dict, stage: str, unit: str | None = None):
+    job["stage"] = stage
+    job["unit"] = unit
+    job["processed"] = 0
+    job["total"] = None
+    job["stage_started_at"] = time.time()
+
+
+def _progress(job: dict):
+    """Progress callback for the import functions; raises ImportCancelled once cancel is requested."""
+    def report(done: int, total: int | None):
+        if job["cancel_requested"]:
+            raise ImportCancelled()
+        job["processed"] = done
+        job["total"] = total
+    return report
+
+
+# ── Job kinds ─────────────────────────────────────────────
+
+def _run_split_preview(job: dict, req: SplitPreviewRequest) -> dict:
+    if not os.path.exists(req.file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    report = _progress(job)
+    if os.path.splitext(req.file_path)[1].lower() in (".txt", ".md"):
+        # Plain text: progress is bytes read against the file size
+        _set_stage(job, "splitting", "bytes")
+        size = os.path.getsize(req.file_path)
+
+        def lines():
+            read = 0
+            for n, line in enumerate(_iter_file_lines(req.file_path)):
+                read += len(line.encode("utf-8")) + 1
+                if n % 1000 == 0:
+                    report(min(read, size), size)
+                yield line
+    else:
+        # .docx: no cheap total, so count chapters found so far
+        _set_stage(job, "splitting", "chapters")
+
+        def lines():
+            for n, line in enumerate(_iter_file_lines(req.file_path)):
+                if n % 200 == 0:
+                    report(job["processed"], None)
+                yield line
+
+    splits = []
+    for split in _iter_splits(lines(), req.include_content):
+        splits.append(split)
+        if job["unit"] == "chapters":
+            report(len(splits), None)
+    return {
+        "splits": splits,
+        "total_words": sum(s["word_count"] for s in splits),
+        "total_chapters": len(splits),
+    }
+
+
+def _run_confirm_splits(job: dict, req: ConfirmSplitsRequest) -> dict:
+    _set_stage(job, "creating_chapters", "chapters")
+    return _confirm_splits(req, _progress(job))
+
+
+def _run_ner_analyze(job: dict, req: NerAnalyzeRequest) -> dict:
+    _set_stage(job, "loading_model")
+    from nlp_manager import acquire_nlp, release_nlp
+    try:
+        nlp = acquire_nlp(req.language)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load NLP model for {req.language}: {e}")
+    try:
+        _set_stage(job, "analyzing", "chapters")
+        return _ner_analyze(req, nlp, _progress(job))
+    finally:
+        release_nlp(req.language, nlp)
+
+
+def _run_bulk_create_entities(job: dict, req: BulkCreateEntitiesRequest) -> dict:
+    _set_stage(job, "creating_entities", "entities")
+    return _bulk_create_entities(req, _progress(job))
+
+
+# kind -> (request model, runner)
+JOB_KINDS = {
+    "split_preview": (SplitPreviewRequest, _run_split_preview),
+    "confirm_splits": (ConfirmSplitsRequest, _run_confirm_splits),
+    "ner_analyze": (NerAnalyzeRequest, _run_ner_analyze),
+    "bulk_create_entities": (BulkCreateEntitiesRequest, _run_bulk_create_entities),
+}
+
+
+# ── Persistence ───────────────────────────────────────────
+
+def _result_path(job_id: str) -> str:
+    from nlp_manager import get_models_dir
+    return os.path.join(os.path.dirname(get_models_dir()), "Cache", "import_jobs", f"{job_id}.json")
+
+
+def _save_result(job_id: str, result: dict):
+    """Write a finished job's result to the cache (whole file or nothing)."""
+    path = _result_path(job_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(tmp_path, path)
+
+    cutoff = time.time() - RESULT_MAX_AGE_S
+    for entry in os.scandir(os.path.dirname(path)):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _remove_results(job_ids):
+    for job_id in job_ids:
+        try:
+            os.remove(_result_path(job_id))
+        except OSError:
+            pass
+
+
+def _store_job(project_path: str, job: dict, state: str, error: str | None = None):
+    conn = _get_db(project_path)
+    try:
+        conn.execute("""
+            INSERT INTO import_jobs (job_id, kind, state, error, finished_at)
+            VALUES (?, ?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+            ON CONFLICT(job_id) DO UPDATE SET
+                state = excluded.state,
+                error = excluded.error,
+                finished_at = excluded.finished_at
+        """, (job["job_id"], job["kind"], state, error, state in FINISHED_STATES))
+        dropped = [row[0] for row in conn.execute("""
+            SELECT job_id FROM import_jobs ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?
+        """, (MAX_STORED_JOBS,))]
+        conn.executemany("DELETE FROM import_jobs WHERE job_id = ?", [(job_id,) for job_id in dropped])
+        conn.commit()
+    finally:
+        conn.close()
+    _remove_results(dropped)
+
+
+def _stored_job(row) -> dict:
+    state = row["state"]
+    if state == "running":
+        # Still "running" on disk but not in this process: the backend stopped mid-job
+        state = "interrupted"
+    return {
+        "job_id": row["job_id"],
+        "kind": row["kind"],
+        "state": state,
+        "stage": state,
+        "unit": None,
+        "processed": 0,
+        "total": None,
+        "elapsed_ms": None,
+        "eta_ms": None,
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "finished_at": row["finished_at"],
+    }
+
+
+def _public_job(job: dict) -> dict:
+    now = time.time()
+    eta_ms = None
+    if job["state"] == "running" and job["total"] and job["processed"]:
+        stage_elapsed = now - job["stage_started_at"]
+        eta_ms = int(stage_elapsed / job["processed"] * (job["total"] - job["processed"]) * 1000)
+    return {
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "state": job["state"],
+        "stage": job["stage"],
+        "unit": job["unit"],
+        "processed": job["processed"],
+        "total": job["total"],
+        "elapsed_ms": int(((job["finished_at"] or now) - job["started_at"]) * 1000),
+        "eta_ms": eta_ms,
+        "error": job["error"],
+    }
+
+
+def _run_job(job: dict, request: BaseModel, runner):
+    result, error = None, None
+    try:
+        result = runner(job, request)
+        state = "done"
+    except ImportCancelled:
+        state = "cancelled"
+    except HTTPException as e:
+        state, error = "error", str(e.detail)
+    except Exception as e:
+        state, error = "error", str(e)
+
+    # Stored before the job reports finished, so a poller that sees "done" can fetch the result
+    if state == "done":
+        try:
+            _save_result(job["job_id"], result)
+        except (OSError, TypeError, ValueError) as e:
+            state, error = "error", f"Could not store the result: {e}"
+    try:
+        _store_job(request.project_path, job, state, error)
+    except Exception as e:
+        print(f"Could not store import job {job['job_id']}: {e}", flush=True)
+    job["finished_at"] = time.time()
+    job["error"] = error
+    job["stage"] = state
+    job["state"] = state
+    print(f"Import job {job['job_id']} ({job['kind']}) {state} in "
+          f"{job['finished_at'] - job['started_at']:.1f}s", flush=True)
+
+
+# ── Endpoints ─────────────────────────────────────────────
+
+@router.post("/api/project/import/jobs/start")
+def import_job_start(req: ImportJobStartRequest):
+    """
+    Start a background import job. `payload` is what the matching synchronous
+    endpoint takes; the job's result is the response that endpoint would return.
+    """
+    if req.kind not in JOB_KINDS:
+        return {"status": "error", "error": f"Unknown import job kind: {req.kind}"}
+    model, runner = JOB_KINDS[req.kind]
+    try:
+        request = model(**{**req.payload, "project_path": req.project_path})
+    except ValidationError as e:
+        return {"status": "error", "error": str(e)}
+
+    job = {
+        "job_id": uuid.uuid4().hex[:12],
+        "kind": req.kind,
+        "project_path": req.project_path,
+        "state": "running",
+        "stage": "queued",
+        "unit": None,
+        "processed": 0,
+        "total": None,
+        "error": None,
+        "cancel_requested": False,
+        "started_at": time.time(),
+        "stage_started_at": time.time(),
+        "finished_at": None,
+    }
+    try:
+        _store_job(req.project_path, job, "running")
+    except FileNotFoundError as e:
+        return {"status": "error", "error": str(e)}
+    with _jobs_lock:
+        _import_jobs[job["job_id"]] = job
+
+    threading.Thread(target=_run_job, args=(job, request, runner), daemon=True).start()
+    return {"status": "ok", "job": _public_job(job)}
+
+
+@router.post("/api/project/import/jobs/status")
+def import_job_status(req: ImportJobRequest):
+    job = _import_jobs.get(req.job_id)
+    if job is not None:
+        return {"status": "ok", "job": _public_job(job)}
+    try:
+        conn = _get_db(req.project_path)
+    except FileNotFoundError as e:
+        return {"status": "error", "error": str(e)}
+    try:
+        row = conn.execute("SELECT * FROM import_jobs WHERE job_id = ?", (req.job_id,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return {"status": "error", "error": "Unknown job id"}
+    return {"status": "ok", "job": _stored_job(row)}
+
+
+@router.post("/api/project/import/jobs/cancel")
+def import_job_cancel(req: ImportJobRequest):
+    """Ask a running job to stop; it ends in state "cancelled" at its next progress report."""
+    job = _import_jobs.get(req.job_id)
+    if job is None or job["state"] != "running":
+        return {"status": "error", "error": "Job is not running"}
+    job["cancel_requested"] = True
+    job["stage"] = "cancelling"
+    return {"status": "ok", "job": _public_job(job)}
+
+
+@router.post("/api/project/import/jobs/result")
+def import_job_result(req: ImportJobRequest):
+    try:
+        conn = _get_db(req.project_path)
+    except FileNotFoundError as e:
+        return {"status": "error", "error": str(e)}
+    try:
+        row = conn.execute("SELECT * FROM import_jobs WHERE job_id = ?", (req.job_id,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return {"status": "error", "error": "Unknown job id"}
+    job = _import_jobs.get(req.job_id)
+    public = _public_job(job) if job is not None else _stored_job(row)
+    if public["state"] != "done":
+        return {"status": "error", "error": f"Job is {public['state']}", "job": public}
+    try:
+        with open(_result_path(req.job_id), "r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        return {"status": "error", "error": "Job result is no longer available", "job": public}
+    return {"status": "ok", "job": public, "result": result}
+
+
+@router.post("/api/project/import/jobs/list")
+def import_job_list(req: ImportJobListRequest):
+    """This project's recent import jobs, newest first (results via /jobs/result)."""
+    try:
+        conn = _get_db(req.project_path)
+    except FileNotFoundError as e:
+        return {"status": "error", "jobs": [], "error": str(e)}
+    try:
+        rows = conn.execute(
+            "SELECT * FROM import_jobs ORDER BY created_at DESC, rowid DESC"
+        ).fetchall()
+    finally:
+        conn.close()
+    jobs = []
+    for row in rows:
+        job = _import_jobs.get(row["job_id"])
+        jobs.append(_public_job(job) if job is not None else _stored_job(row))
+    return {"status": "ok", "jobs": jobs}
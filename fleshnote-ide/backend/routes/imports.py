@@ -5,16 +5,45 @@ Chapter splitting from manuscript files + spaCy NER extraction.
 
 import os
 import re
+import time
+import bisect
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 router = APIRouter()
 
 
+class ImportCancelled(Exception):
+    """Raised by a progress callback to stop a background import job (routes/import_jobs.py)."""
+
+
+# Chapter .md files for bulk chapter creation are written on this pool, before the
+# INSERT transaction opens (shared with routes/chapters.py bulk-create)
+_md_write_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="md-write")
+
+# Import NER runs the manuscript through nlp.pipe with only these components (plus
+# any tok2vec / transformer layers the NER listens to); tagger, parser, lemmatizer
+# etc. are skipped. Sentence boundaries for snippets come from a senter if the
+# pipeline has one enabled, otherwise from _sentence_snippet.
+_NER_COMPONENTS = {"ner", "entity_ruler", "span_ruler", "senter", "sentencizer"}
+
+# Chapters per nlp.pipe batch (chapters are long docs, so batches stay small)
+NER_BATCH_SIZE = 4
+
+# Worker processes each get a copy of the pipeline, so only fan out for big
+# manuscripts, and keep the pool small (same cap as the janitor batch runs)
+MAX_NER_PROCESSES = 4
+NER_MULTIPROCESS_MIN_WORDS = 60_000
+
+_SENTENCE_END_RE = re.compile(r'[.!?\u2026]["\u201d\u2019\')]*\s+|\n+')
+
+
 class SplitPreviewRequest(BaseModel):
     project_path: str
     file_path: str
+    include_content: bool = True  # False: titles, previews and word counts only
 
 
 class ConfirmSplitsRequest(BaseModel):
@@ -132,52 +161,283 @@ def _plain_text_to_html(text: str) -> str:
     return "".join(html_parts)
 
 
-def _read_file(file_path: str) -> str:
-    """Read a file and return its text content."""
+def _write_text_file(path: str, content: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _write_md_files(files: list[tuple[str, str]], progress=None) -> list[str]:
+    """
+    Write (path, content) pairs in parallel and return the paths that did not exist
+    before, i.e. the files this call created. progress(done, total) is called as files
+    finish and may raise ImportCancelled. If a write fails or progress raises, the files
+    this call created are removed before the error propagates, so the caller can treat
+    the batch as all-or-nothing. Files that already existed (e.g. an orphaned .md with
+    the same name) are overwritten but never removed.
+    """
+    existing = {path for path, _ in files if os.path.exists(path)}
+    futures = {_md_write_executor.submit(_write_text_file, path, content): path for path, content in files}
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            if progress:
+                progress(done, len(files))
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        _remove_files(
+            path for future, path in futures.items()
+            if not future.cancelled() and path not in existing
+        )
+        raise
+    return [path for path, _ in files if path not in existing]
+
+
+def _insert_chapters(conn, rows: list[tuple]) -> dict:
+    """
+    INSERT chapter rows (chapter_number, title, status, pov_character_id,
+    target_word_count, md_filename, word_count) in one transaction.
+    Returns md_filename -> new chapter id.
+    """
+    with conn:
+        conn.executemany("""
+            INSERT INTO chapters (chapter_number, title, status, pov_character_id,
+                                  target_word_count, md_filename, word_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        # AUTOINCREMENT ids: the rows just inserted are the newest len(rows)
+        new_ids = conn.execute(
+            "SELECT id, md_filename FROM chapters ORDER BY id DESC LIMIT ?", (len(rows),)
+        ).fetchall()
+    return {row[1]: row[0] for row in new_ids}
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PKG_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+# python-docx reports these built-in style names in UI casing ("heading 1" -> "Heading 1")
+_UI_STYLE_NAMES = {f"heading {n}": f"Heading {n}" for n in range(1, 10)}
+
+
+def _docx_heading_prefix(style_name: str | None) -> str:
+    # Preserve heading info as markdown markers
+    if style_name is None:
+        return ""
+    if style_name.startswith("Heading 1"):
+        return "# "
+    if style_name.startswith("Heading 2"):
+        return "## "
+    return ""
+
+
+def _docx_part_target(zf, rels_path: str, rel_type: str, base_dir: str) -> str | None:
+    """Zip path of the part a .rels file points to with the given relationship type."""
+    import posixpath
+    import xml.etree.ElementTree as ET
+    for rel in ET.fromstring(zf.read(rels_path)).iter(_PKG_RELATIONSHIP):
+        if rel.get("Type", "").endswith(f"/{rel_type}") and rel.get("TargetMode") != "External":
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join(base_dir, target))
+    return None
+
+
+def _docx_paragraph_styles(zf, styles_path: str | None) -> tuple[dict, str | None]:
+    """
+    (style id -> (style type, UI name), default paragraph style name), resolved
+    the way python-docx does: first style with the id, default = last default.
+    """
+    import xml.etree.ElementTree as ET
+    by_id, default_name = {}, None
+    if styles_path is None or styles_path not in zf.namelist():
+        return by_id, default_name
+    for style in ET.fromstring(zf.read(styles_path)).iter(f"{_W}style"):
+        style_type = style.get(f"{_W}type", "paragraph")
+        name_el = style.find(f"{_W}name")
+        name = name_el.get(f"{_W}val") if name_el is not None else None
+        name = _UI_STYLE_NAMES.get(name, name)
+        by_id.setdefault(style.get(f"{_W}styleId"), (style_type, name))
+        if style_type == "paragraph" and style.get(f"{_W}default") in ("1", "true", "on"):
+            default_name = name
+    return by_id, default_name
+
+
+def _docx_paragraph_text(p) -> str:
+    """Text of a <w:p> exactly as python-docx's Paragraph.text builds it."""
+    parts = []
+    for child in p:
+        if child.tag == f"{_W}r":
+            runs = (child,)
+        elif child.tag == f"{_W}hyperlink":
+            runs = child.findall(f"{_W}r")
+        else:
+            continue
+        for run in runs:
+            for e in run:
+                tag = e.tag
+                if tag == f"{_W}t":
+                    parts.append(e.text or "")
+                elif tag in (f"{_W}tab", f"{_W}ptab"):
+                    parts.append("\t")
+                elif tag == f"{_W}cr":
+                    parts.append("\n")
+                elif tag == f"{_W}br":
+                    if e.get(f"{_W}type", "textWrapping") == "textWrapping":
+                        parts.append("\n")
+                elif tag == f"{_W}noBreakHyphen":
+                    parts.append("-")
+    return "".join(parts)
+
+
+def _iter_docx_paragraphs_fast(file_path: str):
+    """
+    Stream top-level body paragraphs out of the main document part with iterparse,
+    dropping each one once read, so neither python-docx's object model nor the
+    whole XML tree is ever built.
+    """
+    import zipfile
+    import xml.etree.ElementTree as ET
+
+    with zipfile.ZipFile(file_path) as zf:
+        doc_path = _docx_part_target(zf, "_rels/.rels", "officeDocument", "")
+        if doc_path is None:
+            raise ValueError("No main document part")
+        doc_dir, doc_name = doc_path.rpartition("/")[::2]
+        doc_rels = f"{doc_dir}/_rels/{doc_name}.rels" if doc_dir else f"_rels/{doc_name}.rels"
+        styles_path = None
+        if doc_rels in zf.namelist():
+            styles_path = _docx_part_target(zf, doc_rels, "styles", doc_dir)
+        styles, default_style = _docx_paragraph_styles(zf, styles_path)
+
+        with zf.open(doc_path) as f:
+            stack = []
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if not stack and elem.tag != f"{_W}document":
+                        raise ValueError(f"Unexpected root element {elem.tag}")
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                # Only direct children of <w:body> (python-docx's doc.paragraphs)
+                if len(stack) != 2 or stack[-1].tag != f"{_W}body":
+                    continue
+                if elem.tag == f"{_W}p":
+                    style_el = elem.find(f"{_W}pPr/{_W}pStyle")
+                    style = styles.get(style_el.get(f"{_W}val")) if style_el is not None else None
+                    name = style[1] if style is not None and style[0] == "paragraph" else default_style
+                    yield _docx_heading_prefix(name) + _docx_paragraph_text(elem)
+                stack[-1].remove(elem)
+
+
+def _iter_docx_paragraphs_python_docx(file_path: str):
+    try:
+        import docx
+    except ImportError:
+        raise HTTPException(
+            status_code=500,
+            detail="python-docx is not installed. Run: pip install python-docx"
+        )
+    doc = docx.Document(file_path)
+    for para in doc.paragraphs:
+        yield _docx_heading_prefix(para.style.name if para.style is not None else None) + para.text
+
+
+def _iter_docx_paragraphs(file_path: str):
+    """
+    Paragraph texts of a .docx, with Heading 1/2 turned into markdown markers.
+    Uses the streaming reader; python-docx is only the fallback for packages it
+    can't make sense of (detected before any paragraph has been produced).
+    """
+    produced = False
+    try:
+        for para in _iter_docx_paragraphs_fast(file_path):
+            produced = True
+            yield para
+        return
+    except Exception as e:
+        if produced:
+            raise HTTPException(status_code=400, detail=f"Could not read {os.path.basename(file_path)}: {e}")
+        print(f"Fast .docx reader failed ({e}), falling back to python-docx", flush=True)
+    yield from _iter_docx_paragraphs_python_docx(file_path)
+
+
+def _iter_file_lines(file_path: str):
+    """
+    Stream a manuscript as lines (no trailing newline), the way the file's text
+    would split on "\n": .txt/.md line by line from disk, .docx paragraph by
+    paragraph with a blank line between paragraphs.
+    """
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext in (".txt", ".md"):
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        def lines():
+            with open(file_path, "r", encoding="utf-8") as f:
+                line = ""
+                for line in f:
+                    yield line[:-1] if line.endswith("\n") else line
+                # A trailing newline (or an empty file) leaves one empty last line
+                if not line or line.endswith("\n"):
+                    yield ""
+        return lines()
 
     elif ext == ".docx":
-        try:
-            import docx
-            doc = docx.Document(file_path)
-            paragraphs = []
-            for para in doc.paragraphs:
-                # Preserve heading info as markdown markers
-                if para.style.name.startswith("Heading 1"):
-                    paragraphs.append(f"# {para.text}")
-                elif para.style.name.startswith("Heading 2"):
-                    paragraphs.append(f"## {para.text}")
-                else:
-                    paragraphs.append(para.text)
-            return "\n\n".join(paragraphs)
-        except ImportError:
-            raise HTTPException(
-                status_code=500,
-                detail="python-docx is not installed. Run: pip install python-docx"
-            )
+        paragraphs = _iter_docx_paragraphs(file_path)
+
+        def lines():
+            for i, para in enumerate(paragraphs):
+                if i:
+                    yield ""
+                yield from para.split("\n")
+        return lines()
 
     else:
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
 
 
-def _heuristic_split(text: str) -> list[dict]:
+def _make_split(title: str, content: str, include_content: bool = True) -> dict:
+    split = {"title": title}
+    if include_content:
+        split["content"] = content
+    split["preview"] = content[:150] if content else ""
+    split["word_count"] = len(content.split()) if content else 0
+    return split
+
+
+def _iter_splits(lines, include_content: bool = True):
     """
-    Split text into chapters using a waterfall of heuristics:
+    Split a stream of lines into chapters using a waterfall of heuristics:
     1. Markdown headings (# Chapter, ## Title)
-    2. DOCX-converted headings (already converted to # in _read_file)
+    2. DOCX-converted headings (already converted to # in _iter_docx_paragraphs)
     3. Regex patterns (Chapter X, Prologue, Epilogue, Part X)
     4. Delimiter patterns (---, ***, ###)
     5. Large whitespace gaps (4+ blank lines)
+
+    Yields each chapter as soon as its end is seen, so only the chapter being
+    read is held in memory, never the whole manuscript.
     """
-    lines = text.split("\n")
-    splits = []
+    splits = 0
     current_title = ""
     current_lines = []
 
+    # Until the first chapter is found, track what the whole file would look like
+    # as a single chapter (a file with no chapters at all becomes one). Only the
+    # word count and the start of the text are kept, plus the text itself when
+    # include_content asks for it
+    leading = True
+    leading_words = 0
+    leading_head = ""
+    leading_parts = [] if include_content else None
+
     # Combined pattern for chapter-like headings
     chapter_pattern = re.compile(
         r'^(?:#\s+|##\s+)?'  # optional markdown heading
@@ -196,8 +456,15 @@ def _heuristic_split(text: str) -> list[dict]:
     blank_count = 0
     BLANK_THRESHOLD = 4
 
-    for i, line in enumerate(lines):
+    for line in lines:
+        if leading:
+            leading_words += len(line.split())
+            if leading_parts is not None:
+                leading_parts.append(line)
+            elif len(leading_head) <= 150 or not leading_head[150:].strip():
+                leading_head = (leading_head + "\n" + line if leading_head else line).lstrip()
         stripped = line.strip()
+        chunk = None
 
         # Check for chapter heading
         match = chapter_pattern.match(stripped)
@@ -206,90 +473,72 @@ def _heuristic_split(text: str) -> list[dict]:
             if current_lines or current_title:
                 content = "\n".join(current_lines).strip()
                 if content or current_title:
-                    splits.append({
-                        "title": current_title or f"Section {len(splits) + 1}",
-                        "content": content,
-                        "preview": content[:150] if content else "",
-                        "word_count": len(content.split()) if content else 0,
-                    })
-
-            # Extract title from the heading line
-            title_suffix = match.group(1).strip()
-            # Rebuild a cleaner title
+                    chunk = (current_title or f"Section {splits + 1}", content)
+
+            # Rebuild a cleaner title from the heading line
             heading_text = stripped.lstrip("#").strip()
-            current_title = heading_text if heading_text else f"Chapter {len(splits) + 1}"
+            current_title = heading_text if heading_text else f"Chapter {splits + (chunk is not None) + 1}"
             current_lines = []
             blank_count = 0
-            continue
 
         # Check for delimiter
-        if delimiter_pattern.match(stripped):
-            if current_lines:
-                content = "\n".join(current_lines).strip()
-                if content:
-                    splits.append({
-                        "title": current_title or f"Section {len(splits) + 1}",
-                        "content": content,
-                        "preview": content[:150] if content else "",
-                        "word_count": len(content.split()) if content else 0,
-                    })
-                current_title = ""
-                current_lines = []
-                blank_count = 0
-                continue
+        elif delimiter_pattern.match(stripped) and current_lines:
+            content = "\n".join(current_lines).strip()
+            if content:
+                chunk = (current_title or f"Section {splits + 1}", content)
+            current_title = ""
+            current_lines = []
+            blank_count = 0
 
         # Track blank lines
-        if not stripped:
-            blank_count += 1
-            if blank_count >= BLANK_THRESHOLD and current_lines:
-                content = "\n".join(current_lines).strip()
-                if content:
-                    splits.append({
-                        "title": current_title or f"Section {len(splits) + 1}",
-                        "content": content,
-                        "preview": content[:150] if content else "",
-                        "word_count": len(content.split()) if content else 0,
-                    })
-                current_title = ""
-                current_lines = []
-                blank_count = 0
-                continue
-        else:
+        elif not stripped and blank_count + 1 >= BLANK_THRESHOLD and current_lines:
+            content = "\n".join(current_lines).strip()
+            if content:
+                chunk = (current_title or f"Section {splits + 1}", content)
+            current_title = ""
+            current_lines = []
             blank_count = 0
 
-        current_lines.append(line)
+        else:
+            blank_count = blank_count + 1 if not stripped else 0
+            current_lines.append(line)
+
+        if chunk is not None:
+            splits += 1
+            leading = False
+            leading_parts = None
+            yield _make_split(*chunk, include_content)
 
     # Don't forget the last chunk
     if current_lines:
         content = "\n".join(current_lines).strip()
         if content:
-            splits.append({
-                "title": current_title or f"Section {len(splits) + 1}",
-                "content": content,
-                "preview": content[:150] if content else "",
-                "word_count": len(content.split()) if content else 0,
-            })
+            splits += 1
+            yield _make_split(current_title or f"Section {splits}", content, include_content)
 
     # If no splits were found, treat the whole file as one chapter
-    if not splits and text.strip():
-        splits.append({
-            "title": "Chapter 1",
-            "content": text.strip(),
-            "preview": text.strip()[:150],
-            "word_count": len(text.split()),
-        })
-
-    return splits
+    if not splits and leading_words:
+        if leading_parts is not None:
+            split = _make_split("Chapter 1", "\n".join(leading_parts).strip(), include_content)
+        else:
+            split = _make_split("Chapter 1", "", include_content)
+            # Past the first 150 characters, trailing whitespace would not have been stripped
+            split["preview"] = leading_head[:150] if leading_head[150:].strip() else leading_head.rstrip()[:150]
+        split["word_count"] = leading_words
+        yield split
 
 
 @router.post("/api/project/import/split-preview")
 def split_preview(req: SplitPreviewRequest):
-    """Read a manuscript file and return proposed chapter splits."""
+    """
+    Read a manuscript file and return proposed chapter splits. The file is
+    streamed, so memory use is one chapter's worth plus whatever is returned;
+    with include_content=False only titles, previews and word counts are kept.
+    """
     if not os.path.exists(req.file_path):
         raise HTTPException(status_code=404, detail="File not found")
 
-    text = _read_file(req.file_path)
-    splits = _heuristic_split(text)
+    splits = list(_iter_splits(_iter_file_lines(req.file_path), req.include_content))
 
     return {
         "splits": splits,
@@ -301,53 +550,58 @@ def split_preview(req: SplitPreviewRequest):
 @router.post("/api/project/import/confirm-splits")
 def confirm_splits(req: ConfirmSplitsRequest):
     """Commit approved chapter splits to the database and create md files."""
-    conn = _get_db(req.project_path)
-    cursor = conn.cursor()
+    return _confirm_splits(req)
 
-    cursor.execute("SELECT COALESCE(MAX(chapter_number), 0) FROM chapters")
-    start_num = cursor.fetchone()[0] + 1
 
-    md_dir = os.path.join(req.project_path, "md")
-    os.makedirs(md_dir, exist_ok=True)
+def _confirm_splits(req: ConfirmSplitsRequest, progress=None) -> dict:
+    """
+    progress(done, total) is called as chapter files are written and may raise
+    ImportCancelled; a cancelled or failed import leaves no rows or files behind.
+    """
+    conn = _get_db(req.project_path)
+    try:
+        start_num = conn.execute("SELECT COALESCE(MAX(chapter_number), 0) FROM chapters").fetchone()[0] + 1
 
-    created = []
-    for i, split in enumerate(req.splits):
-        num = start_num + i
-        title = split.get("title", f"Chapter {num}")
-        content = split.get("content", "")
+        md_dir = os.path.join(req.project_path, "md")
+        os.makedirs(md_dir, exist_ok=True)
 
-        # Create safe filename
-        slug = re.sub(r'[^\w\s-]', '', title.lower().strip())
-        slug = re.sub(r'[\s_]+', '_', slug)[:50]
-        md_filename = f"ch_{num:03d}_{slug}.md"
+        rows, files, created = [], [], []
+        for i, split in enumerate(req.splits):
+            num = start_num + i
+            title = split.get("title", f"Chapter {num}")
+            content = split.get("content", "")
 
-        status = "draft" if content else "planned"
-        word_count = len(content.split()) if content else 0
-        pov_id = req.pov_character_id if i == 0 else None
+            # Create safe filename
+            slug = re.sub(r'[^\w\s-]', '', title.lower().strip())
+            slug = re.sub(r'[\s_]+', '_', slug)[:50]
+            md_filename = f"ch_{num:03d}_{slug}.md"
 
-        cursor.execute("""
-            INSERT INTO chapters (chapter_number, title, status, pov_character_id,
-                                  target_word_count, md_filename, word_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (num, title, status, pov_id, req.target_word_count, md_filename, word_count))
-
-        # Convert plain text to HTML paragraphs for TipTap, then write the md file
-        html_content = _plain_text_to_html(content)
-        md_path = os.path.join(md_dir, md_filename)
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        created.append({
-            "id": cursor.lastrowid,
-            "chapter_number": num,
-            "title": title,
-            "status": status,
-            "word_count": word_count,
-            "md_filename": md_filename,
-        })
+            status = "draft" if content else "planned"
+            word_count = len(content.split()) if content else 0
+            pov_id = req.pov_character_id if i == 0 else None
 
-    conn.commit()
-    conn.close()
+            rows.append((num, title, status, pov_id, req.target_word_count, md_filename, word_count))
+            # Convert plain text to HTML paragraphs for TipTap
+            files.append((os.path.join(md_dir, md_filename), _plain_text_to_html(content)))
+            created.append({
+                "chapter_number": num,
+                "title": title,
+                "status": status,
+                "word_count": word_count,
+                "md_filename": md_filename,
+            })
+
+        # Files first, outside the transaction; removed again if the INSERTs fail
+        new_files = _write_md_files(files, progress)
+        try:
+            ids = _insert_chapters(conn, rows)
+        except BaseException:
+            _remove_files(new_files)
+            raise
+    finally:
+        conn.close()
+
+    created = [{"id": ids[c["md_filename"]], **c} for c in created]
     return {"chapters": created}
 
 
@@ -355,40 +609,49 @@ def confirm_splits(req: ConfirmSplitsRequest):
 def ner_extract(req: NerExtractRequest):
     """Run spaCy NER on raw text and return tagged entities."""
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(req.language)
+        from nlp_manager import acquire_nlp, release_nlp
+        nlp = acquire_nlp(req.language)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to load NLP model for {req.language}: {e}"
         )
 
-    doc = nlp(req.text)
+    import ner_cache
+    try:
+        pipeline = ner_cache.pipeline_key(nlp)
+        text_hash = ner_cache.text_hash(req.text)
+        raw_ents = ner_cache.get_many(pipeline, [text_hash]).get(text_hash)
+        if raw_ents is None:
+            raw_ents = _doc_entities(nlp(req.text))
+            ner_cache.put_many(pipeline, {text_hash: raw_ents})
+    finally:
+        release_nlp(req.language, nlp)
 
     entities = []
     seen = set()
-    for ent in doc.ents:
-        key = (ent.text, ent.label_)
+    for text, label, start, end, _, _ in raw_ents:
+        key = (text, label)
         if key in seen:
             continue
         seen.add(key)
 
         # Map spaCy labels to FleshNote entity types
         entity_type = None
-        if ent.label_ == "PERSON":
+        if label == "PERSON":
             entity_type = "character"
-        elif ent.label_ in ("GPE", "LOC", "FAC"):
+        elif label in ("GPE", "LOC", "FAC"):
             entity_type = "location"
-        elif ent.label_ == "ORG":
+        elif label == "ORG":
             entity_type = "group"
 
         if entity_type:
             entities.append({
-                "text": ent.text,
+                "text": text,
                 "type": entity_type,
-                "label": ent.label_,
-                "start": ent.start_char,
-                "end": ent.end_char,
+                "label": label,
+                "start": start,
+                "end": end,
             })
 
     return {"entities": entities}
@@ -488,6 +751,122 @@ _STOPWORD_ENTITIES = {
 }
 
 
+def _ner_disabled_components(nlp) -> list[str]:
+    """Pipeline components the import NER pass can skip."""
+    return [
+        name for name in nlp.pipe_names
+        if name not in _NER_COMPONENTS and "tok2vec" not in name and "transformer" not in name
+    ]
+
+
+def _ner_process_count(nlp, chapter_count: int, total_words: int) -> int:
+    if "ner" not in nlp.pipe_names or total_words < NER_MULTIPROCESS_MIN_WORDS:
+        return 1
+    return max(1, min(chapter_count, MAX_NER_PROCESSES, (os.cpu_count() or 1) - 1))
+
+
+def _sentence_snippet(content: str, start: int, end: int) -> str:
+    """The sentence around content[start:end], for pipelines running without a parser/senter."""
+    sent_start = max(0, start - 400)
+    for m in _SENTENCE_END_RE.finditer(content, sent_start, start):
+        sent_start = m.end()
+    m = _SENTENCE_END_RE.search(content, end)
+    sent_end = m.start() + len(m.group().rstrip()) if m else len(content)
+    return content[sent_start:sent_end].strip()[:200]
+
+
+def _find_alias_targets(entity_map: dict) -> dict:
+    """
+    Decide which entities are aliases of which: fold_key of alias -> fold_key of primary.
+    Candidate pairs come from a token index (phase 1) and a sorted prefix index
+    (phase 2) instead of comparing every pair of names; pairs are still visited in
+    the same order as a full pairwise scan, so the result is the same.
+    """
+    # Detect aliases: within each label group AND across PERSON/ORG,
+    # find substring matches. Many names appear as both PERSON and ORG
+    # at different points, so we merge across those labels too.
+
+    # Build merge-friendly groups: PERSON+ORG together, rest by label
+    merge_groups = {}
+    for fold_key, data in entity_map.items():
+        label = data["spacy_label"]
+        group_key = "NAME" if label in ("PERSON", "ORG") else label
+        if group_key not in merge_groups:
+            merge_groups[group_key] = []
+        merge_groups[group_key].append((fold_key, data))
+
+    # Track which entities are aliases of which
+    alias_targets = {}  # fold_key of alias -> fold_key of primary
+
+    for group_key, group in merge_groups.items():
+        # Sort by name length descending (longest = most likely primary)
+        group.sort(key=lambda x: len(x[1]["name"]), reverse=True)
+
+        # A short name is an alias when it equals one of the long name's words,
+        # so only entries named exactly like one of those words are candidates
+        by_name = {}
+        for j, (_, data) in enumerate(group):
+            by_name.setdefault(data["name"].lower(), []).append(j)
+
+        for i, (long_key, long_data) in enumerate(group):
+            if long_key in alias_targets:
+                continue
+            long_words = long_data["name"].lower().split()
+            candidates = sorted({j for word in long_words if len(word) >= 2 for j in by_name.get(word, ())})
+            for j in candidates:
+                short_key = group[j][0]
+                if i == j or short_key in alias_targets:
+                    continue
+                alias_targets[short_key] = long_key
+
+    # Phase 2: Cross-group prefix/containment alias detection.
+    # Catches nicknames across label groups:
+    #   "Wern" (WORK_OF_ART) -> "Werniel" (PERSON)
+    #   "Syl" (PERSON)       -> "Sylvie" (ORG)
+    #   "Hannah" (PERSON)    -> "Hanna" (PERSON)  (containment)
+    remaining_keys = [k for k in entity_map if k not in alias_targets]
+    names = [entity_map[k]["name"].lower() for k in remaining_keys]
+
+    # Names are related when one is a strict prefix of the other: longer names
+    # starting with name_a sit in one run of the sorted list, and shorter ones
+    # are looked up by each of name_a's own prefixes
+    positions_by_name = {}
+    for pos, name in enumerate(names):
+        positions_by_name.setdefault(name, []).append(pos)
+    sorted_names = sorted(positions_by_name)
+
+    for i, key_a in enumerate(remaining_keys):
+        if key_a in alias_targets:
+            continue
+        name_a = names[i]
+        if len(name_a) < 3:
+            continue
+
+        related = []
+        k = bisect.bisect_right(sorted_names, name_a)
+        while k < len(sorted_names) and sorted_names[k].startswith(name_a):
+            related.extend(positions_by_name[sorted_names[k]])
+            k += 1
+        for length in range(3, len(name_a)):
+            related.extend(positions_by_name.get(name_a[:length], ()))
+
+        # First related name after key_a in entity order, as a pairwise scan would find
+        for j in sorted(p for p in related if p > i):
+            key_b = remaining_keys[j]
+            if key_b in alias_targets:
+                continue
+            # Make the higher-frequency one the primary
+            freq_a = entity_map[key_a]["frequency"]
+            freq_b = entity_map[key_b]["frequency"]
+            if freq_a >= freq_b:
+                alias_targets[key_b] = key_a
+            else:
+                alias_targets[key_a] = key_b
+            break
+
+    return alias_targets
+
+
 @router.post("/api/project/import/ner-analyze")
 def ner_analyze(req: NerAnalyzeRequest):
     """
@@ -496,14 +875,55 @@ def ner_analyze(req: NerAnalyzeRequest):
     context snippets, and alias detection.
     """
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(req.language)
+        from nlp_manager import acquire_nlp, release_nlp
+        nlp = acquire_nlp(req.language)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to load NLP model for {req.language}: {e}"
         )
 
+    # Pinned so the model cache can't evict it mid-import
+    try:
+        return _ner_analyze(req, nlp)
+    finally:
+        release_nlp(req.language, nlp)
+
+
+def _doc_entities(doc) -> list:
+    """
+    A parsed doc's entities in the form ner_cache stores:
+    [text, label, start_char, end_char, sent_start, sent_end] (sentence bounds are
+    None if the pipeline set no sentence boundaries).
+    """
+    has_sents = doc.has_annotation("SENT_START")
+    entities = []
+    for ent in doc.ents:
+        sent_start = sent_end = None
+        if has_sents:
+            sent = ent.sent
+            sent_start, sent_end = sent.start_char, sent.end_char
+        entities.append([ent.text, ent.label_, ent.start_char, ent.end_char, sent_start, sent_end])
+    return entities
+
+
+def _pipe_chapters(nlp, chapters: list, disable: list, n_process: int, progress=None) -> list:
+    """(doc, chapter_index) for each chapter; progress(done, total) is called per chapter."""
+    docs = []
+    stream = nlp.pipe(chapters, as_tuples=True, batch_size=NER_BATCH_SIZE,
+                      disable=disable, n_process=n_process)
+    try:
+        for item in stream:
+            docs.append(item)
+            if progress:
+                progress(len(docs), len(chapters))
+    finally:
+        # Shuts down worker processes if we stop early
+        stream.close()
+    return docs
+
+
+def _ner_analyze(req: NerAnalyzeRequest, nlp, progress=None) -> dict:
     # Labels worth keeping: named entities that could be story elements
     # Skip noise labels: DATE, TIME, CARDINAL, ORDINAL, QUANTITY, PERCENT, MONEY
     KEEP_LABELS = {
@@ -518,25 +938,78 @@ def ner_analyze(req: NerAnalyzeRequest):
     elif req.text:
         chapters = [(0, req.text)]
     else:
-        return {"confident": [], "low_confidence": []}
+        return {"confident": [], "low_confidence": [], "throughput": None}
 
     # Collect all entity occurrences across chapters
     # key: case-folded cleaned name -> entity data
     entity_map = {}
 
-    for ch_index, content in chapters:
-        if not content or not content.strip():
-            continue
-
-        doc = nlp(content)
+    chapters = [(content, ch_index) for ch_index, content in chapters if content and content.strip()]
+    total_words = sum(len(content.split()) for content, _ in chapters)
+    disable = _ner_disabled_components(nlp)
+
+    # Chapters parsed before with the same pipeline come from the disk cache
+    import ner_cache
+    pipeline = ner_cache.pipeline_key(nlp, disable)
+    hashes = [ner_cache.text_hash(content) for content, _ in chapters]
+    chapter_ents = ner_cache.get_many(pipeline, hashes)
+    to_parse, parse_hashes = [], {}
+    for chapter, text_hash in zip(chapters, hashes):
+        if text_hash not in chapter_ents and text_hash not in parse_hashes:
+            to_parse.append(chapter)
+            parse_hashes[text_hash] = None
+    cached_chapters = sum(1 for text_hash in hashes if text_hash in chapter_ents)
+    # Cached chapters and repeats of a chapter being parsed count as done up front
+    skipped = len(chapters) - len(to_parse)
+    parse_words = sum(len(content.split()) for content, _ in to_parse)
+    n_process = _ner_process_count(nlp, len(to_parse), parse_words)
+
+    parse_progress = None
+    if progress:
+        progress(skipped, len(chapters))
+
+        def parse_progress(done, total):
+            progress(skipped + done, len(chapters))
+
+    started = time.perf_counter()
+    try:
+        docs = _pipe_chapters(nlp, to_parse, disable, n_process, parse_progress)
+    except ImportCancelled:
+        raise
+    except Exception as e:
+        if n_process == 1:
+            raise
+        # Pipelines that can't be pickled (or a worker that died) — do it in-process
+        print(f"NER import: multiprocessing failed ({e}), retrying in-process", flush=True)
+        n_process = 1
+        docs = _pipe_chapters(nlp, to_parse, disable, n_process, parse_progress)
+    elapsed = time.perf_counter() - started
+    parsed = {text_hash: _doc_entities(doc) for text_hash, (doc, _) in zip(parse_hashes, docs)}
+    ner_cache.put_many(pipeline, parsed)
+    chapter_ents.update(parsed)
+
+    throughput = {
+        "language": req.language,
+        "chapters": len(chapters),
+        "cached_chapters": cached_chapters,
+        "words": total_words,
+        "elapsed_ms": int(elapsed * 1000),
+        "words_per_second": int(parse_words / elapsed) if elapsed > 0 else 0,
+        "n_process": n_process,
+        "components": [name for name in nlp.pipe_names if name not in disable],
+    }
+    print(f"NER import [{req.language}]: {total_words} words in {len(chapters)} chapters "
+          f"({cached_chapters} cached), {elapsed:.1f}s ({throughput['words_per_second']} words/s, "
+          f"{n_process} process(es))", flush=True)
 
-        for ent in doc.ents:
+    for (content, ch_index), text_hash in zip(chapters, hashes):
+        for text, label, start, end, sent_start, sent_end in chapter_ents[text_hash]:
             # Filter out noise labels
-            if ent.label_ not in KEEP_LABELS:
+            if label not in KEEP_LABELS:
                 continue
 
             # Clean the entity name
-            cleaned = _clean_entity_name(ent.text)
+            cleaned = _clean_entity_name(text)
             if not cleaned:
                 continue
 
@@ -551,21 +1024,15 @@ def ner_analyze(req: NerAnalyzeRequest):
 
             if fold_key not in entity_map:
                 # Extract context snippet (sentence containing this entity)
-                snippet = ""
-                try:
-                    sent = ent.sent
-                    if sent:
-                        snippet = sent.text.strip()[:200]
-                except Exception:
-                    # Fallback: extract surrounding text
-                    start = max(0, ent.start_char - 40)
-                    end = min(len(content), ent.end_char + 120)
-                    snippet = content[start:end].strip()
+                if sent_start is not None:
+                    snippet = content[sent_start:sent_end].strip()[:200]
+                else:
+                    snippet = _sentence_snippet(content, start, end)
 
                 entity_map[fold_key] = {
                     "name": cleaned,
                     "name_counts": {cleaned: 1},
-                    "spacy_label": ent.label_,
+                    "spacy_label": label,
                     "frequency": 0,
                     "chapter_indices": set(),
                     "snippet": snippet,
@@ -627,70 +1094,7 @@ def ner_analyze(req: NerAnalyzeRequest):
             base["chapter_indices"] |= poss["chapter_indices"]
             entity_map.pop(poss_key, None)
 
-    # Detect aliases: within each label group AND across PERSON/ORG,
-    # find substring matches. Many names appear as both PERSON and ORG
-    # at different points, so we merge across those labels too.
-
-    # Build merge-friendly groups: PERSON+ORG together, rest by label
-    merge_groups = {}
-    for fold_key, data in entity_map.items():
-        label = data["spacy_label"]
-        group_key = "NAME" if label in ("PERSON", "ORG") else label
-        if group_key not in merge_groups:
-            merge_groups[group_key] = []
-        merge_groups[group_key].append((fold_key, data))
-
-    # Track which entities are aliases of which
-    alias_targets = {}  # fold_key of alias -> fold_key of primary
-
-    for group_key, group in merge_groups.items():
-        # Sort by name length descending (longest = most likely primary)
-        group.sort(key=lambda x: len(x[1]["name"]), reverse=True)
-
-        for i, (long_key, long_data) in enumerate(group):
-            long_words = long_data["name"].lower().split()
-            for j, (short_key, short_data) in enumerate(group):
-                if i == j or short_key in alias_targets or long_key in alias_targets:
-                    continue
-                short_name = short_data["name"].lower()
-                # Check if short name is a word-boundary match in long name
-                if short_name in long_words and len(short_name) >= 2:
-                    alias_targets[short_key] = long_key
-
-    # Phase 2: Cross-group prefix/containment alias detection.
-    # Catches nicknames across label groups:
-    #   "Wern" (WORK_OF_ART) -> "Werniel" (PERSON)
-    #   "Syl" (PERSON)       -> "Sylvie" (ORG)
-    #   "Hannah" (PERSON)    -> "Hanna" (PERSON)  (containment)
-    remaining_keys = [k for k in entity_map if k not in alias_targets]
-    for i, key_a in enumerate(remaining_keys):
-        if key_a in alias_targets:
-            continue
-        name_a = entity_map[key_a]["name"].lower()
-        if len(name_a) < 3:
-            continue
-        for key_b in remaining_keys[i + 1:]:
-            if key_b in alias_targets:
-                continue
-            name_b = entity_map[key_b]["name"].lower()
-            if len(name_b) < 3:
-                continue
-            # Check if one name is a prefix of the other
-            is_related = False
-            if name_b.startswith(name_a) and len(name_b) > len(name_a):
-                is_related = True
-            elif name_a.startswith(name_b) and len(name_a) > len(name_b):
-                is_related = True
-            if not is_related:
-                continue
-            # Make the higher-frequency one the primary
-            freq_a = entity_map[key_a]["frequency"]
-            freq_b = entity_map[key_b]["frequency"]
-            if freq_a >= freq_b:
-                alias_targets[key_b] = key_a
-            else:
-                alias_targets[key_a] = key_b
-            break
+    alias_targets = _find_alias_targets(entity_map)
 
     # Merge aliases into their primaries
     for alias_key, primary_key in alias_targets.items():
@@ -757,58 +1161,75 @@ def ner_analyze(req: NerAnalyzeRequest):
     return {
         "confident": confident,
         "low_confidence": low_confidence,
+        "throughput": throughput,
     }
 
 
 @router.post("/api/project/import/bulk-create-entities")
 def bulk_create_entities(req: BulkCreateEntitiesRequest):
     """Create multiple entities of different types in one transaction."""
-    import json
-
-    conn = _get_db(req.project_path)
-    cursor = conn.cursor()
-    created = []
+    return _bulk_create_entities(req)
 
-    for entity in req.entities:
-        aliases_json = json.dumps(entity.aliases) if entity.aliases else "[]"
 
-        if entity.type == "character":
-            cursor.execute(
-                "INSERT INTO characters (name, aliases) VALUES (?, ?)",
-                (entity.name, aliases_json),
-            )
-            created.append({
-                "id": cursor.lastrowid,
-                "type": "character",
-                "name": entity.name,
-            })
+def _bulk_create_entities(req: BulkCreateEntitiesRequest, progress=None) -> dict:
+    """
+    progress(done, total) is called per entity and may raise ImportCancelled; a cancelled
+    or failed run is rolled back, so it creates none of the entities.
+    """
+    import json
 
-        elif entity.type == "location":
-            cursor.execute(
-                "INSERT INTO locations (name, aliases) VALUES (?, ?)",
-                (entity.name, aliases_json),
-            )
-            created.append({
-                "id": cursor.lastrowid,
-                "type": "location",
-                "name": entity.name,
-            })
+    conn = _get_db(req.project_path)
+    try:
+        cursor = conn.cursor()
+        created = []
 
-        elif entity.type == "lore":
-            category = entity.lore_category or "item"
-            cursor.execute(
-                "INSERT INTO lore_entities (name, category, aliases) VALUES (?, ?, ?)",
-                (entity.name, category, aliases_json),
-            )
-            created.append({
-                "id": cursor.lastrowid,
-                "type": "lore",
-                "name": entity.name,
-                "category": category,
-            })
+        for i, entity in enumerate(req.entities):
+            aliases_json = json.dumps(entity.aliases) if entity.aliases else "[]"
 
-    conn.commit()
-    conn.close()
+            if entity.type == "character":
+                cursor.execute(
+                    "INSERT INTO characters (name, aliases) VALUES (?, ?)",
+                    (entity.name, aliases_json),
+                )
+                created.append({
+                    "id": cursor.lastrowid,
+                    "type": "character",
+                    "name": entity.name,
+                })
+
+            elif entity.type == "location":
+                cursor.execute(
+                    "INSERT INTO locations (name, aliases) VALUES (?, ?)",
+                    (entity.name, aliases_json),
+                )
+                created.append({
+                    "id": cursor.lastrowid,
+                    "type": "location",
+                    "name": entity.name,
+                })
+
+            elif entity.type == "lore":
+                category = entity.lore_category or "item"
+                cursor.execute(
+                    "INSERT INTO lore_entities (name, category, aliases) VALUES (?, ?, ?)",
+                    (entity.name, category, aliases_json),
+                )
+                created.append({
+                    "id": cursor.lastrowid,
+                    "type": "lore",
+                    "name": entity.name,
+                    "category": category,
+                })
+
+            if progress:
+                progress(i + 1, len(req.entities))
+
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
     return {"created": created}
 
 
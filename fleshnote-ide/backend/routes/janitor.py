@@ -8,23 +8,27 @@ import os
 import re
 import json
 import sqlite3
+import bisect
+import time
 import hashlib
+import threading
 import html as html_lib
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-router = APIRouter()
+from entity_matcher import get_entity_matcher, match_spans
+import spell_manager
 
-LANG_MAP = {
-    "en": "en_US",
-    "ar": "ar",
-    "hu": "hu_HU",
-    "pl": "pl_PL",
-}
+router = APIRouter()
 
-# Module-level spell checker cache
-_spell_cache: dict = {}
+# Parser-based analyzers share one spaCy parse of the first DOC_CHAR_LIMIT chars
+DOC_CHAR_LIMIT = 10000
 
 WEAK_WORDS = [
     "walked", "said", "went", "looked", "felt", "very", "really", "just",
@@ -174,44 +178,43 @@ def _strip_todo_blocks(text: str) -> str:
     return re.sub(r'#TODO[^\u200B\n]*\u200B?', '', text)
 
 
+_TAG_RE = re.compile(r'<[^>]+>')
+_ENTITY_SPAN_RE = re.compile(r'<span[^>]+data-entity-id=', re.IGNORECASE)
+
+
 def _get_linked_ranges(html: str) -> list[tuple[int, int]]:
-    """Return plain-text char ranges already covered by entity span marks."""
+    """Return plain-text char ranges already covered by entity span marks, sorted by start."""
     ranges = []
-    # We need to find spans with data-entity-id and track their plain-text offsets.
-    # Strategy: walk html tag by tag, counting plain chars as we go.
+    # Jump from tag to tag with str.find, counting the plain chars in between in bulk.
     pos = 0
     plain_offset = 0
-    while pos < len(html):
-        if html[pos] == '<':
-            tag_end = html.find('>', pos)
-            if tag_end == -1:
-                break
-            tag = html[pos:tag_end + 1]
-            # Check if this is an opening span with data-entity-id
-            if re.match(r'<span[^>]+data-entity-id=', tag, re.IGNORECASE):
-                # Find the closing </span>
-                close_start = html.find('</span>', tag_end)
-                if close_start != -1:
-                    inner_html = html[tag_end + 1:close_start]
-                    inner_text = re.sub(r'<[^>]+>', '', inner_html)
-                    range_start = plain_offset
-                    range_end = plain_offset + len(inner_text)
-                    ranges.append((range_start, range_end))
-                    plain_offset += len(inner_text)
-                    pos = close_start + len('</span>')
-                    continue
-            pos = tag_end + 1
-        else:
-            plain_offset += 1
-            pos += 1
+    n = len(html)
+    while pos < n:
+        tag_start = html.find('<', pos)
+        if tag_start == -1:
+            break
+        plain_offset += tag_start - pos
+        tag_end = html.find('>', tag_start)
+        if tag_end == -1:
+            break
+        # Check if this is an opening span with data-entity-id
+        if _ENTITY_SPAN_RE.match(html, tag_start, tag_end + 1):
+            # Find the closing </span>
+            close_start = html.find('</span>', tag_end)
+            if close_start != -1:
+                inner_len = len(_TAG_RE.sub('', html[tag_end + 1:close_start]))
+                ranges.append((plain_offset, plain_offset + inner_len))
+                plain_offset += inner_len
+                pos = close_start + len('</span>')
+                continue
+        pos = tag_end + 1
     return ranges
 
 
 def _is_in_linked_range(offset: int, linked_ranges: list[tuple[int, int]]) -> bool:
-    for start, end in linked_ranges:
-        if start <= offset < end:
-            return True
-    return False
+    """Containment test against the sorted, non-overlapping output of _get_linked_ranges."""
+    idx = bisect.bisect_right(linked_ranges, (offset, float("inf"))) - 1
+    return idx >= 0 and offset < linked_ranges[idx][1]
 
 
 def _get_all_entities(conn) -> list[dict]:
@@ -252,6 +255,7 @@ def _analyze_link_existing(
     plain_text: str,
     linked_ranges: list[tuple[int, int]],
     entities: list[dict],
+    entity_matches: dict,
     cap: int = 5
 ) -> list[dict]:
     suggestions = []
@@ -266,24 +270,24 @@ def _analyze_link_existing(
         for name in names_to_check:
             if not name or len(name) < 2:
                 continue
-            pattern = r'\b' + re.escape(name) + r'\b'
-            for m in re.finditer(pattern, plain_text, re.IGNORECASE):
+            for start, end in match_spans(entity_matches, name):
                 if len(suggestions) >= cap:
                     break
-                offset = m.start()
+                offset = start
                 if offset in seen_offsets:
                     continue
                 if _is_in_linked_range(offset, linked_ranges):
                     continue
                 seen_offsets.add(offset)
-                context, hl_start, hl_end = _build_context(plain_text, m.start(), m.end())
+                matched = plain_text[start:end]
+                context, hl_start, hl_end = _build_context(plain_text, start, end)
                 suggestions.append({
-                    "id": _make_id("link_existing", m.group(), offset),
+                    "id": _make_id("link_existing", matched, offset),
                     "type": "link_existing",
                     "entity_type": ent["type"],
                     "entity_id": ent["id"],
                     "entity_name": ent["name"],
-                    "matched_text": m.group(),
+                    "matched_text": matched,
                     "context": context,
                     "context_highlight_start": hl_start,
                     "context_highlight_end": hl_end,
@@ -378,7 +382,7 @@ def _analyze_create_entity(
     return suggestions
 
 
-def _analyze_alias(plain_text: str, entities: list[dict], cap: int = 3) -> list[dict]:
+def _analyze_alias(plain_text: str, entities: list[dict], entity_matches: dict, cap: int = 3) -> list[dict]:
     suggestions = []
     for ent in entities:
         if len(suggestions) >= cap:
@@ -388,7 +392,8 @@ def _analyze_alias(plain_text: str, entities: list[dict], cap: int = 3) -> list[
         if len(parts) < 2:
             continue
         # Check if full name appears in text
-        if not re.search(r'\b' + re.escape(name) + r'\b', plain_text, re.IGNORECASE):
+        full_spans = match_spans(entity_matches, name)
+        if not full_spans:
             continue
         # Check substrings (single tokens >= 4 chars) that appear standalone
         for part in parts:
@@ -397,15 +402,14 @@ def _analyze_alias(plain_text: str, entities: list[dict], cap: int = 3) -> list[
             # Skip if already an alias
             if any(a.lower() == part.lower() for a in (ent["aliases"] or [])):
                 continue
-            for m in re.finditer(r'\b' + re.escape(part) + r'\b', plain_text, re.IGNORECASE):
+            for start, end in match_spans(entity_matches, part):
                 # Check full name is absent nearby (within 200 chars)
-                window_start = max(0, m.start() - 200)
-                window_end = min(len(plain_text), m.end() + 200)
-                nearby = plain_text[window_start:window_end]
-                if not re.search(r'\b' + re.escape(name) + r'\b', nearby, re.IGNORECASE):
-                    context, hl_start, hl_end = _build_context(plain_text, m.start(), m.end())
+                window_start = max(0, start - 200)
+                window_end = min(len(plain_text), end + 200)
+                if not any(window_start <= fs and fe <= window_end for fs, fe in full_spans):
+                    context, hl_start, hl_end = _build_context(plain_text, start, end)
                     suggestions.append({
-                        "id": _make_id("alias", part, m.start()),
+                        "id": _make_id("alias", part, start),
                         "type": "alias",
                         "entity_type": ent["type"],
                         "entity_id": ent["id"],
@@ -414,7 +418,7 @@ def _analyze_alias(plain_text: str, entities: list[dict], cap: int = 3) -> list[
                         "context": context,
                         "context_highlight_start": hl_start,
                         "context_highlight_end": hl_end,
-                        "char_offset": m.start(),
+                        "char_offset": start,
                         "replacement": None
                     })
                     break
@@ -423,17 +427,16 @@ def _analyze_alias(plain_text: str, entities: list[dict], cap: int = 3) -> list[
     return suggestions
 
 
+def _warm_synonyms(language: str):
+    """Force the lazy WordNet corpus load outside the synonym analyzer's budget."""
+    from nltk_manager import get_synonyms, check_wordnet_exists
+    if check_wordnet_exists():
+        get_synonyms("good", "eng" if language == "en" else language)
+
+
 def _analyze_typo(plain_text: str, language: str, words_plain: str, entities: list[dict], cap: int = 3) -> list[dict]:
     suggestions = []
-    sc_lang = LANG_MAP.get(language)
-    if not sc_lang:
-        return []
-    try:
-        import phunspell
-        if sc_lang not in _spell_cache:
-            _spell_cache[sc_lang] = phunspell.Phunspell(sc_lang)
-        spell = _spell_cache[sc_lang]
-    except Exception:
+    if spell_manager.get_spell_checker(language) is None:
         return []
 
     # Build a set of entity names and aliases to never flag as typos
@@ -466,9 +469,9 @@ def _analyze_typo(plain_text: str, language: str, words_plain: str, entities: li
         if word.lower() in entity_words:
             continue
         try:
-            if spell.lookup(word.lower()):
+            if spell_manager.lookup(language, word.lower()):
                 continue
-            sug_list = list(spell.suggest(word.lower()))[:3]
+            sug_list = list(spell_manager.suggest(language, word.lower()))[:3]
             if not sug_list:
                 continue
             # Find first occurrence in plain text
@@ -548,15 +551,15 @@ def _analyze_synonym(plain_text: str, language: str, words_plain: str, cap: int
     return suggestions
 
 
-def _analyze_weak_adverbs(plain_text: str, language: str, cap: int = 5) -> list[dict]:
+def _analyze_weak_adverbs(plain_text: str, language: str, cap: int = 5, doc=None) -> list[dict]:
     """Detect -ly adverbs modifying verbs (weak adverb writing pattern)."""
     if language != "en":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -590,15 +593,15 @@ def _analyze_weak_adverbs(plain_text: str, language: str, cap: int = 5) -> list[
     return suggestions
 
 
-def _analyze_passive_voice(plain_text: str, language: str, cap: int = 3) -> list[dict]:
+def _analyze_passive_voice(plain_text: str, language: str, cap: int = 3, doc=None) -> list[dict]:
     """Detect passive voice constructions (auxpass dependency)."""
     if language != "en":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -723,16 +726,17 @@ def _analyze_show_dont_tell(
     plain_text: str,
     language: str,
     confidence_threshold: float = 0.5,
-    cap: int = 5
+    cap: int = 5,
+    doc=None
 ) -> list[dict]:
     """4-detector show-don't-tell pipeline with dialogue exclusion."""
     if language != "en":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -781,15 +785,16 @@ def _analyze_show_dont_tell(
 def _analyze_pacing(
     plain_text: str,
     language: str,
-    cap: int = 2
+    cap: int = 2,
+    doc=None
 ) -> list[dict]:
     if language != "en":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -953,6 +958,70 @@ def _analyze_readability(plain_text: str, language: str) -> list[dict]:
 class SensesOverviewRequest(BaseModel):
     project_path: str
     language: str = "en"
+    refresh: bool = False  # recompute every chapter instead of reading cached metrics
+
+
+def _compute_chapter_metrics(raw: str, language: str) -> dict | None:
+    """Five-sense counts and readability for one chapter's raw .md content. None if it has no text."""
+    # Strip entity/twist markers so they don't pollute word lists
+    plain = _strip_todo_blocks(_html_to_plain(raw)).strip()
+    if not plain:
+        return None
+    if language == "hu":
+        from routes.hun_janitor import _count_senses_hu
+        senses = _count_senses_hu(plain)
+    elif language == "pl":
+        from routes.pol_janitor import _count_senses_pl
+        senses = _count_senses_pl(plain)
+    else:
+        words = set(re.findall(r'\b[a-zA-Z]+\b', plain.lower()))
+        senses = {sense: len(words & lexicon) for sense, lexicon in EN_SENSES.items()}
+    fk = _flesch_kincaid_en(plain) if language == "en" else {"score": None, "grade": None, "label": None}
+    return {"senses": senses, "readability": fk}
+
+
+def _store_chapter_metrics(conn, chapter_id: int, content_hash: str, language: str, metrics: dict | None):
+    conn.execute("""
+        INSERT INTO chapter_metrics (chapter_id, content_hash, language, senses, readability, updated_at)
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(chapter_id) DO UPDATE SET
+            content_hash = excluded.content_hash,
+            language = excluded.language,
+            senses = excluded.senses,
+            readability = excluded.readability,
+            updated_at = excluded.updated_at
+    """, (
+        chapter_id,
+        content_hash,
+        language,
+        json.dumps(metrics["senses"]) if metrics else None,
+        json.dumps(metrics["readability"]) if metrics else None,
+    ))
+
+
+def _update_chapter_metrics(project_path: str, chapter_id: int, md_content: str):
+    """Background task run after chapter save: refresh the cached metrics if the content changed."""
+    try:
+        conn = _get_db(project_path)
+    except FileNotFoundError:
+        return
+    try:
+        row = conn.execute(
+            "SELECT config_value FROM project_config WHERE config_key = 'story_language'"
+        ).fetchone()
+        language = row["config_value"] if row and row["config_value"] else "en"
+        content_hash = hashlib.sha256(md_content.encode("utf-8")).hexdigest()
+        cached = conn.execute(
+            "SELECT content_hash, language FROM chapter_metrics WHERE chapter_id = ?", (chapter_id,)
+        ).fetchone()
+        if cached and cached["content_hash"] == content_hash and cached["language"] == language:
+            return
+        _store_chapter_metrics(conn, chapter_id, content_hash, language, _compute_chapter_metrics(md_content, language))
+        conn.commit()
+    except Exception as e:
+        print(f"Error updating chapter metrics: {e}")
+    finally:
+        conn.close()
 
 
 @router.post("/api/project/janitor/senses-overview")
@@ -962,10 +1031,15 @@ def janitor_senses_overview(req: SensesOverviewRequest):
     except FileNotFoundError as e:
         return {"status": "error", "chapters": [], "error": str(e)}
     try:
-        chapters = conn.execute(
-            "SELECT id, chapter_number, title, md_filename FROM chapters ORDER BY chapter_number"
-        ).fetchall()
+        chapters = conn.execute("""
+            SELECT c.id, c.chapter_number, c.title, c.md_filename,
+                   m.content_hash, m.language AS cached_language, m.senses, m.readability
+            FROM chapters c
+            LEFT JOIN chapter_metrics m ON m.chapter_id = c.id
+            ORDER BY c.chapter_number
+        """).fetchall()
         result = []
+        dirty = False
         for ch in chapters:
             if not ch["md_filename"]:
                 continue
@@ -974,27 +1048,30 @@ def janitor_senses_overview(req: SensesOverviewRequest):
                 continue
             with open(md_path, "r", encoding="utf-8") as f:
                 raw = f.read()
-            # Strip entity/twist markers so they don't pollute word lists
-            plain = _strip_todo_blocks(_html_to_plain(raw)).strip()
-            if not plain:
-                continue
-            if req.language == "hu":
-                from routes.hun_janitor import _count_senses_hu
-                senses = _count_senses_hu(plain)
-            elif req.language == "pl":
-                from routes.pol_janitor import _count_senses_pl
-                senses = _count_senses_pl(plain)
+            # The .md can change without a chapter save (entity unlinking, twist edits,
+            # imports), so the cached row is only trusted if its hash still matches
+            content_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+            if (req.refresh or ch["cached_language"] != req.language
+                    or ch["content_hash"] != content_hash):
+                # Not cached yet (e.g. imported chapter), stale, other language, or forced refresh
+                metrics = _compute_chapter_metrics(raw, req.language)
+                _store_chapter_metrics(conn, ch["id"], content_hash, req.language, metrics)
+                dirty = True
+            elif ch["senses"] is None:
+                metrics = None
             else:
-                words = set(re.findall(r'\b[a-zA-Z]+\b', plain.lower()))
-                senses = {sense: len(words & lexicon) for sense, lexicon in EN_SENSES.items()}
-            fk = _flesch_kincaid_en(plain) if req.language == "en" else {"score": None, "grade": None, "label": None}
+                metrics = {"senses": json.loads(ch["senses"]), "readability": json.loads(ch["readability"])}
+            if metrics is None:
+                continue
             result.append({
                 "chapter_id": ch["id"],
                 "chapter_number": ch["chapter_number"],
                 "title": ch["title"] or f"Chapter {ch['chapter_number']}",
-                "senses": senses,
-                "readability": fk,
+                "senses": metrics["senses"],
+                "readability": metrics["readability"],
             })
+        if dirty:
+            conn.commit()
         return {"status": "ok", "chapters": result}
     except Exception as e:
         return {"status": "error", "chapters": [], "error": str(e)}
@@ -1002,6 +1079,328 @@ def janitor_senses_overview(req: SensesOverviewRequest):
         conn.close()
 
 
+# ── Analyzer Registry ────────────────────────────────────────────────────────
+# Every analyzer declares the languages it serves (None = all), what it needs from
+# the shared analysis context, its cost class and a time budget. The orchestrator
+# resolves the needs once per request, runs analyzers cheapest first and skips any
+# that overrun their budget instead of holding up the whole response.
+
+COST_CHEAP = "cheap"    # regex / set lookups over plain text
+COST_PARSER = "parser"  # needs a spaCy pipeline
+
+# Budget for the shared spaCy parse (model loading itself is not budgeted)
+PARSE_BUDGET_MS = 4000
+
+
+@dataclass
+class JanitorAnalyzer:
+    name: str
+    run: Callable[[dict], list[dict]]
+    languages: tuple | None = None
+    needs: tuple = ()  # context keys: "entity_matches", "nlp", "doc"
+    cost: str = COST_CHEAP
+    budget_ms: int = 1500
+    # One-time resource load (dictionary, corpus) run outside the budget, once per language
+    warm: Callable[[str], None] | None = None
+
+
+_ANALYZERS = [
+    JanitorAnalyzer(
+        "link_existing",
+        lambda c: _analyze_link_existing(c["plain_text"], c["linked_ranges"], c["entities"], c["entity_matches"]),
+        needs=("entity_matches",),
+    ),
+    JanitorAnalyzer(
+        "alias",
+        lambda c: _analyze_alias(c["plain_text"], c["entities"], c["entity_matches"]),
+        needs=("entity_matches",),
+    ),
+    JanitorAnalyzer(
+        "five_senses",
+        lambda c: _analyze_five_senses(c["plain_text"], c["language"]),
+        languages=("en",),
+    ),
+    JanitorAnalyzer(
+        "readability",
+        lambda c: _analyze_readability(c["plain_text"], c["language"]),
+        languages=("en",),
+    ),
+    JanitorAnalyzer(
+        "typo",
+        lambda c: _analyze_typo(c["plain_text"], c["language"], c["words_plain"], c["entities"]),
+        # Hunspell suggest() is slow for words far from the dictionary
+        budget_ms=5000, warm=spell_manager.get_spell_checker,
+    ),
+    JanitorAnalyzer(
+        "synonym",
+        lambda c: _analyze_synonym(c["plain_text"], c["language"], c["words_plain"]),
+        budget_ms=3000, warm=_warm_synonyms,
+    ),
+    JanitorAnalyzer(
+        "create_entity",
+        lambda c: _analyze_create_entity(c["plain_text"], c["entities"], c["language"], c["linked_ranges"]),
+        needs=("nlp",), cost=COST_PARSER, budget_ms=3000,
+    ),
+    JanitorAnalyzer(
+        "weak_adverbs",
+        lambda c: _analyze_weak_adverbs(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("en",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "passive_voice",
+        lambda c: _analyze_passive_voice(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("en",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "show_dont_tell",
+        lambda c: _analyze_show_dont_tell(c["plain_text"], c["language"], c["confidence_threshold"], doc=c["doc"]),
+        languages=("en",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "pacing",
+        lambda c: _analyze_pacing(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("en",), needs=("doc",), cost=COST_PARSER,
+    ),
+]
+
+# Order suggestions appear in for the non-streaming endpoint
+ANALYZER_ORDER = [
+    "link_existing", "create_entity", "alias", "typo", "synonym", "weak_adverbs",
+    "passive_voice", "show_dont_tell", "pacing", "five_senses", "readability",
+]
+
+_registry_loaded = False
+_registry_lock = threading.Lock()
+_warmed: set = set()  # (analyzer name, language) pairs whose warm step has run
+
+# Analyzers run on worker threads so an overrun can be abandoned. Python cannot kill
+# the thread, but the response no longer waits for it.
+_analyzer_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="janitor")
+
+# How long an analyzer may wait for a free pool worker (abandoned overruns can hold them).
+# Giving up here is reported as "busy", not as a timeout of the analyzer itself.
+ANALYZER_QUEUE_LIMIT_MS = 5000
+
+# Rolling per-analyzer timings for /api/janitor/analyzer-stats
+_TIMING_WINDOW = 200
+_timings: dict = {}
+_timings_lock = threading.Lock()
+
+
+def _get_analyzers(language: str) -> list[JanitorAnalyzer]:
+    """Analyzers that apply to `language`, cheap ones first (stable within a cost class)."""
+    global _registry_loaded
+    if not _registry_loaded:
+        with _registry_lock:
+            if not _registry_loaded:
+                # Language packs register themselves on import
+                from routes.hun_janitor import ANALYZERS as hu_analyzers
+                from routes.pol_janitor import ANALYZERS as pl_analyzers
+                _ANALYZERS.extend(hu_analyzers + pl_analyzers)
+                _registry_loaded = True
+    applicable = [a for a in _ANALYZERS if a.languages is None or language in a.languages]
+    return sorted(applicable, key=lambda a: a.cost != COST_CHEAP)
+
+
+def _record_timing(name: str, elapsed_ms: float, outcome: str):
+    with _timings_lock:
+        entry = _timings.get(name)
+        if entry is None:
+            entry = _timings[name] = {"samples": deque(maxlen=_TIMING_WINDOW), "runs": 0, "timeouts": 0, "errors": 0, "busy": 0}
+        if outcome == "busy":
+            entry["busy"] += 1
+            return
+        entry["runs"] += 1
+        if outcome == "timeout":
+            entry["timeouts"] += 1
+        elif outcome == "error":
+            entry["errors"] += 1
+        else:
+            entry["samples"].append(elapsed_ms)
+
+
+def _run_budgeted(fn, ctx: dict, budget_ms: int):
+    """
+    Run fn(ctx) on the analyzer pool. Returns (result, elapsed_ms, outcome).
+    The budget clock starts when fn starts, so time spent queued behind other
+    analyzers doesn't count; outcome is "busy" if no worker frees up in time.
+    """
+    started = threading.Event()
+    clock = {}
+
+    def timed_run(c):
+        clock["start"] = time.perf_counter()
+        started.set()
+        try:
+            return fn(c)
+        finally:
+            clock["end"] = time.perf_counter()
+
+    future = _analyzer_executor.submit(timed_run, ctx)
+    if not started.wait(ANALYZER_QUEUE_LIMIT_MS / 1000):
+        future.cancel()  # if it starts anyway, it runs abandoned
+        return None, 0.0, "busy"
+    remaining = budget_ms / 1000 - (time.perf_counter() - clock["start"])
+    try:
+        result = future.result(timeout=max(0.0, remaining))
+        outcome = "ok"
+    except FuturesTimeoutError:
+        result, outcome = None, "timeout"
+    except Exception as e:
+        print(f"Janitor analyzer failed: {e}")
+        result, outcome = None, "error"
+    elapsed = clock.get("end", time.perf_counter()) - clock["start"]
+    return result, round(elapsed * 1000, 2), outcome
+
+
+def _analysis_context(
+    project_path: str,
+    html: str,
+    language: str,
+    confidence_threshold: float,
+    entities: list[dict]
+) -> dict | None:
+    plain_text = _strip_todo_blocks(_html_to_plain(html))
+    if not plain_text.strip():
+        return None
+    return {
+        "project_path": project_path,
+        "language": language,
+        "confidence_threshold": confidence_threshold,
+        "entities": entities,
+        "plain_text": plain_text,
+        # Word-boundary-safe version for typo/synonym tokenization (adds spaces at block breaks)
+        "words_plain": _strip_todo_blocks(_html_to_words_plain(html)),
+        "linked_ranges": _get_linked_ranges(html),
+    }
+
+
+def _resolve_needs(analyzer: JanitorAnalyzer, ctx: dict) -> bool:
+    """Fill in the context keys this analyzer needs. False if one can't be provided."""
+    for need in analyzer.needs:
+        if need in ctx:
+            if ctx[need] is None:
+                return False
+            continue
+        if need == "entity_matches":
+            # One automaton pass finds every name/alias occurrence for the link + alias analyzers
+            ctx["entity_matches"] = get_entity_matcher(ctx["project_path"], ctx["entities"]).find_all(ctx["plain_text"])
+        elif need in ("nlp", "doc"):
+            if "nlp" not in ctx:
+                try:
+                    # Pinned in the model cache until _iter_analyzers finishes
+                    from nlp_manager import acquire_nlp
+                    ctx["nlp"] = acquire_nlp(ctx["language"])
+                except Exception:
+                    ctx["nlp"] = None
+            if ctx["nlp"] is None:
+                return False
+            if need == "doc":
+                doc, elapsed_ms, outcome = _run_budgeted(
+                    lambda c: c["nlp"](c["plain_text"][:DOC_CHAR_LIMIT]), ctx, PARSE_BUDGET_MS
+                )
+                _record_timing("spacy_parse", elapsed_ms, outcome)
+                ctx["doc"] = doc
+                if doc is None:
+                    return False
+    return True
+
+
+def _iter_analyzers(
+    project_path: str,
+    html: str,
+    language: str,
+    confidence_threshold: float,
+    entities: list[dict]
+):
+    """
+    Yield one result dict per applicable analyzer as it finishes:
+    {"analyzer", "suggestions", "elapsed_ms"} plus "skipped" ("timeout", "busy", "error"
+    or "unavailable") when it produced nothing usable.
+    """
+    ctx = _analysis_context(project_path, html, language, confidence_threshold, entities)
+    if ctx is None:
+        return
+    try:
+        for analyzer in _get_analyzers(language):
+            if analyzer.warm and (analyzer.name, language) not in _warmed:
+                try:
+                    analyzer.warm(language)
+                except Exception:
+                    pass
+                _warmed.add((analyzer.name, language))
+            if not _resolve_needs(analyzer, ctx):
+                yield {"analyzer": analyzer.name, "suggestions": [], "elapsed_ms": 0, "skipped": "unavailable"}
+                continue
+            suggestions, elapsed_ms, outcome = _run_budgeted(analyzer.run, ctx, analyzer.budget_ms)
+            _record_timing(analyzer.name, elapsed_ms, outcome)
+            result = {"analyzer": analyzer.name, "suggestions": suggestions or [], "elapsed_ms": elapsed_ms}
+            if outcome != "ok":
+                result["skipped"] = outcome
+            yield result
+    finally:
+        if ctx.get("nlp") is not None:
+            from nlp_manager import release_nlp
+            release_nlp(language, ctx["nlp"])
+
+
+def _run_analyzers(
+    project_path: str,
+    html: str,
+    language: str,
+    confidence_threshold: float,
+    entities: list[dict]
+) -> list[dict]:
+    """Run every analyzer for `language` over one chapter's editor HTML."""
+    by_name = {
+        r["analyzer"]: r["suggestions"]
+        for r in _iter_analyzers(project_path, html, language, confidence_threshold, entities)
+    }
+    return [s for name in ANALYZER_ORDER for s in by_name.get(name, [])]
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float | None:
+    if not sorted_samples:
+        return None
+    idx = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[idx]
+
+
+@router.post("/api/janitor/analyzer-stats")
+def janitor_analyzer_stats():
+    """p50/p95 timings per analyzer over the last _TIMING_WINDOW runs in this process."""
+    _get_analyzers("en")  # make sure language packs are registered
+    declared = {}
+    for a in _ANALYZERS:
+        info = declared.setdefault(a.name, {"cost": a.cost, "budget_ms": a.budget_ms, "languages": set()})
+        info["languages"].update(a.languages or ["*"])
+    declared["spacy_parse"] = {"cost": COST_PARSER, "budget_ms": PARSE_BUDGET_MS, "languages": {"*"}}
+
+    with _timings_lock:
+        snapshot = {
+            name: (sorted(e["samples"]), e["runs"], e["timeouts"], e["errors"], e["busy"])
+            for name, e in _timings.items()
+        }
+
+    analyzers = []
+    for name, info in declared.items():
+        samples, runs, timeouts, errors, busy = snapshot.get(name, ([], 0, 0, 0, 0))
+        analyzers.append({
+            "name": name,
+            "cost": info["cost"],
+            "budget_ms": info["budget_ms"],
+            "languages": sorted(info["languages"]),
+            "runs": runs,
+            "timeouts": timeouts,
+            "errors": errors,
+            "busy": busy,
+            "p50_ms": _percentile(samples, 50),
+            "p95_ms": _percentile(samples, 95),
+            "max_ms": samples[-1] if samples else None,
+        })
+    return {"status": "ok", "analyzers": analyzers}
+
+
 @router.post("/api/project/janitor/analyze")
 def janitor_analyze(req: JanitorRequest):
     try:
@@ -1010,62 +1409,43 @@ def janitor_analyze(req: JanitorRequest):
         return {"status": "error", "suggestions": [], "error": str(e)}
 
     try:
-        plain_text = _strip_todo_blocks(_html_to_plain(req.html))
-        if not plain_text.strip():
-            return {"status": "ok", "suggestions": []}
-        # Word-boundary-safe version for typo/synonym tokenization (adds spaces at block breaks)
-        words_plain = _strip_todo_blocks(_html_to_words_plain(req.html))
         entities = _get_all_entities(conn)
-        linked_ranges = _get_linked_ranges(req.html)
-        if req.language == "hu":
-            from routes.hun_janitor import (
-                _analyze_weak_adverbs_hu,
-                _analyze_passive_voice_hu,
-                _analyze_show_dont_tell_hu,
-                _analyze_pacing_hu,
-                _analyze_five_senses_hu,
-            )
-            weak_adverbs = _analyze_weak_adverbs_hu(plain_text, req.language)
-            passive_voice = _analyze_passive_voice_hu(plain_text, req.language)
-            sdt = _analyze_show_dont_tell_hu(plain_text, req.language, req.confidence_threshold)
-            pacing = _analyze_pacing_hu(plain_text, req.language)
-            five_senses = _analyze_five_senses_hu(plain_text, req.language)
-        elif req.language == "pl":
-            from routes.pol_janitor import (
-                _analyze_weak_adverbs_pl,
-                _analyze_passive_voice_pl,
-                _analyze_show_dont_tell_pl,
-                _analyze_pacing_pl,
-                _analyze_five_senses_pl,
-            )
-            weak_adverbs = _analyze_weak_adverbs_pl(plain_text, req.language)
-            passive_voice = _analyze_passive_voice_pl(plain_text, req.language)
-            sdt = _analyze_show_dont_tell_pl(plain_text, req.language, req.confidence_threshold)
-            pacing = _analyze_pacing_pl(plain_text, req.language)
-            five_senses = _analyze_five_senses_pl(plain_text, req.language)
-        else:
-            weak_adverbs = _analyze_weak_adverbs(plain_text, req.language)
-            passive_voice = _analyze_passive_voice(plain_text, req.language)
-            sdt = _analyze_show_dont_tell(plain_text, req.language, req.confidence_threshold)
-            pacing = _analyze_pacing(plain_text, req.language)
-            five_senses = _analyze_five_senses(plain_text, req.language)
-
-        readability = _analyze_readability(plain_text, req.language)
-        suggestions = (
-            _analyze_link_existing(plain_text, linked_ranges, entities) +
-            _analyze_create_entity(plain_text, entities, req.language, linked_ranges) +
-            _analyze_alias(plain_text, entities) +
-            _analyze_typo(plain_text, req.language, words_plain, entities) +
-            _analyze_synonym(plain_text, req.language, words_plain) +
-            weak_adverbs +
-            passive_voice +
-            sdt +
-            pacing +
-            five_senses +
-            readability
+        suggestions = _run_analyzers(
+            req.project_path, req.html, req.language, req.confidence_threshold, entities
         )
         return {"status": "ok", "suggestions": suggestions}
     except Exception as e:
         return {"status": "error", "suggestions": [], "error": str(e)}
     finally:
         conn.close()
+
+
+@router.post("/api/project/janitor/analyze-stream")
+def janitor_analyze_stream(req: JanitorRequest):
+    """
+    Streaming variant of janitor_analyze. Responds with NDJSON: one line per analyzer
+    as soon as it finishes ({"analyzer", "suggestions", "elapsed_ms"}, plus "skipped"
+    if it overran its budget, found no free worker or failed), then a final
+    {"done": true, "total_ms"} line.
+    """
+    try:
+        conn = _get_db(req.project_path)
+    except FileNotFoundError as e:
+        return {"status": "error", "suggestions": [], "error": str(e)}
+    try:
+        entities = _get_all_entities(conn)
+    finally:
+        conn.close()
+
+    def event_stream():
+        started = time.perf_counter()
+        try:
+            for result in _iter_analyzers(
+                req.project_path, req.html, req.language, req.confidence_threshold, entities
+            ):
+                yield json.dumps(result) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+        yield json.dumps({"done": True, "total_ms": round((time.perf_counter() - started) * 1000, 2)}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
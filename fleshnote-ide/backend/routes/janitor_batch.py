@@ -0,0 +1,253 @@
+"""
+FleshNote API — Janitor Batch Routes
+Project-wide janitor runs: every chapter's .md file is analyzed in parallel worker
+processes, suggestions are persisted per chapter keyed by content hash (so unchanged
+chapters are skipped next time), and progress is reported by polling.
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from entity_matcher import entity_set_signature
+from routes.janitor import _get_db, _get_all_entities, _run_analyzers
+from routes.chapters import _md_to_editor_html, _get_quicknote_types
+
+router = APIRouter()
+
+# Each worker process loads its own NLP model, so keep the pool small
+MAX_BATCH_WORKERS = 4
+
+# Finished jobs kept for status polls (oldest are dropped first)
+MAX_STORED_BATCH_JOBS = 20
+
+# In-memory job registry: job_id -> progress dict.
+# The worker thread updates a job and the status endpoint reads it, both under _batch_lock.
+_batch_jobs: dict = {}
+_batch_lock = threading.Lock()
+
+
+class JanitorBatchStartRequest(BaseModel):
+    project_path: str
+    language: str = "en"
+    confidence_threshold: float = 0.5
+    force: bool = False  # re-analyze chapters even if their hash is unchanged
+
+
+class JanitorBatchStatusRequest(BaseModel):
+    job_id: str
+
+
+class JanitorBatchResultsRequest(BaseModel):
+    project_path: str
+    chapter_id: int | None = None
+
+
+def _analysis_hash(md_content: str, language: str, confidence_threshold: float, entity_signature: str) -> str:
+    """Hash of everything that feeds the analyzers: chapter text, settings and the entity set."""
+    h = hashlib.sha256()
+    h.update(md_content.encode("utf-8"))
+    h.update(f"\x00{language}\x00{confidence_threshold}\x00{entity_signature}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _analyze_chapter_worker(
+    project_path: str,
+    chapter_id: int,
+    md_content: str,
+    language: str,
+    confidence_threshold: float,
+    entities: list[dict],
+    quicknote_types: dict
+) -> tuple[int, list[dict]]:
+    """Process-pool entry point: analyze one chapter exactly as the editor would send it."""
+    html = _md_to_editor_html(md_content, quicknote_types)
+    return chapter_id, _run_analyzers(project_path, html, language, confidence_threshold, entities)
+
+
+def _public_job(job: dict) -> dict:
+    """Snapshot of a job for the API; call with _batch_lock held."""
+    elapsed = (job.get("finished_at") or time.time()) - job["started_at"]
+    return {
+        "job_id": job["job_id"],
+        "state": job["state"],
+        "total": job["total"],
+        "processed": job["processed"],
+        "skipped": job["skipped"],
+        "failed": job["failed"],
+        "elapsed_ms": int(elapsed * 1000),
+        "errors": job["errors"][-10:],
+    }
+
+
+def _prune_batch_jobs():
+    """Drop the oldest finished jobs beyond MAX_STORED_BATCH_JOBS; call with _batch_lock held."""
+    finished = sorted(
+        (job for job in _batch_jobs.values() if job["state"] != "running"),
+        key=lambda job: job["started_at"]
+    )
+    for job in finished[:max(0, len(finished) - MAX_STORED_BATCH_JOBS)]:
+        del _batch_jobs[job["job_id"]]
+
+
+def _update_job(job: dict, error: dict | None = None, **counts):
+    """Add to a job's counters (and record an error) from the worker thread."""
+    with _batch_lock:
+        for key, value in counts.items():
+            job[key] += value
+        if error is not None:
+            job["errors"].append(error)
+
+
+def _run_batch(job: dict, req: JanitorBatchStartRequest):
+    conn = None
+    try:
+        conn = _get_db(req.project_path)
+        chapters = conn.execute(
+            "SELECT id, md_filename FROM chapters ORDER BY chapter_number"
+        ).fetchall()
+        entities = _get_all_entities(conn)
+        quicknote_types = _get_quicknote_types(conn)
+        signature = entity_set_signature(entities)
+        existing = {
+            r["chapter_id"]: r["content_hash"]
+            for r in conn.execute("SELECT chapter_id, content_hash FROM janitor_results").fetchall()
+        }
+
+        todo = []
+        skipped = 0
+        for ch in chapters:
+            if not ch["md_filename"]:
+                continue
+            md_path = os.path.join(req.project_path, "md", ch["md_filename"])
+            if not os.path.exists(md_path):
+                continue
+            with open(md_path, "r", encoding="utf-8") as f:
+                md_content = f.read()
+            content_hash = _analysis_hash(md_content, req.language, req.confidence_threshold, signature)
+            if not req.force and existing.get(ch["id"]) == content_hash:
+                skipped += 1
+                continue
+            todo.append((ch["id"], md_content, content_hash))
+        with _batch_lock:
+            job["skipped"] = skipped
+            job["total"] = len(todo) + skipped
+
+        if todo:
+            workers = max(1, min(len(todo), MAX_BATCH_WORKERS, os.cpu_count() or 1))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(
+                        _analyze_chapter_worker, req.project_path, chapter_id, md_content,
+                        req.language, req.confidence_threshold, entities, quicknote_types
+                    ): (chapter_id, content_hash)
+                    for chapter_id, md_content, content_hash in todo
+                }
+                for future in as_completed(futures):
+                    chapter_id, content_hash = futures[future]
+                    try:
+                        _, suggestions = future.result()
+                    except Exception as e:
+                        _update_job(job, {"chapter_id": chapter_id, "error": str(e)}, failed=1)
+                        continue
+                    conn.execute("""
+                        INSERT INTO janitor_results (chapter_id, content_hash, language, suggestions, analyzed_at)
+                        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                        ON CONFLICT(chapter_id) DO UPDATE SET
+                            content_hash = excluded.content_hash,
+                            language = excluded.language,
+                            suggestions = excluded.suggestions,
+                            analyzed_at = excluded.analyzed_at
+                    """, (chapter_id, content_hash, req.language, json.dumps(suggestions)))
+                    conn.commit()
+                    _update_job(job, processed=1)
+
+        state, error = "done", None
+    except Exception as e:
+        state, error = "error", {"chapter_id": None, "error": str(e)}
+    finally:
+        if conn is not None:
+            conn.close()
+    with _batch_lock:
+        if error is not None:
+            job["errors"].append(error)
+        job["finished_at"] = time.time()
+        job["state"] = state
+
+
+@router.post("/api/project/janitor/batch/start")
+def janitor_batch_start(req: JanitorBatchStartRequest):
+    project_key = os.path.normcase(os.path.abspath(req.project_path))
+    with _batch_lock:
+        # Only one batch run per project at a time — hand back the running one
+        for job in _batch_jobs.values():
+            if job["project_key"] == project_key and job["state"] == "running":
+                return {"status": "ok", "job": _public_job(job)}
+        job = {
+            "job_id": uuid.uuid4().hex[:12],
+            "project_key": project_key,
+            "state": "running",
+            "total": 0,
+            "processed": 0,
+            "skipped": 0,
+            "failed": 0,
+            "errors": [],
+            "started_at": time.time(),
+            "finished_at": None,
+        }
+        _batch_jobs[job["job_id"]] = job
+        _prune_batch_jobs()
+        public = _public_job(job)
+
+    threading.Thread(target=_run_batch, args=(job, req), daemon=True).start()
+    return {"status": "ok", "job": public}
+
+
+@router.post("/api/project/janitor/batch/status")
+def janitor_batch_status(req: JanitorBatchStatusRequest):
+    with _batch_lock:
+        job = _batch_jobs.get(req.job_id)
+        if not job:
+            return {"status": "error", "error": "Unknown job id"}
+        return {"status": "ok", "job": _public_job(job)}
+
+
+@router.post("/api/project/janitor/batch/results")
+def janitor_batch_results(req: JanitorBatchResultsRequest):
+    try:
+        conn = _get_db(req.project_path)
+    except FileNotFoundError as e:
+        return {"status": "error", "chapters": [], "error": str(e)}
+    try:
+        query = """
+            SELECT c.id, c.chapter_number, c.title, r.language, r.suggestions, r.analyzed_at
+            FROM janitor_results r
+            JOIN chapters c ON c.id = r.chapter_id
+        """
+        params: tuple = ()
+        if req.chapter_id is not None:
+            query += " WHERE c.id = ?"
+            params = (req.chapter_id,)
+        query += " ORDER BY c.chapter_number"
+        result = []
+        for r in conn.execute(query, params).fetchall():
+            result.append({
+                "chapter_id": r["id"],
+                "chapter_number": r["chapter_number"],
+                "title": r["title"] or f"Chapter {r['chapter_number']}",
+                "language": r["language"],
+                "analyzed_at": r["analyzed_at"],
+                "suggestions": json.loads(r["suggestions"] or "[]"),
+            })
+        return {"status": "ok", "chapters": result}
+    except Exception as e:
+        return {"status": "error", "chapters": [], "error": str(e)}
+    finally:
+        conn.close()
@@ -1,5 +1,5 @@
 import re
-from routes.janitor import _build_context, _make_id
+from routes.janitor import _build_context, _make_id, DOC_CHAR_LIMIT, JanitorAnalyzer, COST_PARSER
 
 # --- Polish SDT lexicons ---
 LINKING_VERBS_PL = {"być", "stać", "wydawać", "wyglądać", "pozostawać", "czuć", "okazać", "okazywać"}
@@ -128,15 +128,15 @@ def _analyze_five_senses_pl(plain_text: str, language: str) -> list[dict]:
     }]
 
 
-def _analyze_weak_adverbs_pl(plain_text: str, language: str, cap: int = 5) -> list[dict]:
+def _analyze_weak_adverbs_pl(plain_text: str, language: str, cap: int = 5, doc=None) -> list[dict]:
     """Detect weak adverbs modifying verbs in Polish text."""
     if language != "pl":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -184,7 +184,7 @@ def _analyze_weak_adverbs_pl(plain_text: str, language: str, cap: int = 5) -> li
     return suggestions
 
 
-def _analyze_passive_voice_pl(plain_text: str, language: str, cap: int = 3) -> list[dict]:
+def _analyze_passive_voice_pl(plain_text: str, language: str, cap: int = 3, doc=None) -> list[dict]:
     """Detect passive constructions in Polish.
 
     Polish passive: 'zostać/być' + past passive participle (-ny/-na/-ne/-ty/-ta/-te suffix).
@@ -195,9 +195,9 @@ def _analyze_passive_voice_pl(plain_text: str, language: str, cap: int = 3) -> l
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -371,16 +371,17 @@ def _analyze_show_dont_tell_pl(
     plain_text: str,
     language: str,
     confidence_threshold: float = 0.5,
-    cap: int = 5
+    cap: int = 5,
+    doc=None
 ) -> list[dict]:
     """4-detector show-don't-tell pipeline for Polish with em-dash dialogue exclusion."""
     if language != "pl":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -429,15 +430,16 @@ def _analyze_show_dont_tell_pl(
 def _analyze_pacing_pl(
     plain_text: str,
     language: str,
-    cap: int = 2
+    cap: int = 2,
+    doc=None
 ) -> list[dict]:
     if language != "pl":
         return []
     suggestions = []
     try:
-        from nlp_manager import get_nlp
-        nlp = get_nlp(language)
-        doc = nlp(plain_text[:10000])
+        if doc is None:
+            from nlp_manager import get_nlp
+            doc = get_nlp(language)(plain_text[:DOC_CHAR_LIMIT])
     except Exception:
         return []
 
@@ -490,3 +492,33 @@ def _analyze_pacing_pl(
         })
 
     return suggestions
+
+
+# Registered with the janitor orchestrator (see routes/janitor.py: _get_analyzers)
+ANALYZERS = [
+    JanitorAnalyzer(
+        "five_senses",
+        lambda c: _analyze_five_senses_pl(c["plain_text"], c["language"]),
+        languages=("pl",),
+    ),
+    JanitorAnalyzer(
+        "weak_adverbs",
+        lambda c: _analyze_weak_adverbs_pl(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("pl",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "passive_voice",
+        lambda c: _analyze_passive_voice_pl(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("pl",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "show_dont_tell",
+        lambda c: _analyze_show_dont_tell_pl(c["plain_text"], c["language"], c["confidence_threshold"], doc=c["doc"]),
+        languages=("pl",), needs=("doc",), cost=COST_PARSER,
+    ),
+    JanitorAnalyzer(
+        "pacing",
+        lambda c: _analyze_pacing_pl(c["plain_text"], c["language"], doc=c["doc"]),
+        languages=("pl",), needs=("doc",), cost=COST_PARSER,
+    ),
+]
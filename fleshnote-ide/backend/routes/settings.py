@@ -1,7 +1,7 @@
 import os
 from fastapi import APIRouter
 from pydantic import BaseModel
-from nlp_manager import check_model_exists, get_nlp
+from nlp_manager import check_model_exists, get_nlp, unload_nlp, model_cache_status, set_memory_budget
 
 router = APIRouter()
 
@@ -11,6 +11,15 @@ class SpacyModelStatusRequest(BaseModel):
 class SpacyModelLoadRequest(BaseModel):
     language: str
 
+class SpacyModelUnloadRequest(BaseModel):
+    language: str
+
+class NlpWarmupStatusRequest(BaseModel):
+    language: str
+
+class NlpModelsRequest(BaseModel):
+    memory_budget_mb: int | None = None  # set to change the cache budget
+
 @router.post("/api/settings/check-model")
 def check_spacy_model(req: SpacyModelStatusRequest):
     """
@@ -34,3 +43,35 @@ def load_nlp_model(req: SpacyModelLoadRequest):
         "language": req.language,
         "status": "loaded"
     }
+
+@router.post("/api/nlp/unload")
+def unload_nlp_model(req: SpacyModelUnloadRequest):
+    """
+    Frees a resident NLP model. A model still in use by a running analysis is
+    dropped as soon as that finishes (status: pending).
+    """
+    return {
+        "language": req.language,
+        "status": unload_nlp(req.language),
+        "cache": model_cache_status()
+    }
+
+@router.post("/api/nlp/models")
+def nlp_models(req: NlpModelsRequest):
+    """
+    Reports resident NLP models (estimated size, in-flight users, idle time) and
+    the cache's memory budget. Optionally sets a new budget, evicting idle models.
+    """
+    evicted = []
+    if req.memory_budget_mb is not None:
+        evicted = set_memory_budget(req.memory_budget_mb)
+    return {"status": "ok", "evicted": evicted, **model_cache_status()}
+
+@router.post("/api/nlp/warmup-status")
+def nlp_warmup_status(req: NlpWarmupStatusRequest):
+    """
+    Readiness of the background warm-up started when a project opens
+    (spaCy pipeline, Hunspell dictionary, synonym data) for a language.
+    """
+    from model_warmup import warmup_status
+    return {"status": "ok", **warmup_status(req.language)}
@@ -3,20 +3,27 @@ FleshNote API — Spell Check Routes
 phunspell (Hunspell)-based typo detection and correction suggestions.
 Supports en_US, ar, hu_HU, pl_PL and 50+ other locales.
 """
+import re
 import json
 import sqlite3
 import os
+import threading
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+import spell_manager
+
 router = APIRouter()
 
-LANG_MAP = {
-    "en": "en_US",
-    "ar": "ar",
-    "hu": "hu_HU",
-    "pl": "pl_PL",
-}
+# Per-project word sets: project key -> (db signature, story language, ignore set, entity names)
+_project_words: dict = {}
+_project_words_lock = threading.Lock()
+
+# Letters with optional inner apostrophes (don't, l'homme); digits and underscores excluded
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+
+# Upper bound on unique words checked per batch request
+MAX_BATCH_WORDS = 5000
 
 
 def _get_db(project_path: str):
@@ -69,11 +76,68 @@ def _get_entity_names(conn) -> set:
     return names
 
 
+def _db_signature(project_path: str) -> tuple:
+    """Changes whenever the project DB is written to (main file or its WAL)."""
+    sig = []
+    for suffix in ("", "-wal"):
+        try:
+            st = os.stat(os.path.join(project_path, "fleshnote.db" + suffix))
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _get_project_words(project_path: str) -> tuple[str, set, set]:
+    """(story language, ignore list, entity names), cached until the project DB changes."""
+    key = os.path.normcase(os.path.abspath(project_path))
+    signature = _db_signature(project_path)
+    with _project_words_lock:
+        cached = _project_words.get(key)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2], cached[3]
+
+    conn = _get_db(project_path)
+    try:
+        lang_code = _get_story_language(conn)
+        ignore_list = _get_ignore_list(conn)
+        entity_names = _get_entity_names(conn)
+    finally:
+        conn.close()
+
+    with _project_words_lock:
+        _project_words[key] = (signature, lang_code, ignore_list, entity_names)
+    return lang_code, ignore_list, entity_names
+
+
+def _invalidate_project_words(project_path: str):
+    with _project_words_lock:
+        _project_words.pop(os.path.normcase(os.path.abspath(project_path)), None)
+
+
+def _check_word(word: str, lang_code: str, ignore_list: set, entity_names: set) -> tuple[bool, list[str]]:
+    """(is_correct, suggestions) for an already-lowercased word."""
+    if len(word) < 2 or word in ignore_list or word in entity_names:
+        return True, []
+    is_correct = spell_manager.lookup(lang_code, word)
+    if is_correct is None or is_correct:
+        # No dictionary for this language counts as correct
+        return True, []
+    return False, [s for s in spell_manager.suggest(lang_code, word) if s.lower() != word][:6]
+
+
 class SpellCheckRequest(BaseModel):
     project_path: str
     word: str
 
 
+class SpellCheckBatchRequest(BaseModel):
+    project_path: str
+    words: list[str] = []
+    text: str | None = None  # a paragraph; tokenized server-side, offsets returned
+    include_correct: bool = False
+
+
 class AddIgnoreRequest(BaseModel):
     project_path: str
     word: str
@@ -86,33 +150,52 @@ def spell_check(req: SpellCheckRequest):
     if not word or len(word) < 2:
         return {"status": "ok", "is_correct": True, "suggestions": []}
 
-    conn = _get_db(req.project_path)
-    try:
-        lang_code = _get_story_language(conn)
-        ignore_list = _get_ignore_list(conn)
-        entity_names = _get_entity_names(conn)
-    finally:
-        conn.close()
+    lang_code, ignore_list, entity_names = _get_project_words(req.project_path)
 
-    # If word is in entity names or ignore list, it's "correct"
-    if word in ignore_list or word in entity_names:
-        return {"status": "ok", "is_correct": True, "suggestions": []}
+    try:
+        is_correct, suggestions = _check_word(word, lang_code, ignore_list, entity_names)
+        return {"status": "ok", "is_correct": is_correct, "suggestions": suggestions}
+    except Exception as e:
+        return {"status": "ok", "is_correct": True, "suggestions": [], "error": str(e)}
 
-    sc_lang = LANG_MAP.get(lang_code)
-    if not sc_lang:
-        # Language not in LANG_MAP — no suggestions
-        return {"status": "ok", "is_correct": True, "suggestions": []}
 
+@router.post("/api/project/spellcheck/batch")
+def spell_check_batch(req: SpellCheckBatchRequest):
+    """
+    Check many words in one call — an explicit `words` list and/or a `text` paragraph.
+    Returns one entry per unique (lowercased) word in first-seen order; misspelled words
+    only unless include_correct is set. Words found in `text` carry their char offsets.
+    """
+    offsets: dict = {}
+    order: list[str] = []
+    for raw in req.words:
+        word = raw.strip().lower()
+        if word and word not in offsets:
+            offsets[word] = []
+            order.append(word)
+    if req.text:
+        for m in _WORD_RE.finditer(req.text):
+            word = m.group(0).lower()
+            if word not in offsets:
+                offsets[word] = []
+                order.append(word)
+            offsets[word].append(m.start())
+    order = order[:MAX_BATCH_WORDS]
+
+    lang_code, ignore_list, entity_names = _get_project_words(req.project_path)
+    results = []
     try:
-        import phunspell
-        spell = phunspell.Phunspell(sc_lang)
-        if spell.lookup(word):
-            return {"status": "ok", "is_correct": True, "suggestions": []}
-
-        suggestions = [s for s in spell.suggest(word) if s.lower() != word][:6]
-        return {"status": "ok", "is_correct": False, "suggestions": suggestions}
+        for word in order:
+            is_correct, suggestions = _check_word(word, lang_code, ignore_list, entity_names)
+            if is_correct and not req.include_correct:
+                continue
+            entry = {"word": word, "is_correct": is_correct, "suggestions": suggestions}
+            if req.text:
+                entry["offsets"] = offsets[word]
+            results.append(entry)
     except Exception as e:
-        return {"status": "ok", "is_correct": True, "suggestions": [], "error": str(e)}
+        return {"status": "ok", "checked": len(order), "results": results, "error": str(e)}
+    return {"status": "ok", "checked": len(order), "results": results}
 
 
 @router.post("/api/project/spellcheck/ignore")
@@ -134,6 +217,7 @@ def add_to_ignore_list(req: AddIgnoreRequest):
             (value,)
         )
         conn.commit()
+        _invalidate_project_words(req.project_path)
         return {"status": "ok", "ignore_list": list(ignore_list)}
     finally:
         conn.close()
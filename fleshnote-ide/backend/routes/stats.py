@@ -12,10 +12,9 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
-router = APIRouter()
+import stats_aggregator
 
-class ProjectPath(BaseModel):
-    project_path: str
+router = APIRouter()
 
 class StatUpdateRequest(BaseModel):
     project_path: str
@@ -31,8 +30,78 @@ def _get_db(project_path: str):
     conn.row_factory = sqlite3.Row
     return conn
 
+# Tokenization shared by the per-chapter index and the top-words aggregation
+_MARKER_RE = re.compile(r'\{\{[^}]+\}\}')
+_HTML_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\b[^\W\d_]{2,}\b')
+
+TOP_WORDS_LIMIT = 50
+
+
+def _count_words(md_content: str) -> Counter:
+    """Word frequencies for one chapter: markers and HTML removed, lowercased, 2+ letter words."""
+    content = _MARKER_RE.sub(' ', md_content)
+    content = _HTML_RE.sub(' ', content)
+    return Counter(_WORD_RE.findall(content.lower()))
+
+
+def _index_chapter_words(cursor, chapter_id: int, md_content: str, md_path: str | None = None):
+    """
+    Bring a chapter's rows in chapter_word_freq in line with `md_content`, writing only
+    the words whose counts changed. Counts are stored unfiltered; stopwords and entity
+    names are excluded when the top words are aggregated.
+    """
+    new_counts = _count_words(md_content)
+    cursor.execute("SELECT word, count FROM chapter_word_freq WHERE chapter_id = ?", (chapter_id,))
+    old_counts = {r[0]: r[1] for r in cursor.fetchall()}
+
+    removed = [(chapter_id, w) for w in old_counts if w not in new_counts]
+    changed = [(chapter_id, w, c) for w, c in new_counts.items() if old_counts.get(w) != c]
+    if removed:
+        cursor.executemany("DELETE FROM chapter_word_freq WHERE chapter_id = ? AND word = ?", removed)
+    if changed:
+        cursor.executemany("""
+            INSERT INTO chapter_word_freq (chapter_id, word, count) VALUES (?, ?, ?)
+            ON CONFLICT(chapter_id, word) DO UPDATE SET count = excluded.count
+        """, changed)
+
+    # Remember which version of the file the index reflects, so writers that bypass
+    # chapter save (imports, entity unlinking, ...) are picked up by _sync_word_index
+    st = os.stat(md_path) if md_path and os.path.exists(md_path) else None
+    cursor.execute("""
+        INSERT INTO chapter_word_freq_state (chapter_id, md_mtime, md_size) VALUES (?, ?, ?)
+        ON CONFLICT(chapter_id) DO UPDATE SET md_mtime = excluded.md_mtime, md_size = excluded.md_size
+    """, (chapter_id, st.st_mtime if st else None, st.st_size if st else None))
+
+
+def _sync_word_index(conn, project_path: str):
+    """Index chapters whose .md file changed outside chapter save, and drop deleted chapters."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM chapter_word_freq WHERE chapter_id NOT IN (SELECT id FROM chapters)")
+    cursor.execute("DELETE FROM chapter_word_freq_state WHERE chapter_id NOT IN (SELECT id FROM chapters)")
+
+    cursor.execute("""
+        SELECT c.id, c.md_filename, s.md_mtime, s.md_size
+        FROM chapters c
+        LEFT JOIN chapter_word_freq_state s ON s.chapter_id = c.id
+        WHERE c.md_filename IS NOT NULL
+    """)
+    md_dir = os.path.join(project_path, "md")
+    for ch in cursor.fetchall():
+        md_path = os.path.join(md_dir, ch["md_filename"])
+        if not os.path.exists(md_path):
+            if ch["md_mtime"] is not None or ch["md_size"] is not None:
+                _index_chapter_words(cursor, ch["id"], "")
+            continue
+        st = os.stat(md_path)
+        if ch["md_mtime"] == st.st_mtime and ch["md_size"] == st.st_size:
+            continue
+        with open(md_path, "r", encoding="utf-8") as f:
+            _index_chapter_words(cursor, ch["id"], f.read(), md_path)
+
+
 def _calculate_top_words(project_path: str):
-    """Calculate the top 10 most used words across all chapters, ignoring stop words and entities."""
+    """Calculate the top 50 most used words across all chapters, ignoring stop words and entities."""
     try:
         conn = _get_db(project_path)
         cursor = conn.cursor()
@@ -56,49 +125,28 @@ def _calculate_top_words(project_path: str):
             for word in re.findall(r'\b[^\W\d_]+\b', name):
                 entity_words.add(word)
 
-        # 3. Load NLP stopwords if available, else fallback
-        stopwords: set[str] = set()
-        try:
-            from nlp_manager import get_nlp
-            nlp = get_nlp(lang)
-            if hasattr(nlp.Defaults, 'stop_words') and nlp.Defaults.stop_words:
-                stopwords = set(list(nlp.Defaults.stop_words))
-            else:
-                raise ValueError("Empty spacy stopwords")
-        except Exception:
-            # Fallback to local JSON configuration
-            stopwords_path = os.path.join(os.path.dirname(__file__), "..", "stopwords.json")
-            if os.path.exists(stopwords_path):
-                with open(stopwords_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    stopwords = set(data.get(lang, data.get("en", [])))
-            else:
-                stopwords = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "of", "it", "is", "as", "was", "that", "this", "my", "your", "his", "her", "their", "are", "we", "you", "i", "he", "she", "they", "be", "have"}
+        # 3. Language stopwords (spaCy language data / stopwords.json — never loads a model)
+        from nlp_manager import get_stop_words
+        stopwords = set(get_stop_words(lang))
         
         stopwords.update(entity_words)
         
-        # 4. Read all chapter markdown files
-        cursor.execute("SELECT md_filename FROM chapters WHERE md_filename IS NOT NULL")
-        chapters = cursor.fetchall()
-        
-        md_dir = os.path.join(project_path, "md")
-        word_counter = Counter()
-        
-        for ch in chapters:
-            md_path = os.path.join(md_dir, ch["md_filename"])
-            if os.path.exists(md_path):
-                with open(md_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # Remove markers
-                    content = re.sub(r'\{\{[^}]+\}\}', ' ', content)
-                    # Remove HTML
-                    content = re.sub(r'<[^>]+>', ' ', content)
-                    # Extract words (2 chars or more, ignoring digits/underscores)
-                    words = re.findall(r'\b[^\W\d_]{2,}\b', content.lower())
-                    filtered = [w for w in words if w not in stopwords]
-                    word_counter.update(filtered)
-        
-        top_50 = word_counter.most_common(50)
+        # 4. Make sure the per-chapter index reflects every chapter file (normally a no-op:
+        #    chapter save keeps it current), then aggregate in SQL with the exclusions applied
+        _sync_word_index(conn, project_path)
+
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS excluded_words (word TEXT PRIMARY KEY)")
+        cursor.execute("DELETE FROM temp.excluded_words")
+        cursor.executemany("INSERT OR IGNORE INTO temp.excluded_words (word) VALUES (?)", [(w,) for w in stopwords])
+        cursor.execute("""
+            SELECT word, SUM(count) AS total
+            FROM chapter_word_freq
+            WHERE word NOT IN (SELECT word FROM temp.excluded_words)
+            GROUP BY word
+            ORDER BY total DESC, word ASC
+            LIMIT ?
+        """, (TOP_WORDS_LIMIT,))
+        top_50 = [(r["word"], r["total"]) for r in cursor.fetchall()]
         top_50_json = json.dumps([{"word": w, "count": c} for w, c in top_50])
         
         # Save to stats table (we'll keep using the old key for frontend compatibility unless we rename everywhere)
@@ -115,9 +163,41 @@ def _calculate_top_words(project_path: str):
         if 'conn' in locals():
             conn.close()
 
+class StatsRequest(BaseModel):
+    project_path: str
+    # Optional rollup window, inclusive ISO dates ("2026-03-01"); open-ended when omitted
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    # Split each chapter's mentions into bins of this many words; whole chapters when omitted
+    mention_bin_words: Optional[int] = None
+
+# Rollup table and bucket width ("YYYY-MM-DD" prefix length) per chart granularity
+_ROLLUP_TABLES = {
+    "hourly": ("stat_rollup_hourly", 10),
+    "daily": ("stat_rollup_daily", 10),
+    "monthly": ("stat_rollup_monthly", 7),
+}
+
+def _read_rollup(cursor, table: str, width: int, start_date: str | None, end_date: str | None) -> list[dict]:
+    where, params = [], []
+    if start_date:
+        where.append("bucket >= ?")
+        params.append(start_date[:width])
+    if end_date:
+        where.append(f"substr(bucket, 1, {width}) <= ?")
+        params.append(end_date[:width])
+    cursor.execute(f"""
+        SELECT bucket AS log_date, new_words, deleted_words, new_entities, deleted_entities, new_twists
+        FROM {table}
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY bucket ASC
+    """, params)
+    return [dict(row) for row in cursor.fetchall()]
+
 @router.post("/api/project/stats")
-def get_stats(req: ProjectPath):
+def get_stats(req: StatsRequest):
     conn = _get_db(req.project_path)
+    stats_aggregator.flush(req.project_path)
     cursor = conn.cursor()
 
     # 1. Global Stats
@@ -125,142 +205,85 @@ def get_stats(req: ProjectPath):
     global_stats = {row["stat_key"]: row["stat_value"] for row in cursor.fetchall()}
 
     # 2. Stat Logs (Hourly, Daily, Monthly Rollups for Heatmap/Line Chart)
-    # Hourly
-    cursor.execute("""
-        SELECT 
-            strftime('%Y-%m-%d %H:00:00', timestamp) as log_date,
-            SUM(new_words) as new_words,
-            SUM(deleted_words) as deleted_words,
-            SUM(new_entities) as new_entities,
-            SUM(deleted_entities) as deleted_entities,
-            SUM(new_twists) as new_twists
-        FROM stat_logs
-        GROUP BY strftime('%Y-%m-%d %H:00:00', timestamp)
-        ORDER BY log_date ASC
-    """)
-    hourly_logs = [dict(row) for row in cursor.fetchall()]
-
-    # Daily
-    cursor.execute("""
-        SELECT 
-            DATE(timestamp) as log_date,
-            SUM(new_words) as new_words,
-            SUM(deleted_words) as deleted_words,
-            SUM(new_entities) as new_entities,
-            SUM(deleted_entities) as deleted_entities,
-            SUM(new_twists) as new_twists
-        FROM stat_logs
-        GROUP BY DATE(timestamp)
-        ORDER BY log_date ASC
-    """)
-    daily_logs = [dict(row) for row in cursor.fetchall()]
-
-    # Monthly
-    cursor.execute("""
-        SELECT 
-            strftime('%Y-%m', timestamp) as log_date,
-            SUM(new_words) as new_words,
-            SUM(deleted_words) as deleted_words,
-            SUM(new_entities) as new_entities,
-            SUM(deleted_entities) as deleted_entities,
-            SUM(new_twists) as new_twists
-        FROM stat_logs
-        GROUP BY strftime('%Y-%m', timestamp)
-        ORDER BY log_date ASC
-    """)
-    monthly_logs = [dict(row) for row in cursor.fetchall()]
-
+    # Pre-aggregated by triggers on stat_logs (db_setup.create_stat_rollups)
     stat_logs = {
-        "hourly": hourly_logs,
-        "daily": daily_logs,
-        "monthly": monthly_logs
+        granularity: _read_rollup(cursor, table, width, req.start_date, req.end_date)
+        for granularity, (table, width) in _ROLLUP_TABLES.items()
     }
 
-    # 3. Entity Mentions
-    cursor.execute("""
-        SELECT id, entity_type, entity_id, chapter_id, word_offset, created_at
+    # 3. Entity Mention Density
+    # One row per entity per chapter (per bin), instead of every raw mention
+    bin_expr = "word_offset / ?" if req.mention_bin_words and req.mention_bin_words > 0 else "0"
+    cursor.execute(f"""
+        SELECT entity_type, entity_id, chapter_id, {bin_expr} AS bin,
+               COUNT(*) AS mentions, MIN(word_offset) AS first_offset
         FROM entity_mentions
-        ORDER BY chapter_id ASC, word_offset ASC
-    """)
-    entity_mentions = [dict(row) for row in cursor.fetchall()]
+        GROUP BY entity_type, entity_id, chapter_id, bin
+        ORDER BY chapter_id ASC, bin ASC
+    """, (req.mention_bin_words,) if bin_expr != "0" else ())
+    mention_density = [dict(row) for row in cursor.fetchall()]
 
     conn.close()
 
     return {
         "global_stats": global_stats,
         "stat_logs": stat_logs,
-        "entity_mentions": entity_mentions
+        "mention_density": mention_density,
+        "mention_bin_words": req.mention_bin_words if bin_expr != "0" else None,
     }
 
+def _incremented_value(stored: str | None, increment) -> str:
+    """What a stat reads as after adding `increment` (non-numeric values are replaced)."""
+    if stored is None:
+        return str(increment)
+    try:
+        current = float(stored) if "." in stored else int(stored)
+        return str(current + increment)
+    except ValueError:
+        return str(increment)
+
 @router.post("/api/project/stats/update")
 def update_stat(req: StatUpdateRequest):
     conn = _get_db(req.project_path)
     cursor = conn.cursor()
     
     try:
+        if req.increment_by != 0:
+            # Counters are written behind (stats_aggregator): queue the increment and report
+            # the value it will have once flushed
+            pending = stats_aggregator.add_stat(req.project_path, req.stat_key, req.increment_by)
+            cursor.execute("SELECT stat_value FROM stats WHERE stat_key = ?", (req.stat_key,))
+            row = cursor.fetchone()
+            new_val = _incremented_value(row["stat_value"] if row else None, pending)
+
+            # Mirror worldbuilding stats to stat_logs for time-series charts
+            if req.stat_key in stats_aggregator.LOG_COLUMNS:
+                stats_aggregator.add_activity(req.project_path, "system_action", **{req.stat_key: req.increment_by})
+            return {"status": "ok", "stat_key": req.stat_key, "new_value": new_val}
+
+        # Direct sets are rare; apply queued increments first so they aren't lost or reordered
+        stats_aggregator.flush(req.project_path)
+
         # Check if the stat key already exists
         cursor.execute("SELECT stat_value FROM stats WHERE stat_key = ?", (req.stat_key,))
         row = cursor.fetchone()
         
         if row:
-            # Update existing
-            if req.increment_by != 0:
-                # Assuming current value is an integer or float
+            if req.stat_key.startswith("max_"):
                 try:
-                    current = float(row["stat_value"]) if "." in row["stat_value"] else int(row["stat_value"])
-                    new_val = str(current + req.increment_by)
+                    current = float(row["stat_value"])
+                    new_num = float(req.set_value)
+                    new_val = str(int(max(current, new_num))) if req.set_value.isdigit() else str(max(current, new_num))
                 except ValueError:
-                    # Fallback if it wasn't numeric
-                    new_val = str(req.increment_by)
-            else:
-                if req.stat_key.startswith("max_"):
-                    try:
-                        current = float(row["stat_value"])
-                        new_num = float(req.set_value)
-                        new_val = str(int(max(current, new_num))) if req.set_value.isdigit() else str(max(current, new_num))
-                    except ValueError:
-                        new_val = req.set_value
-                else:
                     new_val = req.set_value
+            else:
+                new_val = req.set_value
                 
             cursor.execute("UPDATE stats SET stat_value = ? WHERE stat_key = ?", (new_val, req.stat_key))
         else:
             # Insert new
-            new_val = str(req.increment_by) if req.increment_by != 0 else req.set_value
+            new_val = req.set_value
             cursor.execute("INSERT INTO stats (stat_key, stat_value) VALUES (?, ?)", (req.stat_key, new_val))
-            
-        # Mirror worldbuilding stats to stat_logs for time-series charts
-        if req.stat_key in ["new_entities", "deleted_entities", "new_twists"] and req.increment_by != 0:
-            event_ctx = "system_action"
-            # Get latest log to group by (within last 60 seconds)
-            cursor.execute("""
-                SELECT id, timestamp
-                FROM stat_logs
-                WHERE event_context = ?
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """, (event_ctx,))
-            last_log = cursor.fetchone()
-            
-            import datetime
-            update_existing = False
-            if last_log:
-                log_time = datetime.datetime.fromisoformat(last_log["timestamp"])
-                if (datetime.datetime.utcnow() - log_time).total_seconds() < 60:
-                    update_existing = True
-                    
-            if update_existing:
-                # Dynamically update the specific column
-                cursor.execute(f"""
-                    UPDATE stat_logs 
-                    SET {req.stat_key} = IFNULL({req.stat_key}, 0) + ?, timestamp = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (req.increment_by, last_log["id"]))
-            else:
-                cursor.execute(f"""
-                    INSERT INTO stat_logs ({req.stat_key}, event_context) 
-                    VALUES (?, ?)
-                """, (req.increment_by, event_ctx))
 
         conn.commit()
         return {"status": "ok", "stat_key": req.stat_key, "new_value": new_val}
@@ -270,3 +293,10 @@ def update_stat(req: StatUpdateRequest):
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         conn.close()
+
+
+@router.post("/api/stats/flush")
+def flush_stats():
+    """Write all queued stat increments now (called by Electron before it stops the backend)."""
+    stats_aggregator.flush()
+    return {"status": "ok"}
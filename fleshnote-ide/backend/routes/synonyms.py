@@ -5,6 +5,7 @@ NLTK WordNet-based synonym lookup for the editor.
 from fastapi import APIRouter
 from pydantic import BaseModel
 from nltk_manager import get_synonyms, check_wordnet_exists, ensure_wordnet_available
+from synonym_store import ensure_store
 
 router = APIRouter()
 
@@ -33,6 +34,6 @@ def check_synonym_data():
 
 @router.post("/api/synonyms/ensure-data")
 def ensure_synonym_data():
-    """Trigger WordNet data download if not present."""
+    """Trigger WordNet data download if not present, then build the synonym store in the background."""
     ensure_wordnet_available()
-    return {"status": "ok"}
+    return {"status": "ok", "store_ready": ensure_store()}
@@ -0,0 +1,94 @@
+"""
+FleshNote — Spell Checker Manager
+Process-wide Hunspell (phunspell) instances, one per language, plus an LRU of
+lookup/suggest verdicts. Loading a dictionary takes hundreds of milliseconds and
+suggest() can take tens of milliseconds per word, so both are done once and shared
+by the spellcheck routes and the Janitor's typo analyzer.
+"""
+
+import threading
+from collections import OrderedDict
+
+# App story language -> Hunspell dictionary code
+LANG_MAP = {
+    "en": "en_US",
+    "ar": "ar",
+    "hu": "hu_HU",
+    "pl": "pl_PL",
+}
+
+# Verdict LRU size: (dictionary, word) -> bool / tuple of suggestions
+VERDICT_CACHE_SIZE = 20000
+
+_spell_cache: dict = {}
+_load_lock = threading.Lock()
+# Hunspell handles are not documented as thread-safe; FastAPI runs sync routes on a pool
+_hunspell_lock = threading.Lock()
+
+_verdicts: OrderedDict = OrderedDict()
+_verdicts_lock = threading.Lock()
+
+
+def get_spell_checker(lang_code: str):
+    """Cached Phunspell instance for a story language, or None if unsupported / unavailable."""
+    sc_lang = LANG_MAP.get(lang_code)
+    if not sc_lang:
+        return None
+    spell = _spell_cache.get(sc_lang)
+    if spell is not None:
+        return spell
+    with _load_lock:
+        if sc_lang not in _spell_cache:
+            try:
+                import phunspell
+                _spell_cache[sc_lang] = phunspell.Phunspell(sc_lang)
+            except Exception as e:
+                print(f"Could not load Hunspell dictionary '{sc_lang}': {e}")
+                return None
+        return _spell_cache[sc_lang]
+
+
+def _cached(key: tuple, compute):
+    with _verdicts_lock:
+        if key in _verdicts:
+            _verdicts.move_to_end(key)
+            return _verdicts[key]
+    value = compute()
+    with _verdicts_lock:
+        _verdicts[key] = value
+        _verdicts.move_to_end(key)
+        while len(_verdicts) > VERDICT_CACHE_SIZE:
+            _verdicts.popitem(last=False)
+    return value
+
+
+def lookup(lang_code: str, word: str) -> bool | None:
+    """True if `word` is in the dictionary. None if no dictionary is available."""
+    spell = get_spell_checker(lang_code)
+    if spell is None:
+        return None
+
+    def compute():
+        with _hunspell_lock:
+            return bool(spell.lookup(word))
+
+    return _cached(("lookup", LANG_MAP[lang_code], word), compute)
+
+
+def suggest(lang_code: str, word: str) -> tuple:
+    """Hunspell's suggestions for `word`, best first. Empty if no dictionary is available."""
+    spell = get_spell_checker(lang_code)
+    if spell is None:
+        return ()
+
+    def compute():
+        with _hunspell_lock:
+            return tuple(spell.suggest(word))
+
+    return _cached(("suggest", LANG_MAP[lang_code], word), compute)
+
+
+def cache_info() -> dict:
+    with _verdicts_lock:
+        size = len(_verdicts)
+    return {"dictionaries": sorted(_spell_cache), "verdicts": size, "max_verdicts": VERDICT_CACHE_SIZE}
@@ -0,0 +1,172 @@
+"""
+FleshNote — Write-behind Stats Aggregator
+Stat counter increments and stat_logs activity (word diffs from chapter saves, entity and
+twist counts) arrive many times a minute, especially in sprint mode. Instead of a SELECT
+plus UPDATE-or-INSERT per event, they are merged in memory per project and flushed every
+few seconds (and at exit) with atomic UPSERTs and in-place increments.
+Anything that reads `stats` / `stat_logs` calls flush(project_path) first.
+"""
+
+import os
+import time
+import atexit
+import sqlite3
+import threading
+
+FLUSH_INTERVAL_S = 2.0
+
+# Activity for one event_context keeps going into the same stat_logs row while that row
+# was last written less than this many seconds ago (one row per burst of activity)
+LOG_MERGE_WINDOW_S = 60
+
+LOG_COLUMNS = ("new_words", "deleted_words", "new_entities", "deleted_entities", "new_twists")
+
+# project_path -> {"stats": {stat_key: increment}, "logs": {event_context: {column: amount}}}
+_pending: dict = {}
+_pending_lock = threading.Lock()
+
+# (project_path, event_context) -> (stat_logs id, time.time() it was last written).
+# Only read and updated by flush() with _flush_lock held
+_open_logs: dict = {}
+
+_flush_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+
+
+def _project_batch(project_path: str) -> dict:
+    return _pending.setdefault(project_path, {"stats": {}, "logs": {}})
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _pending_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, daemon=True)
+            _flusher.start()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL_S)
+        try:
+            flush()
+        except Exception as e:
+            # Never let the loop die: _ensure_flusher doesn't start another one
+            print(f"Stats flush loop error: {e}", flush=True)
+
+
+def add_stat(project_path: str, stat_key: str, increment) -> int | float:
+    """Queue an increment of a `stats` counter. Returns the increment still pending for that key."""
+    with _pending_lock:
+        stats = _project_batch(project_path)["stats"]
+        stats[stat_key] = stats.get(stat_key, 0) + increment
+        pending = stats[stat_key]
+    _ensure_flusher()
+    return pending
+
+
+def add_activity(project_path: str, event_context: str, **amounts):
+    """Queue stat_logs activity (new_words=..., deleted_entities=..., ...) for an event context."""
+    unknown = set(amounts) - set(LOG_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown stat_logs columns: {sorted(unknown)}")
+    with _pending_lock:
+        log = _project_batch(project_path)["logs"].setdefault(event_context, {})
+        for column, amount in amounts.items():
+            if amount:
+                log[column] = log.get(column, 0) + amount
+    _ensure_flusher()
+
+
+def _requeue(project_path: str, batch: dict):
+    """Put a batch that failed to flush back in front of anything queued since."""
+    with _pending_lock:
+        current = _project_batch(project_path)
+        for key, inc in batch["stats"].items():
+            current["stats"][key] = current["stats"].get(key, 0) + inc
+        for context, amounts in batch["logs"].items():
+            log = current["logs"].setdefault(context, {})
+            for column, amount in amounts.items():
+                log[column] = log.get(column, 0) + amount
+
+
+def _open_log_for(conn, project_path: str, context: str, now: float):
+    """The stat_logs row activity for `context` should merge into, or None to start a new one."""
+    open_log = _open_logs.get((project_path, context))
+    if open_log is None:
+        # First flush for this context since startup: fall back to the latest row on disk
+        row = conn.execute("""
+            SELECT id, (julianday('now') - julianday(timestamp)) * 86400
+            FROM stat_logs
+            WHERE event_context = ?
+            ORDER BY timestamp DESC
+            LIMIT 1
+        """, (context,)).fetchone()
+        if row and row[1] is not None:
+            open_log = (row[0], now - row[1])
+    if open_log and now - open_log[1] < LOG_MERGE_WINDOW_S:
+        return open_log[0]
+    return None
+
+
+def _write_batch(project_path: str, batch: dict):
+    """Caller holds _flush_lock (for _open_logs)."""
+    db_path = os.path.join(project_path, "fleshnote.db")
+    if not os.path.exists(db_path):
+        # Project deleted or moved since the events were queued
+        return
+    conn = sqlite3.connect(db_path, timeout=10)
+    opened = {}
+    try:
+        with conn:
+            if batch["stats"]:
+                # Non-numeric values count as 0, so they are replaced by the increment
+                conn.executemany("""
+                    INSERT INTO stats (stat_key, stat_value) VALUES (?, ?)
+                    ON CONFLICT(stat_key) DO UPDATE
+                    SET stat_value = CAST(CAST(stat_value AS NUMERIC) + ? AS TEXT)
+                """, [(key, str(inc), inc) for key, inc in batch["stats"].items() if inc])
+
+            now = time.time()
+            for context, amounts in batch["logs"].items():
+                if not amounts:
+                    continue
+                columns = list(amounts)
+                log_id = _open_log_for(conn, project_path, context, now)
+                updated = 0
+                if log_id is not None:
+                    sets = ", ".join(f"{c} = IFNULL({c}, 0) + ?" for c in columns)
+                    updated = conn.execute(
+                        f"UPDATE stat_logs SET {sets}, timestamp = CURRENT_TIMESTAMP WHERE id = ?",
+                        [amounts[c] for c in columns] + [log_id],
+                    ).rowcount
+                if not updated:
+                    log_id = conn.execute(
+                        f"INSERT INTO stat_logs ({', '.join(columns)}, event_context) "
+                        f"VALUES ({', '.join('?' for _ in columns)}, ?)",
+                        [amounts[c] for c in columns] + [context],
+                    ).lastrowid
+                opened[(project_path, context)] = (log_id, now)
+    finally:
+        conn.close()
+    _open_logs.update(opened)
+
+
+def flush(project_path: str | None = None):
+    """Write pending increments for one project (or all of them) to disk."""
+    with _flush_lock:
+        with _pending_lock:
+            paths = [project_path] if project_path is not None else list(_pending)
+            batches = [(p, _pending.pop(p)) for p in paths if p in _pending]
+        for path, batch in batches:
+            try:
+                _write_batch(path, batch)
+            except Exception as e:
+                # Any failure, not just sqlite3.Error: the batch is already out of _pending
+                print(f"Stats flush for {path} failed, retrying later: {e}", flush=True)
+                _requeue(path, batch)
+
+
+atexit.register(flush)
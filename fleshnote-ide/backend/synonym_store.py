@@ -0,0 +1,462 @@
+"""
+FleshNote — Precomputed Synonym Store
+WordNet/OMW flattened once into a small SQLite file (synsets, per-language lemma
+names, the lemma -> synset index and the English exception lists), so synonym
+lookups never touch NLTK's lazy corpus reader. English inflections are resolved
+with the same morphy rules WordNet applies, so results match live lookups.
+
+The store is built in the background the first time WordNet data is available
+and lives next to the NLTK data (`synonyms.sqlite`). Until it is ready, and for
+story languages it was built without, `lookup_synonyms` returns None and callers
+fall back to live WordNet.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Bump when the schema or the grouping logic changes — older stores are rebuilt
+STORE_VERSION = 1
+STORE_FILENAME = "synonyms.sqlite"
+
+# OMW languages flattened alongside English (the app's story languages)
+EXTRA_LANGS = ("hun", "pol", "arb")
+
+# WordNet's POS order for synsets(lemma) with no pos filter
+POS_LIST = ("n", "v", "a", "r")
+
+LRU_SIZE = 4096
+
+_lru: OrderedDict = OrderedDict()
+_lru_lock = threading.Lock()
+
+_local = threading.local()
+_state_lock = threading.Lock()
+_store_path: str | None = None   # path of the store in use, once validated
+_store_meta: dict | None = None
+_build_thread: threading.Thread | None = None
+_use_bundled = True              # False once the bundled store predates data merged since
+_rebuild_requested = False
+
+# Every thread's read-only connection, so invalidate() can close them before removing the file
+_conns: set = set()
+_conns_lock = threading.Lock()
+
+
+# ── Locating / opening the store ─────────────────────────────────────────────
+
+def _candidate_paths() -> list[str]:
+    from nltk_manager import get_nltk_data_dir, _get_bundled_nltk_path
+    paths = [os.path.join(get_nltk_data_dir(), STORE_FILENAME)]
+    bundled = _get_bundled_nltk_path()
+    if bundled and _use_bundled:
+        paths.append(os.path.join(bundled, STORE_FILENAME))
+    return paths
+
+
+def _read_meta(path: str) -> dict | None:
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    if meta.get("store_version") != str(STORE_VERSION):
+        return None
+    return meta
+
+
+def _resolve_store() -> bool:
+    """Find a valid store on disk. True if one is ready for lookups."""
+    global _store_path, _store_meta
+    if _store_path:
+        return True
+    with _state_lock:
+        if _store_path:
+            return True
+        for path in _candidate_paths():
+            if os.path.exists(path):
+                meta = _read_meta(path)
+                if meta:
+                    _store_meta = {
+                        "langs": json.loads(meta["langs"]),
+                        "available_langs": json.loads(meta["available_langs"]),
+                        "substitutions": json.loads(meta["substitutions"]),
+                        "built_at": meta.get("built_at"),
+                    }
+                    _store_path = path
+                    return True
+    return False
+
+
+def _conn(path: str) -> sqlite3.Connection:
+    """Read-only connection to the store at path, one per thread."""
+    conn = getattr(_local, "conn", None)
+    with _conns_lock:
+        # invalidate() closes (and forgets) every thread's connection
+        live = conn is not None and conn in _conns
+    if not live or getattr(_local, "path", None) != path:
+        if live:
+            _close_conn(conn)
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        with _conns_lock:
+            _conns.add(conn)
+        _local.conn = conn
+        _local.path = path
+    return conn
+
+
+def _close_conn(conn: sqlite3.Connection):
+    with _conns_lock:
+        _conns.discard(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def invalidate():
+    """
+    Forget the current store (e.g. after new OMW data was merged), clear the LRU and
+    remove the user-dir store so the next ensure_store() rebuilds it there. The bundled
+    store predates the merged data too, so it isn't used again in this process.
+    """
+    global _store_path, _store_meta, _use_bundled
+    with _state_lock:
+        _store_path = None
+        _store_meta = None
+        _use_bundled = False
+    with _lru_lock:
+        _lru.clear()
+    # Open handles would keep Windows from removing the file; a lookup still using one
+    # fails with sqlite3.Error and falls back to live WordNet
+    with _conns_lock:
+        conns = list(_conns)
+    for conn in conns:
+        _close_conn(conn)
+    from nltk_manager import get_nltk_data_dir
+    path = os.path.join(get_nltk_data_dir(), STORE_FILENAME)
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Could not remove synonym store: {e}")
+
+
+def _rebuild_for_new_data():
+    """
+    The store in use was built before the data for a story language was on disk (e.g.
+    the bundled store, without the Hungarian data merged into the user dir later).
+    Rebuild it in the user dir, once per process, if that data is there now.
+    """
+    global _rebuild_requested
+    from nltk_manager import check_wordnet_complete
+    with _state_lock:
+        if _rebuild_requested or not check_wordnet_complete():
+            return
+        _rebuild_requested = True
+    invalidate()
+    ensure_store()
+
+
+# ── Building ─────────────────────────────────────────────────────────────────
+
+def _private_wordnet():
+    """
+    A WordNet reader for the build alone. The shared nltk.corpus.wordnet (lazy loader,
+    cached file handles) isn't thread-safe, and request threads keep using it for live
+    lookups while the store is built. Declared the way NLTK 3.9 declares its own, with
+    the omw-1.4 package nltk_manager downloads and merges Hungarian into.
+    """
+    from nltk.corpus.reader import CorpusReader
+    from nltk.corpus.reader.wordnet import WordNetCorpusReader
+    from nltk.corpus.util import LazyCorpusLoader
+    return LazyCorpusLoader(
+        "wordnet",
+        WordNetCorpusReader,
+        LazyCorpusLoader("omw-1.4", CorpusReader, r".*/wn-data-.*\.tab", encoding="utf8"),
+    )
+
+
+def build_store(out_path: str) -> dict:
+    """Flatten the WordNet data NLTK can see into a fresh store at out_path."""
+    from nltk.corpus.reader.wordnet import WordNetCorpusReader
+
+    wordnet = _private_wordnet()
+
+    started = time.time()
+    tmp_path = out_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE synsets (
+                id INTEGER PRIMARY KEY,
+                pos TEXT NOT NULL,
+                definition TEXT NOT NULL
+            );
+            CREATE TABLE synset_lemmas (
+                lang TEXT NOT NULL,
+                synset_id INTEGER NOT NULL,
+                ord INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (lang, synset_id, ord)
+            ) WITHOUT ROWID;
+            CREATE TABLE lemma_index (
+                lang TEXT NOT NULL,
+                word TEXT NOT NULL,
+                pos TEXT NOT NULL,
+                ord INTEGER NOT NULL,
+                synset_id INTEGER NOT NULL,
+                PRIMARY KEY (lang, word, pos, ord)
+            ) WITHOUT ROWID;
+            CREATE TABLE exceptions (
+                pos TEXT NOT NULL,
+                word TEXT NOT NULL,
+                ord INTEGER NOT NULL,
+                base TEXT NOT NULL,
+                PRIMARY KEY (word, pos, ord)
+            ) WITHOUT ROWID;
+        """)
+
+        # Synsets keyed by (data file, offset); satellites live in data.adj
+        ids: dict = {}
+
+        def synset_id(ss) -> int:
+            key = ("a" if ss.pos() == "s" else ss.pos(), ss.offset())
+            sid = ids.get(key)
+            if sid is None:
+                sid = ids[key] = len(ids) + 1
+                conn.execute(
+                    "INSERT INTO synsets (id, pos, definition) VALUES (?, ?, ?)",
+                    (sid, ss.pos(), ss.definition())
+                )
+                conn.executemany(
+                    "INSERT INTO synset_lemmas (lang, synset_id, ord, name) VALUES ('eng', ?, ?, ?)",
+                    [(sid, i, lemma.name()) for i, lemma in enumerate(ss.lemmas())]
+                )
+            return sid
+
+        for ss in wordnet.all_synsets():
+            synset_id(ss)
+
+        # English lemma index exactly as synsets() reads it, plus the exception lists
+        rows = []
+        for word, by_pos in wordnet._lemma_pos_offset_map.items():
+            for pos in POS_LIST:
+                for i, offset in enumerate(by_pos.get(pos, [])):
+                    rows.append(("eng", word, pos, i, ids[(pos, offset)]))
+        conn.executemany("INSERT INTO lemma_index VALUES (?, ?, ?, ?, ?)", rows)
+        exc_rows = []
+        for pos in POS_LIST:
+            for word, bases in wordnet._exception_map[pos].items():
+                exc_rows.extend((pos, word, i, base) for i, base in enumerate(bases))
+        conn.executemany("INSERT INTO exceptions VALUES (?, ?, ?, ?)", exc_rows)
+
+        try:
+            # OMW languages are registered lazily, on the first lookup in one of them
+            if hasattr(wordnet, "add_omw"):
+                wordnet.add_omw()
+            available = sorted(wordnet.langs())
+        except Exception:
+            available = ["eng"]
+        built = ["eng"]
+        for lang in EXTRA_LANGS:
+            if lang not in available:
+                continue
+            try:
+                lemma_rows, name_rows, named = [], [], set()
+                for word in wordnet.all_lemma_names(lang=lang):
+                    for i, ss in enumerate(wordnet.synsets(word, lang=lang)):
+                        sid = synset_id(ss)
+                        lemma_rows.append((lang, word, ss.pos(), i, sid))
+                        if sid not in named:
+                            named.add(sid)
+                            name_rows.extend(
+                                (lang, sid, j, name) for j, name in enumerate(ss.lemma_names(lang))
+                            )
+                conn.executemany("INSERT INTO lemma_index VALUES (?, ?, ?, ?, ?)", lemma_rows)
+                conn.executemany("INSERT INTO synset_lemmas VALUES (?, ?, ?, ?)", name_rows)
+                built.append(lang)
+            except Exception as e:
+                print(f"Synonym store: skipping '{lang}': {e}")
+
+        meta = {
+            "store_version": str(STORE_VERSION),
+            "langs": json.dumps(built),
+            "available_langs": json.dumps(available),
+            "substitutions": json.dumps({
+                pos: WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS[pos] for pos in POS_LIST
+            }),
+            "built_at": str(int(time.time())),
+        }
+        conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", meta.items())
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, out_path)
+    return {"langs": built, "synsets": len(ids), "seconds": round(time.time() - started, 1)}
+
+
+def _build_in_background():
+    global _build_thread
+    with _state_lock:
+        if _build_thread is not None and _build_thread.is_alive():
+            return
+
+        def run():
+            try:
+                from nltk_manager import ensure_wordnet_available, get_nltk_data_dir
+                if not ensure_wordnet_available():
+                    return
+                info = build_store(os.path.join(get_nltk_data_dir(), STORE_FILENAME))
+                print(f"Synonym store built: {info}")
+            except Exception as e:
+                print(f"Synonym store build failed: {e}")
+
+        _build_thread = threading.Thread(target=run, daemon=True)
+        _build_thread.start()
+
+
+def ensure_store() -> bool:
+    """True if the store is ready; otherwise start a background build when WordNet is on disk."""
+    if _resolve_store():
+        return True
+    from nltk_manager import check_wordnet_exists
+    if check_wordnet_exists():
+        _build_in_background()
+    return False
+
+
+# ── Lookups ──────────────────────────────────────────────────────────────────
+
+def _english_synset_ids(conn, word: str, substitutions: dict) -> list[int]:
+    """wordnet.synsets(word) against the store: WordNet's _morphy per POS, in one pass."""
+    exceptions: dict = {}
+    for pos, base in conn.execute(
+        "SELECT pos, base FROM exceptions WHERE word = ? ORDER BY pos, ord", (word,)
+    ):
+        exceptions.setdefault(pos, []).append(base)
+
+    # Candidate forms per POS: the exception list if there is one, else one round of suffix rules
+    candidates = {}
+    for pos in POS_LIST:
+        if pos in exceptions:
+            forms = exceptions[pos]
+        else:
+            forms = [
+                word[:-len(old)] + new
+                for old, new in substitutions[pos]
+                if word.endswith(old)
+            ]
+        candidates[pos] = list(dict.fromkeys([word] + forms))
+
+    all_forms = sorted({f for forms in candidates.values() for f in forms})
+    index: dict = {}
+    for form, pos, sid in conn.execute(
+        f"SELECT word, pos, synset_id FROM lemma_index WHERE lang = 'eng' AND word IN ({','.join('?' * len(all_forms))})"
+        " ORDER BY word, pos, ord",
+        all_forms
+    ):
+        index.setdefault((form, pos), []).append(sid)
+
+    ids = []
+    for pos in POS_LIST:
+        for form in candidates[pos]:
+            ids.extend(index.get((form, pos), ()))
+    return ids
+
+
+def _groups(conn, meta: dict, word: str, lang: str) -> list:
+    """Same grouping as nltk_manager._lookup_synsets, read from the store."""
+    if lang == "eng":
+        synset_ids = _english_synset_ids(conn, word, meta["substitutions"])
+    else:
+        synset_ids = [r[0] for r in conn.execute(
+            "SELECT synset_id FROM lemma_index WHERE lang = ? AND word = ? ORDER BY ord", (lang, word)
+        )]
+    if not synset_ids:
+        return []
+
+    unique_ids = sorted(set(synset_ids))
+    placeholders = ",".join("?" * len(unique_ids))
+    info = {
+        sid: (pos, definition)
+        for sid, pos, definition in conn.execute(
+            f"SELECT id, pos, definition FROM synsets WHERE id IN ({placeholders})", unique_ids
+        )
+    }
+    names: dict = {}
+    for sid, name in conn.execute(
+        f"SELECT synset_id, name FROM synset_lemmas WHERE lang = ? AND synset_id IN ({placeholders})"
+        " ORDER BY synset_id, ord",
+        [lang] + unique_ids
+    ):
+        names.setdefault(sid, []).append(name.replace("_", " "))
+
+    results = []
+    seen_words = {word.lower()}
+    for sid in synset_ids:
+        unique = []
+        for w in names.get(sid, ()):
+            if w.lower() not in seen_words:
+                seen_words.add(w.lower())
+                unique.append(w)
+        if unique:
+            pos, definition = info[sid]
+            results.append({"definition": definition, "pos": pos, "synonyms": unique})
+    return results
+
+
+def lookup_synonyms(word: str, lang: str = "eng") -> list | None:
+    """
+    Grouped synonyms for `word` (same shape and fallback-to-English behaviour as
+    nltk_manager.get_synonyms), or None when the store can't answer yet.
+    """
+    if not ensure_store():
+        return None
+    # invalidate() may reset the store from another thread at any point
+    with _state_lock:
+        path, meta = _store_path, _store_meta
+    if meta is None:
+        return None
+    if lang != "eng" and lang not in meta["langs"]:
+        if lang in EXTRA_LANGS:
+            # A story language the store was built without: answer live (which can still
+            # fetch and merge its data), and rebuild if the data appeared since the build
+            if lang not in meta["available_langs"]:
+                _rebuild_for_new_data()
+            return None
+        if lang in meta["available_langs"]:
+            # OMW has this language but the store was built without it
+            return None
+
+    word_clean = word.strip().lower()
+    key = (path, word_clean, lang)
+    with _lru_lock:
+        cached = _lru.get(key)
+        if cached is not None:
+            _lru.move_to_end(key)
+    if cached is None:
+        try:
+            conn = _conn(path)
+            # Languages WordNet doesn't know yield nothing, then fall back to English
+            cached = _groups(conn, meta, word_clean, lang) if lang in meta["langs"] else []
+            if not cached and lang != "eng":
+                cached = _groups(conn, meta, word_clean, "eng")
+        except sqlite3.Error:
+            return None
+        with _lru_lock:
+            _lru[key] = cached
+            while len(_lru) > LRU_SIZE:
+                _lru.popitem(last=False)
+    # Hand out copies so callers can't mutate the cached groups
+    return [dict(g, synonyms=list(g["synonyms"])) for g in cached]
@@ -140,6 +140,43 @@ async function backendPost(path: string, body: object) {
   return data
 }
 
+const IMPORT_JOB_POLL_MS = 500
+
+// Runs an import as a backend job (POST /api/project/import/jobs/start), polling its status
+// and forwarding it to the renderer as 'import-job-progress' until it finishes. Resolves
+// with the same response the synchronous import endpoint returns.
+async function runImportJob(event: Electron.IpcMainInvokeEvent, kind: string, payload) {
+  const { project_path, ...rest } = payload
+  const started = await backendPost('/api/project/import/jobs/start', {
+    project_path,
+    kind,
+    payload: rest
+  })
+  if (started.status !== 'ok') throw new Error(started.error || `Could not start import job: ${kind}`)
+
+  let job = started.job
+  event.sender.send('import-job-progress', job)
+  while (job.state === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, IMPORT_JOB_POLL_MS))
+    const status = await backendPost('/api/project/import/jobs/status', {
+      project_path,
+      job_id: job.job_id
+    })
+    if (status.status !== 'ok') throw new Error(status.error || 'Lost track of import job')
+    job = status.job
+    if (!event.sender.isDestroyed()) event.sender.send('import-job-progress', job)
+  }
+
+  if (job.state === 'cancelled') throw new Error('Import cancelled')
+  if (job.state !== 'done') throw new Error(job.error || `Import job ${job.state}`)
+  const result = await backendPost('/api/project/import/jobs/result', {
+    project_path,
+    job_id: job.job_id
+  })
+  if (result.status !== 'ok') throw new Error(result.error || 'Could not read import job result')
+  return result.result
+}
+
 // ── Window ───────────────────────────────────────────────────────────────────
 
 function createWindow(): void {
@@ -327,8 +364,8 @@ app.whenReady().then(async () => {
     return await backendPost('/api/project/load', { project_path: projectPath })
   })
 
-  ipcMain.handle('api:getStats', async (_event, projectPath) => {
-    return await backendPost('/api/project/stats', { project_path: projectPath })
+  ipcMain.handle('api:getStats', async (_event, projectPath, options = {}) => {
+    return await backendPost('/api/project/stats', { project_path: projectPath, ...options })
   })
 
   ipcMain.handle('api:getAchievements', async (_event, projectPath) => {
@@ -767,12 +804,12 @@ app.whenReady().then(async () => {
   })
 
   // ── Import ─────────────────────────────────────────
-  ipcMain.handle('api:importSplitPreview', async (_event, payload) => {
-    return await backendPost('/api/project/import/split-preview', payload)
+  ipcMain.handle('api:importSplitPreview', async (event, payload) => {
+    return await runImportJob(event, 'split_preview', payload)
   })
 
-  ipcMain.handle('api:importConfirmSplits', async (_event, payload) => {
-    return await backendPost('/api/project/import/confirm-splits', payload)
+  ipcMain.handle('api:importConfirmSplits', async (event, payload) => {
+    return await runImportJob(event, 'confirm_splits', payload)
   })
 
   ipcMain.handle('api:importNerExtract', async (_event, payload) => {
@@ -780,12 +817,12 @@ app.whenReady().then(async () => {
     return await backendPost('/api/project/import/ner-extract', payload)
   })
 
-  ipcMain.handle('api:importNerAnalyze', async (_event, payload) => {
-    return await backendPost('/api/project/import/ner-analyze', payload)
+  ipcMain.handle('api:importNerAnalyze', async (event, payload) => {
+    return await runImportJob(event, 'ner_analyze', payload)
   })
 
-  ipcMain.handle('api:importBulkCreateEntities', async (_event, payload) => {
-    return await backendPost('/api/project/import/bulk-create-entities', payload)
+  ipcMain.handle('api:importBulkCreateEntities', async (event, payload) => {
+    return await runImportJob(event, 'bulk_create_entities', payload)
   })
 
   ipcMain.handle('api:importExternalEntities', async (_event, payload) => {
@@ -796,6 +833,22 @@ app.whenReady().then(async () => {
     return await backendPost('/api/project/import/external-entities-confirm', payload)
   })
 
+  ipcMain.handle('api:importJobStatus', async (_event, payload) => {
+    return await backendPost('/api/project/import/jobs/status', payload)
+  })
+
+  ipcMain.handle('api:importJobCancel', async (_event, payload) => {
+    return await backendPost('/api/project/import/jobs/cancel', payload)
+  })
+
+  ipcMain.handle('api:importJobResult', async (_event, payload) => {
+    return await backendPost('/api/project/import/jobs/result', payload)
+  })
+
+  ipcMain.handle('api:importJobList', async (_event, payload) => {
+    return await backendPost('/api/project/import/jobs/list', payload)
+  })
+
   // ── NLP Configuration ──────────────────────────────
   ipcMain.handle('api:checkNlpModel', async (_event, langCode) => {
     return await backendPost('/api/settings/check-model', { lang_code: langCode })
@@ -805,6 +858,18 @@ app.whenReady().then(async () => {
     return await backendPost('/api/nlp/load', { language })
   })
 
+  ipcMain.handle('api:unloadNlpModel', async (_event, language) => {
+    return await backendPost('/api/nlp/unload', { language })
+  })
+
+  ipcMain.handle('api:getNlpModels', async (_event, payload) => {
+    return await backendPost('/api/nlp/models', payload || {})
+  })
+
+  ipcMain.handle('api:nlpWarmupStatus', async (_event, language) => {
+    return await backendPost('/api/nlp/warmup-status', { language })
+  })
+
   // ── Synonyms ────────────────────────────────────────
   ipcMain.handle('api:synonymLookup', async (_event, payload) => {
     return await backendPost('/api/synonyms/lookup', payload)
@@ -823,6 +888,10 @@ app.whenReady().then(async () => {
     return await backendPost('/api/project/spellcheck', payload)
   })
 
+  ipcMain.handle('api:spellCheckBatch', async (_event, payload) => {
+    return await backendPost('/api/project/spellcheck/batch', payload)
+  })
+
   ipcMain.handle('api:spellCheckIgnore', async (_event, payload) => {
     return await backendPost('/api/project/spellcheck/ignore', payload)
   })
@@ -834,6 +903,50 @@ app.whenReady().then(async () => {
   ipcMain.handle('api:janitorSensesOverview', async (_event, payload) => {
     return await backendPost('/api/project/janitor/senses-overview', payload)
   })
+  ipcMain.handle('api:janitorBatchStart', async (_event, payload) => {
+    return await backendPost('/api/project/janitor/batch/start', payload)
+  })
+  ipcMain.handle('api:janitorBatchStatus', async (_event, payload) => {
+    return await backendPost('/api/project/janitor/batch/status', payload)
+  })
+  ipcMain.handle('api:janitorBatchResults', async (_event, payload) => {
+    return await backendPost('/api/project/janitor/batch/results', payload)
+  })
+  // Streams NDJSON analyzer results to the renderer as 'janitor-stream' events, tagged with
+  // the caller's request_id; resolves with the final summary line once every analyzer has finished.
+  ipcMain.handle('api:janitorAnalyzeStream', async (event, payload) => {
+    const { request_id, ...body } = payload
+    const response = await fetch(`${BACKEND_URL}/api/project/janitor/analyze-stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    })
+    if (!response.ok || !response.body) throw new Error('Backend error: /api/project/janitor/analyze-stream')
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let summary = null
+    for (;;) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      let newline = buffer.indexOf('\n')
+      while (newline !== -1) {
+        const line = buffer.slice(0, newline).trim()
+        buffer = buffer.slice(newline + 1)
+        newline = buffer.indexOf('\n')
+        if (!line) continue
+        const message = JSON.parse(line)
+        if (message.done || message.status === 'error') summary = message
+        else if (!event.sender.isDestroyed()) {
+          event.sender.send('janitor-stream', { request_id, chapter_id: body.chapter_id, ...message })
+        }
+      }
+    }
+    // A request rejected up front is a plain JSON body without a trailing newline
+    if (buffer.trim()) summary = JSON.parse(buffer)
+    return summary
+  })
 
   // ── Auto Updater ───────────────────────────────────
   ipcMain.handle('api:checkForUpdates', () => {
@@ -901,19 +1014,38 @@ app.whenReady().then(async () => {
   })
 })
 
-app.on('window-all-closed', () => {
+// Stat counters and activity logs are written behind by the backend (stats_aggregator.py);
+// ask it to flush before the hard kill, but never hold up quitting for long
+async function flushBackendStats(): Promise<void> {
+  try {
+    await Promise.race([
+      backendPost('/api/stats/flush', {}),
+      new Promise((resolve) => setTimeout(resolve, 1500))
+    ])
+  } catch {
+    // Backend already gone; nothing to flush
+  }
+}
+
+app.on('window-all-closed', async () => {
   if (process.platform !== 'darwin') {
     if (pythonProcess) {
-      pythonProcess.kill('SIGKILL')
+      await flushBackendStats()
+      pythonProcess?.kill('SIGKILL')
       pythonProcess = null
     }
     app.quit()
   }
 })
 
-app.on('will-quit', () => {
+app.on('will-quit', (event) => {
   if (pythonProcess) {
-    pythonProcess.kill('SIGKILL')
-    pythonProcess = null
+    // macOS path (window-all-closed doesn't stop the backend there): flush, then quit again
+    event.preventDefault()
+    flushBackendStats().finally(() => {
+      pythonProcess?.kill('SIGKILL')
+      pythonProcess = null
+      app.quit()
+    })
   }
 })
@@ -14,7 +14,7 @@ const api = {
   updateProjectConfig: (projectPath, key, value, type) =>
     ipcRenderer.invoke('api:updateProjectConfig', { project_path: projectPath, config_key: key, config_value: value, config_type: type }),
   loadProject: (projectPath) => ipcRenderer.invoke('api:loadProject', projectPath),
-  getStats: (projectPath) => ipcRenderer.invoke('api:getStats', projectPath),
+  getStats: (projectPath, options) => ipcRenderer.invoke('api:getStats', projectPath, options),
   getAchievements: (projectPath) => ipcRenderer.invoke('api:getAchievements', projectPath),
   updateStat: (payload) => ipcRenderer.invoke('api:updateStat', payload),
   deleteProject: (projectPath) => ipcRenderer.invoke('api:deleteProject', projectPath),
@@ -179,10 +179,22 @@ const api = {
   importBulkCreateEntities: (payload) => ipcRenderer.invoke('api:importBulkCreateEntities', payload),
   importExternalEntities: (payload) => ipcRenderer.invoke('api:importExternalEntities', payload),
   importExternalEntitiesConfirm: (payload) => ipcRenderer.invoke('api:importExternalEntitiesConfirm', payload),
+  importJobStatus: (payload) => ipcRenderer.invoke('api:importJobStatus', payload),
+  importJobCancel: (payload) => ipcRenderer.invoke('api:importJobCancel', payload),
+  importJobResult: (payload) => ipcRenderer.invoke('api:importJobResult', payload),
+  importJobList: (payload) => ipcRenderer.invoke('api:importJobList', payload),
+  onImportJobProgress: (callback) => {
+    const listener = (_event, value) => callback(value)
+    ipcRenderer.on('import-job-progress', listener)
+    return () => ipcRenderer.removeListener('import-job-progress', listener)
+  },
 
   // ── NLP Configuration ──────────────────────────────
   checkNlpModel: (langCode) => ipcRenderer.invoke('api:checkNlpModel', langCode),
   loadNlpModel: (language) => ipcRenderer.invoke('api:loadNlpModel', language),
+  unloadNlpModel: (language) => ipcRenderer.invoke('api:unloadNlpModel', language),
+  getNlpModels: (payload) => ipcRenderer.invoke('api:getNlpModels', payload),
+  nlpWarmupStatus: (language) => ipcRenderer.invoke('api:nlpWarmupStatus', language),
   onDownloadProgress: (callback) => {
     const listener = (_event, value) => callback(value)
     ipcRenderer.on('language-download-progress', listener)
@@ -192,12 +204,22 @@ const api = {
   // ── Janitor ────────────────────────────────────────
   janitorAnalyze: (payload) => ipcRenderer.invoke('api:janitorAnalyze', payload),
   janitorSensesOverview: (payload) => ipcRenderer.invoke('api:janitorSensesOverview', payload),
+  janitorBatchStart: (payload) => ipcRenderer.invoke('api:janitorBatchStart', payload),
+  janitorBatchStatus: (payload) => ipcRenderer.invoke('api:janitorBatchStatus', payload),
+  janitorBatchResults: (payload) => ipcRenderer.invoke('api:janitorBatchResults', payload),
+  janitorAnalyzeStream: (payload) => ipcRenderer.invoke('api:janitorAnalyzeStream', payload),
+  onJanitorStream: (callback) => {
+    const listener = (_event, value) => callback(value)
+    ipcRenderer.on('janitor-stream', listener)
+    return () => ipcRenderer.removeListener('janitor-stream', listener)
+  },
 
   // ── Synonyms ──────────────────────────────────────
   synonymLookup: (payload) => ipcRenderer.invoke('api:synonymLookup', payload),
   checkWordnetData: () => ipcRenderer.invoke('api:checkWordnetData'),
   ensureWordnetData: () => ipcRenderer.invoke('api:ensureWordnetData'),
   spellCheck: (payload) => ipcRenderer.invoke('api:spellCheck', payload),
+  spellCheckBatch: (payload) => ipcRenderer.invoke('api:spellCheckBatch', payload),
   spellCheckIgnore: (payload) => ipcRenderer.invoke('api:spellCheckIgnore', payload),
 
   // ── Auto Updater ───────────────────────────────────
@@ -627,6 +627,7 @@ function FocusView({
 }
 
 import EntityExtractorLoading from './EntityExtractorLoading'
+import ImportJobProgress, { isImportCancelled, useImportJobProgress } from './ImportJobProgress'
 
 // ─── MAIN COMPONENT ─────────────────────────────────────
 
@@ -641,6 +642,8 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
   const [entityEdits, setEntityEdits] = useState({})
   const [lowConfCollapsed, setLowConfCollapsed] = useState(false)
   const [errorMsg, setErrorMsg] = useState('')
+  const [analyzeJob, setAnalyzeJob] = useImportJobProgress('ner_analyze')
+  const [createJob, setCreateJob] = useImportJobProgress('bulk_create_entities')
 
   // Feature 2: mutable lore categories
   const parsedLoreCategories = useMemo(() => {
@@ -674,6 +677,7 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
   const runAnalysis = async (texts) => {
     setPhase('analyzing')
     setErrorMsg('')
+    setAnalyzeJob(null)
 
     try {
       const payload = {
@@ -711,6 +715,11 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
       setEntityEdits(edits)
       setPhase('review')
     } catch (err) {
+      if (isImportCancelled(err)) {
+        if (chapterTexts) onBack()
+        else setPhase('input')
+        return
+      }
       console.error('NER analysis failed:', err)
       setErrorMsg(err.message || t('extractor.errorAnalysis'))
       setPhase('error')
@@ -968,6 +977,7 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
     }
 
     setPhase('creating')
+    setCreateJob(null)
 
     try {
       await window.api.importBulkCreateEntities({
@@ -976,6 +986,10 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
       })
       onDone()
     } catch (err) {
+      if (isImportCancelled(err)) {
+        setPhase('review')
+        return
+      }
       console.error('Bulk create failed:', err)
       setErrorMsg(err.message || t('extractor.errorCreate'))
       setPhase('error')
@@ -1060,6 +1074,7 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
               : t('extractor.analyzingText')
           }
         />
+        <ImportJobProgress projectPath={projectPath} job={analyzeJob} />
       </div>
     )
   }
@@ -1096,6 +1111,7 @@ export default function EntityExtractor({ projectPath, projectConfig, onDone, on
     return (
       <div className="ner-container">
         <EntityExtractorLoading subtitle={t('extractor.creating')} />
+        <ImportJobProgress projectPath={projectPath} job={createJob} />
       </div>
     )
   }
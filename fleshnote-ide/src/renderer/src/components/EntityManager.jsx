@@ -571,13 +571,14 @@ export default function EntityManager({ entities, characters, chapters, projectP
             ]);
             setTwists(twistsRes.twists || []);
             setTodos(todosRes.todos || []);
-            if (statsRes?.entity_mentions && Array.isArray(statsRes.entity_mentions)) {
+            if (statsRes?.mention_density && Array.isArray(statsRes.mention_density)) {
                 const countMap = {};
                 const firstMap = {};
-                statsRes.entity_mentions.forEach(m => {
+                // Rows are ordered by chapter, so the first row per entity is its first appearance
+                statsRes.mention_density.forEach(m => {
                     const k = `${m.entity_type}-${m.entity_id}`;
-                    countMap[k] = (countMap[k] || 0) + 1;
-                    if (!firstMap[k]) firstMap[k] = { chapter_id: m.chapter_id, word_offset: m.word_offset };
+                    countMap[k] = (countMap[k] || 0) + m.mentions;
+                    if (!firstMap[k]) firstMap[k] = { chapter_id: m.chapter_id, word_offset: m.first_offset };
                 });
                 setMentionsInfo(countMap);
                 setFirstAppearanceMap(firstMap);
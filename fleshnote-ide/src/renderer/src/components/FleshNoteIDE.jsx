@@ -20,6 +20,12 @@ import JanitorPanel from './JanitorPanel'
 import changelogData from '../changelog.json'
 import WelcomeBackPrompt from './WelcomeBackPrompt'
 
+// Order the Janitor panel lists suggestions in (ANALYZER_ORDER in backend/routes/janitor.py)
+const JANITOR_ANALYZER_ORDER = [
+  'link_existing', 'create_entity', 'alias', 'typo', 'synonym', 'weak_adverbs',
+  'passive_voice', 'show_dont_tell', 'pacing', 'five_senses', 'readability',
+]
+
 // ─── ICONS ──────────────────────────────────────────────────────────────────
 
 const Icons = {
@@ -276,6 +282,7 @@ export default function FleshNoteIDE({ projectConfig, projectPath, onCloseProjec
   const [janitorFocusSignal, setJanitorFocusSignal] = useState(0)
   const janitorActionsRef = useRef(null)
   const lastAnalyzedHtmlRef = useRef('')
+  const janitorRunRef = useRef(null) // { id, chapterId, dismissKey, byAnalyzer } of the streamed analysis
 
   // ── IDE-level configurable hotkeys ────────────────
   const [ideHotkeys, setIdeHotkeys] = useState({ janitor_open: 'Alt+j', focus_normal: 'Alt+f' })
@@ -622,32 +629,59 @@ export default function FleshNoteIDE({ projectConfig, projectPath, onCloseProjec
       return
     }
 
+    // Models are still warming up in the background after project open — check back shortly
+    const warmup = await window.api.nlpWarmupStatus?.(projectConfig?.story_language || 'en')
+    if (warmup?.scheduled && !warmup.ready) {
+      if (janitorPendingRetryRef.current) clearTimeout(janitorPendingRetryRef.current)
+      janitorPendingRetryRef.current = setTimeout(() => triggerJanitorAnalysis(), 3000)
+      return
+    }
+
     const htmlToAnalyze = chapterContent.content
+    const previous = janitorRunRef.current
+    const run = {
+      id: `${activeChapter.id}-${Date.now()}`,
+      chapterId: activeChapter.id,
+      dismissKey: `fn_janitor_dismissed_${btoa(projectPath.slice(-20))}_${activeChapter.id}`,
+      // Each analyzer's earlier results stay up until its fresh ones stream in
+      byAnalyzer: previous?.chapterId === activeChapter.id ? { ...previous.byAnalyzer } : {},
+    }
+    janitorRunRef.current = run
     setJanitorLoading(true)
     try {
-      const result = await window.api.janitorAnalyze({
+      // Suggestions arrive per analyzer as 'janitor-stream' events (see the listener below);
+      // the call itself resolves with the summary line once all analyzers are done
+      const summary = await window.api.janitorAnalyzeStream({
+        request_id: run.id,
         project_path: projectPath,
         chapter_id: activeChapter.id,
         html: htmlToAnalyze,
         language: projectConfig?.story_language || 'en',
         confidence_threshold: projectConfig?.janitor_sdt_confidence ?? 0.5,
       })
-      if (result?.status === 'ok') {
-        lastAnalyzedHtmlRef.current = htmlToAnalyze
-        // Filter out already-dismissed suggestions so badge count matches panel count
-        const dismissKey = `fn_janitor_dismissed_${btoa(projectPath.slice(-20))}_${activeChapter.id}`
-        const dismissed = new Set(
-          JSON.parse(localStorage.getItem(dismissKey) || '[]').map(i => i.id)
-        )
-        setJanitorSuggestions((result.suggestions || []).filter(s => !dismissed.has(s.id)))
-      }
+      if (janitorRunRef.current !== run) return
+      if (summary?.done) lastAnalyzedHtmlRef.current = htmlToAnalyze
+      else console.error('Janitor analysis failed:', summary?.error)
     } catch (err) {
       console.error('Janitor analysis failed:', err)
     } finally {
-      setJanitorLoading(false)
+      if (janitorRunRef.current === run) setJanitorLoading(false)
     }
   }, [focusMode, activeChapter, projectPath, chapterContent, mainView, projectConfig])
 
+  useEffect(() => window.api.onJanitorStream((message) => {
+    const run = janitorRunRef.current
+    if (!run || message.request_id !== run.id) return
+    run.byAnalyzer[message.analyzer] = message.suggestions || []
+    // Filter out already-dismissed suggestions so badge count matches panel count
+    const dismissed = new Set(
+      JSON.parse(localStorage.getItem(run.dismissKey) || '[]').map(i => i.id)
+    )
+    setJanitorSuggestions(
+      JANITOR_ANALYZER_ORDER.flatMap(name => run.byAnalyzer[name] || []).filter(s => !dismissed.has(s.id))
+    )
+  }), [])
+
   const handleJanitorDismiss = useCallback((suggestion) => {
     if (!projectPath || !activeChapter) return
     const key = `fn_janitor_dismissed_${btoa(projectPath.slice(-20))}_${activeChapter.id}`
@@ -713,6 +747,7 @@ export default function FleshNoteIDE({ projectConfig, projectPath, onCloseProjec
 
   // Clear janitor on chapter change or focus mode entry
   useEffect(() => {
+    janitorRunRef.current = null
     setJanitorSuggestions([])
     setJanitorLoading(false)
     lastAnalyzedHtmlRef.current = ''
@@ -720,6 +755,7 @@ export default function FleshNoteIDE({ projectConfig, projectPath, onCloseProjec
 
   useEffect(() => {
     if (focusMode) {
+      janitorRunRef.current = null
       setJanitorSuggestions([])
       setJanitorLoading(false)
     }
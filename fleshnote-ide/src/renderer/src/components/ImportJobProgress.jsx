@@ -0,0 +1,105 @@
+import { useEffect, useState } from 'react'
+import { useTranslation } from 'react-i18next'
+
+const IMPORT_JOB_POLL_MS = 500
+
+// A cancelled job makes its import call reject with this message (see runImportJob in src/main)
+export const isImportCancelled = (err) => String(err?.message || err).includes('Import cancelled')
+
+// Latest 'import-job-progress' update for one job kind, forwarded by the main process
+// while an import call (importSplitPreview, importConfirmSplits, ...) is running
+export function useImportJobProgress(kind) {
+  const [job, setJob] = useState(null)
+  useEffect(
+    () => window.api.onImportJobProgress((update) => {
+      if (update.kind === kind) setJob(update)
+    }),
+    [kind]
+  )
+  return [job, setJob]
+}
+
+// Follow a job this window didn't start (e.g. one still running after a reload) until it
+// finishes, then resolve with its result, the same way runImportJob does in the main process
+export async function waitForImportJob(projectPath, job, onUpdate) {
+  while (job.state === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, IMPORT_JOB_POLL_MS))
+    const status = await window.api.importJobStatus({ project_path: projectPath, job_id: job.job_id })
+    if (status.status !== 'ok') throw new Error(status.error || 'Lost track of import job')
+    job = status.job
+    onUpdate(job)
+  }
+
+  if (job.state === 'cancelled') throw new Error('Import cancelled')
+  if (job.state !== 'done') throw new Error(job.error || `Import job ${job.state}`)
+  const result = await window.api.importJobResult({ project_path: projectPath, job_id: job.job_id })
+  if (result.status !== 'ok') throw new Error(result.error || 'Could not read import job result')
+  return result.result
+}
+
+const formatAmount = (value, unit) =>
+  unit === 'bytes' ? `${(value / 1e6).toFixed(1)} MB` : value.toLocaleString()
+
+const formatDuration = (ms) => {
+  const seconds = Math.max(1, Math.round(ms / 1000))
+  return seconds < 60 ? `${seconds}s` : `${Math.floor(seconds / 60)}m ${seconds % 60}s`
+}
+
+export default function ImportJobProgress({ projectPath, job }) {
+  const { t } = useTranslation()
+  const [cancelling, setCancelling] = useState(false)
+
+  useEffect(() => setCancelling(false), [job?.job_id])
+
+  if (!job) return null
+
+  const running = job.state === 'running'
+  const percent = job.total ? Math.min(100, (job.processed / job.total) * 100) : null
+
+  const handleCancel = async () => {
+    setCancelling(true)
+    try {
+      await window.api.importJobCancel({ project_path: projectPath, job_id: job.job_id })
+    } catch (err) {
+      console.error('Cancelling import job failed:', err)
+      setCancelling(false)
+    }
+  }
+
+  return (
+    <div className="import-job-progress">
+      <div className="import-job-progress-header">
+        <span className="import-job-progress-stage">
+          {t(`importJob.stage.${job.stage}`, job.stage)}
+        </span>
+        {job.unit && (
+          <span className="import-job-progress-count">
+            {job.total
+              ? `${formatAmount(job.processed, job.unit)} / ${formatAmount(job.total, job.unit)}`
+              : formatAmount(job.processed, job.unit)}
+            {' '}
+            {t(`importJob.unit.${job.unit}`, job.unit)}
+          </span>
+        )}
+        {job.eta_ms != null && (
+          <span className="import-job-progress-eta">
+            {t('importJob.eta', '~{{time}} left', { time: formatDuration(job.eta_ms) })}
+          </span>
+        )}
+        <button
+          className="import-btn secondary"
+          onClick={handleCancel}
+          disabled={!running || cancelling || job.stage === 'cancelling'}
+        >
+          {t('importJob.cancel', 'Cancel')}
+        </button>
+      </div>
+      <div className="import-job-progress-track">
+        <div
+          className={`import-job-progress-fill${percent === null ? ' indeterminate' : ''}`}
+          style={percent === null ? undefined : { width: `${percent}%` }}
+        />
+      </div>
+    </div>
+  )
+}
@@ -1,5 +1,6 @@
-import React, { useState, useRef } from 'react'
+import React, { useState, useRef, useEffect } from 'react'
 import { useTranslation } from 'react-i18next'
+import ImportJobProgress, { isImportCancelled, useImportJobProgress, waitForImportJob } from './ImportJobProgress'
 
 const Icons = {
   Upload: () => (
@@ -54,6 +55,9 @@ export default function ImportManuscript({ projectPath, splits, setSplits, onCan
   const { t } = useTranslation()
   const [importFile, setImportFile] = useState(null)
   const [importLoading, setImportLoading] = useState(false)
+  const [previewJob, setPreviewJob] = useImportJobProgress('split_preview')
+  const [confirmJob] = useImportJobProgress('confirm_splits')
+  const [restorableJob, setRestorableJob] = useState(null)
   
   // Edit split state
   const [editingIndex, setEditingIndex] = useState(null)
@@ -61,6 +65,44 @@ export default function ImportManuscript({ projectPath, splits, setSplits, onCan
   const [editContent, setEditContent] = useState("")
   const contentRef = useRef(null)
 
+  const loadPreview = async (load) => {
+    setRestorableJob(null)
+    setImportLoading(true)
+    try {
+      const result = await load()
+      const newSplits = result.splits || []
+      setSplits((prev) => [...prev, ...newSplits])
+    } catch (err) {
+      if (!isImportCancelled(err)) {
+        console.error('Split preview failed:', err)
+        alert('Failed to parse file: ' + err.message)
+      }
+    } finally {
+      setImportLoading(false)
+    }
+  }
+
+  const loadPreviewJob = (job) => {
+    setPreviewJob(job)
+    return loadPreview(() => waitForImportJob(projectPath, job, setPreviewJob))
+  }
+
+  // A split preview that was still running when the window reloaded is followed again;
+  // a finished one that was never confirmed can be restored instead of re-reading the file
+  useEffect(() => {
+    let active = true
+    window.api.importJobList({ project_path: projectPath })
+      .then((data) => {
+        if (!active) return
+        const latest = (data.jobs || []).find((j) => j.kind === 'split_preview' || j.kind === 'confirm_splits')
+        if (latest?.kind !== 'split_preview') return
+        if (latest.state === 'running') loadPreviewJob(latest)
+        else if (latest.state === 'done') setRestorableJob(latest)
+      })
+      .catch((err) => console.error('Listing import jobs failed:', err))
+    return () => { active = false }
+  }, [projectPath])
+
   const handleSelectFile = async () => {
     const filePath = await window.api.openFile([
       { name: 'Manuscripts', extensions: ['txt', 'md', 'docx'] },
@@ -68,20 +110,11 @@ export default function ImportManuscript({ projectPath, splits, setSplits, onCan
     ])
     if (filePath) {
       setImportFile(filePath)
-      setImportLoading(true)
-      try {
-        const result = await window.api.importSplitPreview({
-          project_path: projectPath,
-          file_path: filePath
-        })
-        const newSplits = result.splits || []
-        setSplits((prev) => [...prev, ...newSplits])
-      } catch (err) {
-        console.error('Split preview failed:', err)
-        alert('Failed to parse file: ' + err.message)
-      } finally {
-        setImportLoading(false)
-      }
+      setPreviewJob(null)
+      await loadPreview(() => window.api.importSplitPreview({
+        project_path: projectPath,
+        file_path: filePath
+      }))
     }
   }
 
@@ -236,18 +269,31 @@ export default function ImportManuscript({ projectPath, splits, setSplits, onCan
         </div>
       )}
 
-      {importLoading && (
-        <div
-          style={{
-            textAlign: 'center',
-            padding: 32,
-            color: 'var(--accent-amber)',
-            fontFamily: 'var(--font-mono)',
-            fontSize: 12
-          }}
+      {restorableJob && splits.length === 0 && !importLoading && (
+        <button
+          className="setup-btn secondary"
+          onClick={() => loadPreviewJob(restorableJob)}
+          style={{ marginBottom: 16 }}
         >
-          {t('setup.analyzingFile', 'Analyzing file and detecting chapters...')}
-        </div>
+          {t('importJob.restorePreview', 'Restore the last unconfirmed split preview')}
+        </button>
+      )}
+
+      {importLoading && (
+        <>
+          <div
+            style={{
+              textAlign: 'center',
+              padding: 32,
+              color: 'var(--accent-amber)',
+              fontFamily: 'var(--font-mono)',
+              fontSize: 12
+            }}
+          >
+            {t('setup.analyzingFile', 'Analyzing file and detecting chapters...')}
+          </div>
+          <ImportJobProgress projectPath={projectPath} job={previewJob} />
+        </>
       )}
 
       {splits.length > 0 && !importLoading && (
@@ -303,6 +349,12 @@ export default function ImportManuscript({ projectPath, splits, setSplits, onCan
         </>
       )}
 
+      {loading && confirmJob?.state === 'running' && (
+        <div style={{ marginTop: 24 }}>
+          <ImportJobProgress projectPath={projectPath} job={confirmJob} />
+        </div>
+      )}
+
       <div style={{ display: 'flex', gap: 12, marginTop: 32 }}>
         <button
           className="setup-btn secondary"
@@ -1,6 +1,7 @@
 import { useState, useCallback } from 'react'
 import { useTranslation } from 'react-i18next'
 import ImportManuscript from './ImportManuscript'
+import { isImportCancelled } from './ImportJobProgress'
 import EntityExtractor from './EntityExtractor'
 import EntityExtractorLoading from './EntityExtractorLoading'
 
@@ -277,8 +278,10 @@ export default function ImportModal({ isOpen, onClose, projectPath, projectConfi
       onDataChanged()
       handleBack()
     } catch (err) {
-      console.error('Import chapters failed:', err)
-      alert('Failed to import chapters: ' + err.message)
+      if (!isImportCancelled(err)) {
+        console.error('Import chapters failed:', err)
+        alert('Failed to import chapters: ' + err.message)
+      }
     } finally {
       setConfirmLoading(false)
     }
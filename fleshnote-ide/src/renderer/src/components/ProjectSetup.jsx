@@ -2,6 +2,7 @@ import { useState, useCallback } from 'react'
 import { useTranslation } from 'react-i18next'
 import EntityExtractor from './EntityExtractor'
 import ImportManuscript from './ImportManuscript'
+import { isImportCancelled } from './ImportJobProgress'
 import NameGeneratorModal from './NameGeneratorModal'
 
 // ─── ICONS ──────────────────────────────────────────────────────────────────
@@ -291,8 +292,10 @@ export default function ProjectSetup({ projectPath, projectConfig, onComplete, o
       // Move to worldbuilding data (step 2 of import)
       setStep(2)
     } catch (err) {
-      console.error('Import failed:', err)
-      alert('Import failed: ' + err.message)
+      if (!isImportCancelled(err)) {
+        console.error('Import failed:', err)
+        alert('Import failed: ' + err.message)
+      }
     } finally {
       setLoading(false)
     }
@@ -596,7 +596,7 @@ function EntityAuditorTab({ entities, mentions, chapters, projectConfig }) {
             const uniqueChapters = new Set(entMentions.map(m => m.chapter_id)).size;
             return {
                 ...ent,
-                totalMentions: entMentions.length,
+                totalMentions: entMentions.reduce((sum, m) => sum + m.mentions, 0),
                 chapterCount: uniqueChapters,
                 mentionsMap: entMentions // Keep for the renderer
             };
@@ -727,7 +727,7 @@ function EntityAuditorTab({ entities, mentions, chapters, projectConfig }) {
                                         </div>
                                     </td>
                                     {chapters.map(ch => {
-                                        const countInChapter = ent.mentionsMap.filter(m => m.chapter_id === ch.id).length;
+                                        const countInChapter = ent.mentionsMap.filter(m => m.chapter_id === ch.id).reduce((sum, m) => sum + m.mentions, 0);
                                         const opacityStr = countInChapter === 0 ? "0.05" : countInChapter > 5 ? "1.0" : countInChapter > 2 ? "0.7" : "0.4";
 
                                         return (
@@ -1020,7 +1020,7 @@ export default function StatsDashboard({ projectPath, chapters, entities, charac
     const { t } = useTranslation();
     const [activeTab, setActiveTab] = useState("habits");
     const [loading, setLoading] = useState(true);
-    const [statsData, setStatsData] = useState({ global_stats: {}, stat_logs: [], entity_mentions: [] });
+    const [statsData, setStatsData] = useState({ global_stats: {}, stat_logs: [], mention_density: [] });
 
     useEffect(() => {
         async function fetchStats() {
@@ -1054,8 +1054,8 @@ export default function StatsDashboard({ projectPath, chapters, entities, charac
             <TabBar tabs={tabs} active={activeTab} onSelect={setActiveTab} />
             <div style={{ flex: 1, overflowY: "auto", overflowX: "hidden" }}>
                 {activeTab === "habits" && <HabitsTab statLogs={statsData.stat_logs} globalStats={statsData.global_stats} chapters={chapters} />}
-                {activeTab === "entities" && <EntityAuditorTab entities={entities} mentions={statsData.entity_mentions} chapters={chapters} projectConfig={projectConfig} />}
-                {activeTab === "health" && <StoryHealthTab entities={entities} chapters={chapters} mentions={statsData.entity_mentions || []} projectPath={projectPath} projectConfig={projectConfig} />}
+                {activeTab === "entities" && <EntityAuditorTab entities={entities} mentions={statsData.mention_density || []} chapters={chapters} projectConfig={projectConfig} />}
+                {activeTab === "health" && <StoryHealthTab entities={entities} chapters={chapters} mentions={statsData.mention_density || []} projectPath={projectPath} projectConfig={projectConfig} />}
                 {activeTab === "senses" && <SensesTab projectPath={projectPath} projectConfig={projectConfig} />}
                 {activeTab === "achievements" && <AchievementsTab projectPath={projectPath} />}
             </div>